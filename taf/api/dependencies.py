@@ -1,3 +1,4 @@
+import copy
 import json
 from logging import DEBUG, ERROR
 from typing import Dict, Optional
@@ -107,7 +108,7 @@ def add_dependency(
             return
 
     # add to dependencies.json or update the entry
-    dependencies_json = repositoriesdb.load_dependencies_json(auth_repo)
+    dependencies_json = copy.deepcopy(repositoriesdb.load_dependencies_json(auth_repo))
 
     # if dependencies.json does not exist, initialize it
     if not dependencies_json:
@@ -199,7 +200,7 @@ def remove_dependency(
         return
 
     # add to dependencies.json or update the entry
-    dependencies_json = repositoriesdb.load_dependencies_json(auth_repo)
+    dependencies_json = copy.deepcopy(repositoriesdb.load_dependencies_json(auth_repo))
 
     if not dependencies_json:
         print("dependencies.json does not exist")
@@ -4,6 +4,7 @@ import os
 from typing import Dict, List, Optional, Tuple
 import click
 from collections import defaultdict
+import copy
 import json
 from pathlib import Path
 from logdecorator import log_on_end, log_on_error, log_on_start
@@ -784,7 +785,9 @@ def remove_role(
 
     # if targets should be deleted, also removed them from repositories.json
     if len(removed_targets):
-        repositories_json = repositoriesdb.load_repositories_json(auth_repo)
+        repositories_json = copy.deepcopy(
+            repositoriesdb.load_repositories_json(auth_repo)
+        )
         if repositories_json is not None:
             repositories = repositories_json["repositories"]
             for removed_target in removed_targets:
@@ -2,6 +2,7 @@ from logging import DEBUG, ERROR, INFO
 from typing import Dict, List, Optional, Union
 import click
 import os
+import copy
 import json
 from collections import defaultdict
 from pathlib import Path
@@ -144,7 +145,7 @@ def add_target_repo(
     # target repo should be added to repositories.json
     # delegation paths should be extended if role != targets
     # if the repository already exists, create a target file
-    repositories_json = repositoriesdb.load_repositories_json(auth_repo)
+    repositories_json = copy.deepcopy(repositoriesdb.load_repositories_json(auth_repo))
     if repositories_json is None:
         repositories_json = {"repositories": {}}
     repositories = repositories_json["repositories"]
@@ -419,7 +420,7 @@ def remove_target_repo(
     if not auth_repo.is_git_repository_root:
         taf_logger.info(f"{path} is not a git repository!")
         return
-    repositories_json = repositoriesdb.load_repositories_json(auth_repo)
+    repositories_json = copy.deepcopy(repositoriesdb.load_repositories_json(auth_repo))
     if repositories_json is not None:
         repositories = repositories_json["repositories"]
         if target_name not in repositories:
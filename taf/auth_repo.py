@@ -19,6 +19,7 @@ from taf.repository_tool import (
 class AuthenticationRepository(GitRepository, TAFRepository):
 
     LAST_VALIDATED_FILENAME = "last_validated_commit"
+    VALIDATION_CHECKPOINT_FILENAME = "validation_checkpoint.json"
     TEST_REPO_FLAG_FILE = "test-auth-repo"
     SCRIPTS_PATH = "scripts"
 
@@ -143,6 +144,21 @@ class AuthenticationRepository(GitRepository, TAFRepository):
         except FileNotFoundError:
             return None
 
+    @property
+    def validation_checkpoint(self) -> Optional[Dict]:
+        """
+        Return the checkpoint of an interrupted validation of the authentication
+        repository's commits which were created after the last validated commit
+        """
+        path = Path(self.conf_dir, self.VALIDATION_CHECKPOINT_FILENAME)
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            self._log_warning(f"Could not read validation checkpoint: {e}")
+            return None
+
     @property
     def log_prefix(self) -> str:
         if self.alias:
@@ -217,6 +233,18 @@ class AuthenticationRepository(GitRepository, TAFRepository):
         """
         self._log_debug(f"setting last validated commit to: {commit}")
         Path(self.conf_dir, self.LAST_VALIDATED_FILENAME).write_text(commit)
+        # commits after the previous last validated commit were validated
+        Path(self.conf_dir, self.VALIDATION_CHECKPOINT_FILENAME).unlink(missing_ok=True)
+
+    def set_validation_checkpoint(self, checkpoint: Dict):
+        """
+        Store the checkpoint of the validation of the authentication repository's
+        commits, so that it can be resumed if it gets interrupted
+        """
+        path = Path(self.conf_dir, self.VALIDATION_CHECKPOINT_FILENAME)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(checkpoint))
+        os.replace(temp_path, path)
 
     def targets_data_by_auth_commits(
         self,
@@ -356,8 +384,7 @@ class AuthenticationRepository(GitRepository, TAFRepository):
         targets = defaultdict(dict)
         if default_branch is None:
             default_branch = self.default_branch
-        previous_metadata = []
-        new_files = []
+        metadata_at_revision = None
         for commit in commits:
             # repositories.json might not exit, if the current commit is
             # the initial commit
@@ -368,16 +395,10 @@ class AuthenticationRepository(GitRepository, TAFRepository):
                 continue
             repositories_at_revision = repositories_at_revision["repositories"]
 
-            current_metadata = self.list_files_at_revision(
-                commit, METADATA_DIRECTORY_NAME
+            metadata_at_revision = self.list_files_at_revision_incremental(
+                commit, METADATA_DIRECTORY_NAME, metadata_at_revision
             )
-            new_files = [
-                metadata_path
-                for metadata_path in current_metadata
-                if metadata_path not in previous_metadata
-            ]
-            previous_metadata = current_metadata
-            if len(new_files):
+            if len(metadata_at_revision.added):
                 with self.repository_at_revision(commit):
                     roles_at_revision = self.get_all_targets_roles()
 
@@ -402,6 +423,8 @@ class AuthenticationRepository(GitRepository, TAFRepository):
                         commit, get_target_path(target_path)
                     )
                     if target_content is not None:
+                        # cached documents are read only
+                        target_content = dict(target_content)
                         target_commit = target_content.pop("commit")
                         target_branch = target_content.pop("branch", default_branch)
                         targets[commit][target_path] = {
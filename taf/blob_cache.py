@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import taf.settings as settings
+
+
+class BlobCache:
+    """
+    Least recently used cache of blob contents, bounded by the total size
+    of the cached blobs. Blobs are keyed by their git id, so a single cache can
+    safely be shared by all repositories. Only the raw content is stored,
+    callers are expected to decode it if needed.
+    If max_bytes is not specified, settings.blob_cache_max_bytes is used.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self._max_bytes = max_bytes
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.blob_cache_max_bytes
+
+    def __contains__(self, git_id: str) -> bool:
+        return git_id in self._blobs
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def get(self, git_id: str) -> Optional[bytes]:
+        with self._lock:
+            content = self._blobs.get(git_id)
+            if content is None:
+                self.misses += 1
+                return None
+            self._blobs.move_to_end(git_id)
+            self.hits += 1
+            return content
+
+    def put(self, git_id: str, content: bytes) -> None:
+        size = len(content)
+        with self._lock:
+            if git_id in self._blobs:
+                self._blobs.move_to_end(git_id)
+                return
+            if size > self.max_bytes:
+                # blob would evict everything else, do not cache it
+                return
+            self._blobs[git_id] = content
+            self.size += size
+            self._evict(self.max_bytes)
+
+    def _evict(self, max_bytes: int) -> None:
+        while self.size > max_bytes and self._blobs:
+            _, content = self._blobs.popitem(last=False)
+            self.size -= len(content)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blobs.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "blobs": len(self._blobs),
+            "size": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
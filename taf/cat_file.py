@@ -0,0 +1,235 @@
+import subprocess
+import threading
+from typing import IO, List, Optional, Tuple, cast
+from taf.log import taf_logger as logger
+from taf.exceptions import GitError
+
+
+# number of requests written to git before their responses are read
+# keeping it small guarantees that the stdin pipe never fills up while git
+# is blocked on writing a response nobody is reading yet
+PIPELINE_CHUNK_SIZE = 128
+
+TREE_MODE = b"40000"
+
+
+class CatFileProcess:
+    """
+    A long-lived `git cat-file --batch` (or `--batch-check`) process.
+    Object names are written to the process's stdin, one per line,
+    and the responses are read from its stdout in the same order.
+    """
+
+    def __init__(self, encapsulating_repo, check=False):
+        self.encapsulating_repo = encapsulating_repo
+        self.path = encapsulating_repo.path
+        self.check = check
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @property
+    def command(self) -> List[str]:
+        command = ["git", "-C", str(self.path)]
+        if self.encapsulating_repo.allow_unsafe:
+            command.extend(["-c", f"safe.directory={self.path}"])
+        command.extend(["cat-file", "--batch-check" if self.check else "--batch"])
+        return command
+
+    def _start(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            logger.debug("Starting {}", " ".join(self.command))
+            self._process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+    def _read_response(self, process, name):
+        header = process.stdout.readline()
+        if not header:
+            raise GitError(
+                self.encapsulating_repo,
+                message=f"git cat-file exited unexpectedly while reading {name}",
+            )
+        parts = header.rstrip(b"\n").split(b" ")
+        if len(parts) != 3:
+            # <name> missing or <name> ambiguous
+            return None
+        oid, obj_type, size = parts[0].decode(), parts[1].decode(), int(parts[2])
+        content = None
+        if not self.check:
+            content = process.stdout.read(size + 1)[:-1]
+        return oid, obj_type, size, content
+
+    def read(self, names: List[str]) -> List[Optional[Tuple]]:
+        """
+        Return a list of (oid, type, size, content) tuples, one per object name,
+        or None for each object which does not exist. Content is always None if
+        the process was started with --batch-check.
+        """
+        results: List[Optional[Tuple]] = []
+        with self._lock:
+            try:
+                process = self._start()
+                stdin = cast(IO[bytes], process.stdin)
+                for start in range(0, len(names), PIPELINE_CHUNK_SIZE):
+                    chunk = names[start : start + PIPELINE_CHUNK_SIZE]
+                    stdin.write(b"".join(f"{name}\n".encode() for name in chunk))
+                    stdin.flush()
+                    for name in chunk:
+                        results.append(self._read_response(process, name))
+            except (OSError, ValueError) as e:
+                # the process died, start a new one on the next request
+                self._stop()
+                raise GitError(
+                    self.encapsulating_repo,
+                    message=f"git cat-file failed due to error: {e}",
+                )
+            except GitError:
+                self._stop()
+                raise
+        return results
+
+    def _stop(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except Exception:
+            process.kill()
+        finally:
+            process.stdout.close()
+
+    def stop(self):
+        with self._lock:
+            self._stop()
+
+
+class CatFileRepository:
+    """
+    Reads objects of a git repository through persistent `git cat-file` processes.
+    Used when PyGitRepository cannot be instantiated, so that reading a file
+    costs a round-trip through a pipe instead of starting a new git process.
+    """
+
+    def __init__(self, encapsulating_repo):
+        self.encapsulating_repo = encapsulating_repo
+        self.batch = CatFileProcess(encapsulating_repo)
+        self.batch_check = CatFileProcess(encapsulating_repo, check=True)
+
+    def cleanup(self):
+        """
+        Stop the git processes. They will be restarted if needed.
+        """
+        self.batch.stop()
+        self.batch_check.stop()
+
+    def _path_not_found(self, commit, path):
+        return GitError(
+            self.encapsulating_repo,
+            message=f"fatal: Path '{path}' does not exist in '{commit}'",
+        )
+
+    def get_object_info(self, commit, path) -> Optional[Tuple[str, str]]:
+        """
+        Return id and type of the object at the given path, or None if it does not exist
+        """
+        (info,) = self.batch_check.read([f"{commit}:{path}"])
+        if info is None:
+            return None
+        oid, obj_type, _, _ = info
+        return oid, obj_type
+
+    def get_file(self, commit, path, raw=False):
+        """
+        for the given commit string,
+        return the id and contents of the blob at the
+        given path, if it exists, otherwise raise GitError
+        """
+        (obj,) = self.batch.read([f"{commit}:{path}"])
+        if obj is None or obj[1] != "blob":
+            raise self._path_not_found(commit, path)
+        git_id, _, _, content = obj
+        return git_id, content if raw else content.decode()
+
+    def get_commit_message(self, commit):
+        """
+        Return the message of the given commit, including the trailing new line
+        """
+        (obj,) = self.batch.read([commit])
+        if obj is None or obj[1] != "commit":
+            raise GitError(
+                self.encapsulating_repo,
+                message=f"fatal: Not a valid commit name {commit}",
+            )
+        # headers are separated from the message by an empty line
+        _, _, message = obj[3].partition(b"\n\n")
+        return message.decode()
+
+    def list_files_at_revision(self, commit, path=""):
+        """
+        for the given commit string,
+        return a list of all file paths that are
+        descendents of the path string.
+        Subtrees of the same depth are requested in a single pipelined batch.
+        """
+        path = path.rstrip("/")
+        if path == ".":
+            path = ""
+        (root,) = self.batch.read(
+            [f"{commit}:{path}" if path else f"{commit}^{{tree}}"]
+        )
+        if root is None or root[1] != "tree":
+            raise self._path_not_found(commit, path)
+
+        # load the trees one level at a time, then list their blobs in the
+        # same order in which git would list them
+        entries_by_prefix = {}
+        level = [("", root[3])]
+        while level:
+            subtrees = []
+            for prefix, tree_content in level:
+                entries = list(_parse_tree(tree_content))
+                entries_by_prefix[prefix] = entries
+                subtrees.extend(
+                    (f"{prefix}{name}/", oid)
+                    for mode, name, oid in entries
+                    if mode == TREE_MODE
+                )
+            objects = self.batch.read([oid for _, oid in subtrees])
+            level = [
+                (prefix, obj[3]) for (prefix, _), obj in zip(subtrees, objects) if obj
+            ]
+
+        results: List[str] = []
+
+        def _collect(prefix):
+            for mode, name, _ in entries_by_prefix.get(prefix, []):
+                if mode == TREE_MODE:
+                    _collect(f"{prefix}{name}/")
+                else:
+                    results.append(f"{prefix}{name}")
+
+        _collect("")
+        return results
+
+
+def _parse_tree(content: bytes):
+    """
+    Parse a raw git tree object and yield (mode, name, oid) for each entry.
+    Each entry is stored as <mode> SP <name> NUL <20 byte binary id>
+    """
+    position = 0
+    length = len(content)
+    while position < length:
+        space = content.index(b" ", position)
+        null = content.index(b"\0", space)
+        mode = content[position:space]
+        name = content[space + 1 : null].decode()
+        oid = content[null + 1 : null + 21].hex()
+        position = null + 21
+        yield mode, name, oid
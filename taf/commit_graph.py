@@ -0,0 +1,163 @@
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+import pygit2
+from taf.log import taf_logger as logger
+
+
+COMMIT_GRAPH_SIGNATURE = b"CGPH"
+# position of the second parent if a commit has less than two parents
+GRAPH_PARENT_NONE = 0x70000000
+# set if a commit has more than two parents
+GRAPH_EXTRA_EDGES_NEEDED = 0x80000000
+SHA1_SIZE = 20
+
+
+class CommitGraph:
+    """
+    Parents and generation numbers of commits, used to answer reachability queries
+    without walking whole histories. The generation number of a commit without parents
+    is 1, and of every other commit 1 + the maximum generation of its parents. So
+    a commit cannot be reached from a commit whose generation is not greater than its own.
+
+    Generation numbers are read from the repository's commit-graph file, if it exists.
+    Generations of commits which are not in that file are computed on demand and kept
+    for the lifetime of the object (commits never change, so they never become stale).
+    """
+
+    def __init__(self, repo: pygit2.Repository):
+        self.repo = repo
+        self._parents: Dict[str, Tuple[str, ...]] = {}
+        self._generations: Dict[str, int] = {}
+        self.loaded_from_file = self._load_commit_graph_file()
+
+    def _load_commit_graph_file(self) -> bool:
+        graph_path = Path(self.repo.path, "objects", "info", "commit-graph")
+        if not graph_path.is_file():
+            return False
+        try:
+            self._parse_commit_graph(graph_path.read_bytes())
+            return True
+        except Exception as e:
+            logger.debug("Could not read commit-graph file {}: {}", graph_path, e)
+            self._parents.clear()
+            self._generations.clear()
+            return False
+
+    def _parse_commit_graph(self, data: bytes) -> None:
+        """
+        See https://git-scm.com/docs/gitformat-commit-graph
+        Only a single (not split) SHA-1 commit-graph is supported.
+        """
+        signature, version, hash_version, num_chunks, num_base_graphs = struct.unpack(
+            ">4sBBBB", data[:8]
+        )
+        if (
+            signature != COMMIT_GRAPH_SIGNATURE
+            or version != 1
+            or hash_version != 1
+            or num_base_graphs != 0
+        ):
+            raise ValueError("unsupported commit-graph format")
+        chunks = {}
+        for index in range(num_chunks):
+            chunk_id, offset = struct.unpack(
+                ">4sQ", data[8 + index * 12 : 8 + (index + 1) * 12]
+            )
+            chunks[chunk_id] = offset
+        oid_lookup = chunks[b"OIDL"]
+        commit_data = chunks[b"CDAT"]
+        num_commits = struct.unpack(">I", data[chunks[b"OIDF"] + 255 * 4 :][:4])[0]
+        oids = [
+            data[oid_lookup + i * SHA1_SIZE : oid_lookup + (i + 1) * SHA1_SIZE].hex()
+            for i in range(num_commits)
+        ]
+        entry_size = SHA1_SIZE + 16
+        for position, oid in enumerate(oids):
+            start = commit_data + position * entry_size + SHA1_SIZE
+            parent1, parent2, generation_and_time = struct.unpack(
+                ">IIQ", data[start : start + 16]
+            )
+            generation = generation_and_time >> 34
+            if generation:
+                self._generations[oid] = generation
+            if parent2 & GRAPH_EXTRA_EDGES_NEEDED:
+                # octopus merge, parents are read from the object itself
+                continue
+            self._parents[oid] = tuple(
+                oids[parent]
+                for parent in (parent1, parent2)
+                if parent != GRAPH_PARENT_NONE
+            )
+
+    def parents(self, commit: str) -> Tuple[str, ...]:
+        parents = self._parents.get(commit)
+        if parents is None:
+            parents = tuple(parent.hex for parent in self.repo[commit].parent_ids)
+            self._parents[commit] = parents
+        return parents
+
+    def generation(self, commit: str) -> int:
+        generation = self._generations.get(commit)
+        if generation is not None:
+            return generation
+        # iterative post-order traversal, histories can be deeper than the recursion limit
+        stack: List[str] = [commit]
+        while stack:
+            current = stack[-1]
+            if current in self._generations:
+                stack.pop()
+                continue
+            parents = self.parents(current)
+            missing = [parent for parent in parents if parent not in self._generations]
+            if missing:
+                stack.extend(missing)
+                continue
+            self._generations[current] = 1 + max(
+                (self._generations[parent] for parent in parents), default=0
+            )
+            stack.pop()
+        return self._generations[commit]
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """
+        Check if ancestor can be reached from descendant (a commit is its own ancestor)
+        """
+        return bool(self.tips_containing(ancestor, [descendant]))
+
+    def tips_containing(self, commit: str, tips: Iterable[str]) -> Set[str]:
+        """
+        Return those of the given commits from which the commit can be reached.
+        Results of visited commits are shared between tips and commits whose
+        generation is not greater than the commit's are never walked past, so the
+        cost depends on the number of commits newer than the given one.
+        """
+        commit_generation = self.generation(commit)
+        reaches: Dict[str, bool] = {commit: True}
+        containing = set()
+        for tip in set(tips):
+            stack = [tip]
+            while stack:
+                current = stack[-1]
+                if current in reaches:
+                    stack.pop()
+                    continue
+                if self.generation(current) <= commit_generation:
+                    reaches[current] = False
+                    stack.pop()
+                    continue
+                parents = self.parents(current)
+                if any(reaches.get(parent) for parent in parents):
+                    reaches[current] = True
+                    stack.pop()
+                    continue
+                missing = [parent for parent in parents if parent not in reaches]
+                if missing:
+                    stack.extend(missing)
+                    continue
+                reaches[current] = False
+                stack.pop()
+            if reaches[tip]:
+                containing.add(tip)
+        return containing
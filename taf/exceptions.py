@@ -23,6 +23,11 @@ class FetchException(TAFError):
         self.message = f"Cannot fetch changes. Repo: {path}"
 
 
+class TransferCancelledError(TAFError):
+    def __init__(self, name: str, operation: str):
+        self.message = f"{operation} of {name} was cancelled"
+
+
 class GitError(TAFError):
     def __init__(
         self,
@@ -1,9 +1,10 @@
 from __future__ import annotations
-import datetime
 import json
 import itertools
 import os
 import re
+import shutil
+import threading
 import uuid
 import pygit2
 import subprocess
@@ -11,6 +12,7 @@ import logging
 from collections import OrderedDict
 from functools import reduce
 from pathlib import Path
+from attr import define, field
 
 import taf.settings as settings
 from taf.exceptions import (
@@ -22,11 +24,33 @@ from taf.exceptions import (
     GitError,
 )
 from taf.log import taf_logger
-from taf.utils import run
-from typing import Callable, Dict, List, Optional, Tuple, Union
-from .pygit import PyGitRepository
+from taf.utils import on_rm_error, run
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union, cast
+from .pygit import EMPTY_TREE, PyGitRepository
+from .cat_file import CatFileRepository
+from .commit_graph import CommitGraph
+from .json_cache import JSONCache
+from .transport import TransferStats, TransportCallbacks
+
+
+@define
+class FilesAtRevision:
+    """
+    Files inside of a directory at a revision, together with the changes
+    compared to the previously listed revision. Paths are relative to the directory.
+    See GitRepository.list_files_at_revision_incremental
+    """
+
+    commit: str
+    path: str
+    files: FrozenSet[str] = field(factory=frozenset)
+    added: FrozenSet[str] = field(factory=frozenset)
+    modified: FrozenSet[str] = field(factory=frozenset)
+    removed: FrozenSet[str] = field(factory=frozenset)
 
-EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
 
 
 class GitRepository:
@@ -99,6 +123,10 @@ class GitRepository:
         if default_branch is None:
             default_branch = self._determine_default_branch()
         self.default_branch = default_branch
+        # progress of clones and fetches executed in-process, see taf.transport
+        self.transfer_stats: List[TransferStats] = []
+        # in-process clones and fetches are aborted once this event is set
+        self.cancel_event: Optional[threading.Event] = None
 
     _pygit = None
 
@@ -111,6 +139,52 @@ class GitRepository:
                 pass
         return self._pygit
 
+    # parsed JSON documents keyed by blob id, shared by all repositories
+    json_cache: JSONCache = JSONCache()
+
+    _cat_file = None
+
+    @property
+    def cat_file(self) -> CatFileRepository:
+        """
+        Persistent git cat-file processes, used to read objects when pygit2
+        repository cannot be instantiated
+        """
+        if self._cat_file is None:
+            self._cat_file = CatFileRepository(self)
+        return self._cat_file
+
+    _commit_graph = None
+
+    @property
+    def commit_graph(self) -> CommitGraph:
+        """
+        Parents and generation numbers of commits, used for reachability queries.
+        Reads git's commit-graph file if the repository has one, but never writes it,
+        since this is used by read-only queries of any repository. Repositories which
+        the updater creates write it explicitly (see write_commit_graph)
+        """
+        if self._commit_graph is None:
+            repo = self.pygit_repo
+            if repo is None:
+                raise GitError(
+                    self,
+                    message="Could not load commit graph. pygit repository could not be instantiated.",
+                )
+            self._commit_graph = CommitGraph(repo)
+        return self._commit_graph
+
+    def write_commit_graph(self) -> None:
+        """
+        Write git's commit-graph file containing all commits reachable from any reference,
+        which stores generation numbers of commits and speeds up history traversal
+        """
+        try:
+            self._git("commit-graph write --reachable", reraise_error=True)
+        except GitError as e:
+            self._log_debug(f"Could not write commit-graph due to error: {e}")
+        self._commit_graph = None
+
     @classmethod
     def from_json_dict(cls, json_data: Dict):
         """Create a new instance based on data contained by the `json_data` dictionary,
@@ -235,6 +309,54 @@ class GitRepository:
                 self._log_debug(log_success_msg)
         return result
 
+    def _run_pygit(self, name: str, fallback: Callable, *args):
+        """
+        Run the pygit2 implementation of a command. If pygit2 repository could not be
+        instantiated or pygit2 could not execute the command, run the git subprocess
+        based fallback with the same arguments instead
+        """
+        try:
+            return getattr(self.pygit, name)(*args)
+        except TAFError as e:
+            raise e
+        except Exception as e:
+            self._log_debug(
+                f"Could not run {name} using pygit2 due to error: {e}. Reverting to git subprocess"
+            )
+            return fallback(*args)
+
+    def _transport_callbacks(self, operation: str, url: str) -> TransportCallbacks:
+        stats = TransferStats(repo_name=self.name, operation=operation, url=url)
+        self.transfer_stats.append(stats)
+        callbacks = TransportCallbacks(stats, cancel_event=self.cancel_event)
+        callbacks.check_cancelled()
+        return callbacks
+
+    def _run_transport(
+        self, operation: str, url: str, transfer: Callable, *args
+    ) -> bool:
+        """
+        Clone or fetch in-process using pygit2 if settings.in_process_transport is set.
+        Return False if the transfer was not executed or failed, in which case
+        it should be repeated using git. Cancelled transfers are not repeated
+        """
+        if not settings.in_process_transport:
+            return False
+        callbacks = self._transport_callbacks(operation, url)
+        try:
+            transfer(callbacks, url, *args)
+        except TAFError as e:
+            raise e
+        except Exception as e:
+            self._log_debug(
+                f"Could not {operation} {url} using pygit2 due to error: {e}. Reverting to git subprocess"
+            )
+            return False
+        finally:
+            callbacks.stats.finish()
+        self._log_debug(str(callbacks.stats))
+        return True
+
     def _get_default_branch_from_local(self) -> str:
         try:
             branch = self._git(
@@ -348,15 +470,13 @@ class GitRepository:
         if repo.descendant_of(since_commit, latest_commit_id):
             return []
 
-        shas: List[str] = []
-        for commit in repo.walk(latest_commit_id):
-            sha = commit.id.hex
-            if sha == since_commit:
-                break
-            shas.insert(0, sha)
+        # commits reachable from the latest commit, but not from since_commit
+        walker = repo.walk(latest_commit_id)
+        walker.hide(since_commit)
+        shas = [commit.id.hex for commit in walker]
 
-        if not reverse:
-            shas = shas[::-1]
+        if reverse:
+            shas.reverse()
         self._log_debug(f"found the following commits: {', '.join(shas)}")
         return shas
 
@@ -405,26 +525,45 @@ class GitRepository:
 
     def branches_containing_commit(
         self,
-        commit: str,
+        commit: Optional[str],
         strip_remote: Optional[bool] = False,
         sort_key: Optional[Callable] = None,
     ) -> OrderedDict:
-        """Finds all branches that contain the given commit"""
+        """Finds all branches that contain the given commit, or all branches if commit is None"""
         repo = self.pygit_repo
         if repo is None:
             raise GitError(
                 self,
                 message="Could not list branches. pygit repository could not be instantiated.",
             )
-        local_branches = remote_branches = []
-        try:
-            local_branches = list(repo.branches.local.with_commit(commit))
-        except pygit2.GitError:
-            pass
-        try:
-            remote_branches = list(repo.branches.remote.with_commit(commit))
-        except pygit2.GitError:
-            pass
+        if commit is not None:
+            try:
+                commit = repo.revparse_single(commit).peel(pygit2.Commit).hex
+            except (KeyError, ValueError, pygit2.GitError):
+                return OrderedDict()
+
+        def _branch_tips(branches):
+            tips = {}
+            for name in branches:
+                try:
+                    tips[name] = branches[name].resolve().target.hex
+                except (KeyError, pygit2.GitError):
+                    continue
+            return tips
+
+        local_tips = _branch_tips(repo.branches.local)
+        remote_tips = _branch_tips(repo.branches.remote)
+        all_tips = set(local_tips.values()) | set(remote_tips.values())
+        if commit is None:
+            # no commit specified, list all branches
+            containing = all_tips
+        else:
+            # many branches point to the same commits, check each tip only once
+            containing = self.commit_graph.tips_containing(commit, all_tips)
+        local_branches = [name for name, tip in local_tips.items() if tip in containing]
+        remote_branches = [
+            name for name, tip in remote_tips.items() if tip in containing
+        ]
         filtered_remote_branches = []
         if len(remote_branches):
             for branch in remote_branches:
@@ -587,6 +726,10 @@ class GitRepository:
         if self._pygit is not None:
             self._pygit.cleanup()
             self._pygit = None
+        if self._cat_file is not None:
+            self._cat_file.cleanup()
+            self._cat_file = None
+        self._commit_graph = None
 
     def clone(
         self, no_checkout: bool = False, bare: Optional[bool] = False, **kwargs
@@ -621,6 +764,15 @@ class GitRepository:
         cloned = False
         for url in self.urls:
             self._log_info(f"trying to clone from {url}")
+            # git clone's other parameters are not supported by pygit2
+            if (
+                not no_checkout
+                and not kwargs
+                and self._run_transport("clone", url, self._clone_in_process, bare)
+            ):
+                self._log_info(f"successfully cloned from {url}")
+                cloned = True
+                break
             try:
                 self._git(
                     "clone {} . {}",
@@ -643,17 +795,74 @@ class GitRepository:
         if self.default_branch is None:
             self.default_branch = self._determine_default_branch()
 
+    def _clone_in_process(
+        self, callbacks: TransportCallbacks, url: str, bare: Optional[bool] = False
+    ) -> None:
+        try:
+            if bare:
+                # like git clone --bare, fetch remote branches to local branches
+                # and do not configure a fetch refspec
+                repo = pygit2.init_repository(str(self.path), bare=True)
+                remote = repo.remotes.create_anonymous(url)
+                remote.fetch(
+                    ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"],
+                    callbacks=callbacks,
+                )
+                repo.config["remote.origin.url"] = url
+                remote_head = next(
+                    (
+                        ref["symref_target"]
+                        for ref in remote.ls_remotes(callbacks=callbacks)
+                        if ref["name"] == "HEAD" and ref["symref_target"]
+                    ),
+                    None,
+                )
+                if remote_head is not None:
+                    repo.references.create("HEAD", remote_head, force=True)
+            else:
+                pygit2.clone_repository(url, str(self.path), callbacks=callbacks)
+        except BaseException:
+            # leave an empty directory, so that the clone can be repeated
+            for child in self.path.iterdir():
+                if child.is_dir():
+                    shutil.rmtree(child, onerror=on_rm_error)
+                else:
+                    child.unlink()
+            raise
+        finally:
+            self._pygit = None
+
     def clone_from_disk(
         self,
         local_path: Path,
         remote_url: Optional[str] = None,
         is_bare: bool = False,
         keep_remote=False,
+        shared: bool = False,
     ) -> None:
+        """
+        Clone a repository from the local path. If shared is True, objects are not
+        copied. The new repository reads them from the local repository's object
+        database instead (git alternates), so the local repository must not be
+        removed while the new one is used. Otherwise, the new repository does not
+        depend on any other repository, even if the local repository reads objects
+        from one, see dissociate.
+        """
         self.path.mkdir(parents=True, exist_ok=True)
-        pygit2.clone_repository(local_path, self.path, bare=is_bare)
+        if shared:
+            self._clone_shared(local_path, is_bare)
+        else:
+            callbacks = self._transport_callbacks("clone", str(local_path))
+            try:
+                pygit2.clone_repository(
+                    local_path, self.path, bare=is_bare, callbacks=callbacks
+                )
+            finally:
+                callbacks.stats.finish()
         if not self.is_git_repository:
             raise GitError(f"Could not clone repository from local path {local_path}")
+        if not shared:
+            self.dissociate()
         repo = self.pygit_repo
         if repo is None:
             raise GitError(
@@ -668,6 +877,68 @@ class GitRepository:
                     for branch in repo.branches.local:
                         self.set_upstream(str(branch))
 
+    def dissociate(self) -> None:
+        """
+        Copy objects which the repository reads from other repositories' object
+        databases (git alternates) into its own object database and stop reading
+        them, so that the other repositories can be removed. Local clones copy the
+        alternates of the repository they were cloned from, if it had any
+        """
+        repo = self.pygit_repo
+        if repo is None:
+            return
+        alternates = Path(repo.path, "objects", "info", "alternates")
+        if not alternates.is_file():
+            return
+        self._git("repack -a -d -q", reraise_error=True)
+        alternates.unlink()
+        self._pygit = None
+
+    def _clone_shared(self, local_path: Path, is_bare: bool) -> None:
+        """
+        Set up the same references pygit2.clone_repository would, with objects
+        read from the local repository's object database. Only objects fetched
+        afterwards are stored in this repository, so the cost does not depend
+        on the size of the local repository.
+        """
+        source = pygit2.Repository(str(local_path))
+        try:
+            repo = pygit2.init_repository(str(self.path), bare=is_bare)
+            alternates = Path(repo.path, "objects", "info", "alternates")
+            alternates.parent.mkdir(parents=True, exist_ok=True)
+            alternates.write_text(
+                f"{Path(source.path, 'objects').resolve().as_posix()}\n"
+            )
+            repo.free()
+            # alternates are read when the object database is opened
+            repo = pygit2.Repository(str(self.path))
+            repo.remotes.create("origin", str(local_path))
+            for name in source.branches.local:
+                repo.references.create(
+                    f"refs/remotes/origin/{name}", source.branches.local[name].target
+                )
+            for name in source.references:
+                if name.startswith("refs/tags/"):
+                    repo.references.create(
+                        name, source.references[name].resolve().target
+                    )
+            if not source.head_is_unborn and not source.head_is_detached:
+                branch_name = source.head.shorthand
+                branch = repo.branches.local.create(
+                    branch_name, repo[source.head.target]
+                )
+                branch.upstream = repo.branches.remote[f"origin/{branch_name}"]
+                repo.references.create(
+                    "refs/remotes/origin/HEAD", f"refs/remotes/origin/{branch_name}"
+                )
+                repo.set_head(branch.name)
+                if not is_bare:
+                    repo.checkout_head()
+            repo.free()
+        finally:
+            source.free()
+            self._pygit = None
+
     def clone_or_pull(
         self,
         branches: Optional[List[str]] = None,
@@ -798,21 +1069,12 @@ class GitRepository:
         upstream_name = "/".join(parts[2:])
 
         remote_branch = repo.branches.get(upstream_name)
+        if remote_branch is None:
+            return True
 
-        # Get the last common ancestor of local and remote branches
-        merge_base = repo.merge_base(local_branch.target, remote_branch.target)
-
-        # Check for commits in local branch since the merge base that are not in the remote branch
-        unpushed_commits = []
-        for commit in repo.walk(local_branch.target, pygit2.GIT_SORT_TOPOLOGICAL):
-            if commit.id != merge_base and not repo.descendant_of(
-                remote_branch.target, commit.id
-            ):
-                unpushed_commits.append(commit)
-            else:
-                break
-
-        return bool(unpushed_commits)
+        # number of commits on the local branch which are not on the remote one
+        ahead, _ = repo.ahead_behind(local_branch.target, remote_branch.target)
+        return ahead > 0
 
     def commit(self, message: str) -> str:
         self._git("add -A")
@@ -843,7 +1105,11 @@ class GitRepository:
         return self._git("rev-parse HEAD")
 
     def commit_exists(self, commit_sha: str) -> str:
-        return self._git(f"rev-parse {commit_sha}")
+        """Returns sha of the commit or raises GitError if the commit does not exist"""
+        return self._run_pygit("commit_exists", self._commit_exists, commit_sha)
+
+    def _commit_exists(self, commit_sha: str) -> str:
+        return self._git(f"rev-parse --verify {commit_sha}^{{commit}}")
 
     def commits_on_branch_and_not_other(self, branch1: str, branch2: str) -> List[str]:
         """
@@ -903,29 +1169,19 @@ class GitRepository:
 
     def get_commit_date(self, commit_sha: str) -> str:
         """Returns commit date of the given commit"""
-        repo = self.pygit_repo
-        if repo is None:
-            raise GitError(
-                self,
-                message="Could not get commit message. pygit repository could not be instantiated.",
-            )
-        commit = repo.get(commit_sha)
-        date = datetime.datetime.utcfromtimestamp(
-            commit.commit_time + commit.commit_time_offset
-        )
-        formatted_date = date.strftime("%Y-%m-%d")
-        return formatted_date
+        return self._run_pygit("get_commit_date", self._get_commit_date, commit_sha)
+
+    def _get_commit_date(self, commit_sha: str) -> str:
+        return self._git(f"show -s --format=%cd --date=format:%Y-%m-%d {commit_sha}")
 
     def get_commit_message(self, commit_sha: str) -> str:
         """Returns commit message of the given commit"""
-        repo = self.pygit_repo
-        if repo is None:
-            raise GitError(
-                self,
-                message="Could not get commit message. pygit repository could not be instantiated.",
-            )
-        commit = repo.get(commit_sha)
-        return commit.message
+        return self._run_pygit(
+            "get_commit_message", self._get_commit_message, commit_sha
+        )
+
+    def _get_commit_message(self, commit_sha: str) -> str:
+        return self.cat_file.get_commit_message(commit_sha)
 
     def get_commit_sha(self, behind_head: str) -> str:
         """Get commit sha of HEAD~{behind_head}"""
@@ -940,13 +1196,21 @@ class GitRepository:
             return self._get_default_branch_from_remote(url)
         return self._get_default_branch_from_local()
 
-    def get_json(
-        self, commit: str, path: str, raw: Optional[bool] = False
-    ) -> Optional[Dict]:
-        s = self.get_file(commit, path, raw=raw)
-        if s and isinstance(s, str):
-            return json.loads(s)
-        return None
+    def get_json(self, commit: str, path: str) -> Optional[Dict]:
+        """
+        Return the parsed content of a JSON file at the given revision.
+        Documents are cached by their blob id and shared by all callers, so
+        the returned dictionary is read only. Use copy.deepcopy to modify it.
+        """
+        git_id, content = cast(
+            Tuple[str, bytes], self.get_file(commit, path, raw=True, with_id=True)
+        )
+        if not content:
+            return None
+        document = self.json_cache.get(git_id)
+        if document is None:
+            document = self.json_cache.put(git_id, json.loads(content))
+        return document
 
     def get_file(
         self,
@@ -958,13 +1222,33 @@ class GitRepository:
         path = Path(path).as_posix()
         try:
             git_id, content = self.pygit.get_file(commit, path, raw)
-            if with_id:
-                return git_id, content
-            return content
         except TAFError as e:
             raise e
         except Exception:
-            return self._git("show {}:{}", commit, path, raw=raw)
+            git_id, content = self.cat_file.get_file(commit, path, raw)
+        if with_id:
+            return git_id, content
+        return content
+
+    def get_object_id_at_path(self, commit: str, path: str) -> Optional[str]:
+        """
+        Return id of the object (blob or tree) at the given path at the given commit,
+        or None if it does not exist. Since git objects are identified by their
+        content, a directory did not change between two commits if its tree ids match
+        """
+        return self._run_pygit(
+            "get_object_id_at_path",
+            self._get_object_id_at_path,
+            commit,
+            Path(path).as_posix(),
+        )
+
+    def _get_object_id_at_path(self, commit: str, path: str) -> Optional[str]:
+        self._commit_exists(commit)
+        path = path.strip("/")
+        if path in ("", "."):
+            return self._git(f"rev-parse {commit}^{{tree}}")
+        return self._git(f"rev-parse --verify -q {commit}:{path}", log_error=True)
 
     def get_first_commit_on_branch(self, branch: Optional[str] = None) -> str:
         branch = branch or self.default_branch
@@ -976,7 +1260,16 @@ class GitRepository:
     def get_last_branch_by_committer_date(self) -> Optional[str]:
         """Find the latest branch based on committer date. Should only be used for
         testing purposes"""
-        branches = self._git("branch --sort=committerdate").strip().split("\n")
+        return self._run_pygit(
+            "get_last_branch_by_committer_date",
+            self._get_last_branch_by_committer_date,
+        )
+
+    def _get_last_branch_by_committer_date(self) -> Optional[str]:
+        branches = self._git(
+            "branch --sort=committerdate --format=%(refname:short)"
+        ).split("\n")
+        branches = [branch for branch in branches if branch]
         if not len(branches):
             return None
         return branches[-1]
@@ -993,6 +1286,14 @@ class GitRepository:
     def diff_between_revisions(
         self, revision1: Optional[str] = EMPTY_TREE, revision2: Optional[str] = "HEAD"
     ) -> str:
+        return self._run_pygit(
+            "diff_between_revisions",
+            self._diff_between_revisions,
+            revision1,
+            revision2,
+        )
+
+    def _diff_between_revisions(self, revision1: str, revision2: str) -> str:
         return self._git("diff --name-status {} {}", revision1, revision2)
 
     def has_remote(self) -> bool:
@@ -1017,21 +1318,134 @@ class GitRepository:
         branch: Optional[str] = None,
         remote: Optional[str] = "origin",
     ) -> None:
+        # libgit2 does not support partial clones, it would fetch filtered out objects
+        remote_urls = (
+            self._remote_urls()
+            if settings.in_process_transport and not self.is_partial_clone
+            else {}
+        )
         if fetch_all:
+            if remote_urls and all(
+                self._run_transport("fetch", url, self._fetch_in_process, name)
+                for name, url in remote_urls.items()
+            ):
+                return
             self._git("fetch --all", log_error=True)
         else:
+            if remote in remote_urls and self._run_transport(
+                "fetch", remote_urls[remote], self._fetch_in_process, remote, branch
+            ):
+                return
             if branch is None:
                 branch = ""
             self._git("fetch {} {}", remote, branch, log_error=True)
 
+    def gc(self, auto: Optional[bool] = True, prune: Optional[bool] = True) -> None:
+        """
+        Pack loose objects and remove unreachable objects older than git's prune
+        expiration date. If auto is True, only do so if git determines that the
+        repository needs it (git gc --auto). If prune is False, unreachable objects
+        are kept, no matter how old they are, since repositories which read objects
+        from this one (git alternates) might still need them
+        """
+        options = (
+            ""
+            if prune
+            else "-c gc.pruneExpire=never -c gc.reflogExpireUnreachable=never "
+        )
+        self._git("{}gc --quiet {}", options, "--auto" if auto else "", log_error=True)
+
+    def fetch_mirror(self, remote: Optional[str] = "origin") -> None:
+        """
+        Update all branches and tags of a bare repository to match the remote
+        repository, including branches which were force pushed or deleted.
+        Unlike fetch, raise an error if the remote could not be fetched
+        """
+        self._git(
+            "fetch --prune --force {} +refs/heads/*:refs/heads/* +refs/tags/*:refs/tags/*",
+            remote,
+            reraise_error=True,
+        )
+
+    def _fetch_in_process(
+        self,
+        callbacks: TransportCallbacks,
+        url: str,
+        remote_name: str,
+        branch: Optional[str] = None,
+    ) -> None:
+        repo = self.pygit_repo
+        if repo is None:
+            raise GitError(
+                self,
+                message="Could not fetch. pygit repository could not be instantiated.",
+            )
+        remote = repo.remotes[remote_name]
+        remote.fetch([branch] if branch else None, callbacks=callbacks)
+
+    def fetch_missing_blobs(
+        self, commits: Optional[List[str]] = None, paths: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Fetch contents of files which were filtered out by a partial clone using
+        a single fetch, instead of letting git fetch them one by one when they are read.
+        Only files inside of the given commits (and given directories) are fetched,
+        or, if commits are not specified, all files reachable from any reference.
+        Return ids of the fetched blobs
+        """
+        if not self.is_partial_clone:
+            return []
+        if commits is None:
+            objects = self._git(
+                "rev-list --objects --missing=print --all", reraise_error=True
+            )
+            missing = [line[1:] for line in objects.splitlines() if line[:1] == "?"]
+        else:
+            missing = self.pygit.missing_blobs(commits, paths)
+        if missing:
+            self._log_debug(f"fetching {len(missing)} missing blobs")
+            self._git(
+                "-c fetch.negotiationAlgorithm=noop fetch origin --no-tags "
+                "--no-write-fetch-head --recurse-submodules=no --filter=blob:none --stdin",
+                input="\n".join(missing),
+                log_error=True,
+                reraise_error=True,
+            )
+        return missing
+
+    @property
+    def is_partial_clone(self) -> bool:
+        """
+        Check if the repository was cloned without some of the objects
+        (git clone --filter) which are fetched from a remote when needed
+        """
+        repo = self.pygit_repo
+        if repo is None:
+            return False
+        return any(
+            entry.name.endswith(".promisor") and entry.value == "true"
+            for entry in repo.config
+            if entry.name.startswith("remote.")
+        )
+
+    def _remote_urls(self) -> Dict[str, str]:
+        repo = self.pygit_repo
+        if repo is None:
+            return {}
+        return {remote.name: remote.url for remote in repo.remotes}
+
     def fetch_from_disk(self, local_repo_path):
 
         repo = self.pygit_repo
         temp_remote_name = f"temp_{uuid.uuid4().hex[:8]}"
         repo.remotes.create(temp_remote_name, local_repo_path)
         remote = repo.remotes[temp_remote_name]
-        remote.fetch()
-        repo.remotes.delete(temp_remote_name)
+        callbacks = self._transport_callbacks("fetch", str(local_repo_path))
+        try:
+            remote.fetch(callbacks=callbacks)
+        finally:
+            callbacks.stats.finish()
+            repo.remotes.delete(temp_remote_name)
 
     def find_worktree_path_by_branch(self, branch_name: str) -> Optional[Path]:
         """Returns path of the workree where the branch is checked out, or None if not checked out in any worktree"""
@@ -1136,15 +1550,10 @@ class GitRepository:
 
     def get_merge_base(self, branch1: str, branch2: str) -> str:
         """Finds the best common ancestor between two branches"""
-        repo = self.pygit_repo
-        if repo is None:
-            raise GitError(
-                self,
-                message="Could not find merge base. pygit repository could not be instantiated.",
-            )
-        commit1 = self.top_commit_of_branch(branch1)
-        commit2 = self.top_commit_of_branch(branch2)
-        return repo.merge_base(commit1, commit2).hex
+        return self._run_pygit("get_merge_base", self._get_merge_base, branch1, branch2)
+
+    def _get_merge_base(self, branch1: str, branch2: str) -> str:
+        return self._git("merge-base {} {}", branch1, branch2)
 
     def get_tracking_branch(
         self, branch: Optional[str] = "", strip_remote: Optional[bool] = False
@@ -1152,11 +1561,16 @@ class GitRepository:
         """Returns tracking branch name in format origin/branch-name or None if branch does not
         track remote branch.
         """
+        tracking_branch = self._run_pygit(
+            "get_tracking_branch", self._get_tracking_branch, branch
+        )
+        if tracking_branch and strip_remote:
+            tracking_branch = self.branch_local_name(tracking_branch)
+        return tracking_branch
+
+    def _get_tracking_branch(self, branch: str) -> Optional[str]:
         try:
-            tracking_branch = self._git(f"rev-parse --abbrev-ref {branch}@{{u}}")
-            if strip_remote:
-                tracking_branch = self.branch_local_name(tracking_branch)
-            return tracking_branch
+            return self._git(f"rev-parse --abbrev-ref {branch}@{{u}}")
         except GitError:
             return None
 
@@ -1190,23 +1604,77 @@ class GitRepository:
             raise e
         except Exception:
             self._log_warning(
-                "Perfomance regression: Could not list files with pygit2. Reverting to git subprocess"
+                "Perfomance regression: Could not list files with pygit2. Reverting to git cat-file"
             )
             return self._list_files_at_revision(commit, posix_path)
 
     def _list_files_at_revision(self, commit: str, path: str) -> List[str]:
         if path is None:
             path = ""
-        file_names = self._git("ls-tree -r --name-only {}", commit)
-        list_of_files: List = []
-        if not file_names:
-            return list_of_files
-        for file_in_repo in file_names.split("\n"):
-            if not file_in_repo.startswith(path):
+        return self.cat_file.list_files_at_revision(commit, path)
+
+    def list_files_at_revision_incremental(
+        self,
+        commit: str,
+        path: str = "",
+        previous: Optional[FilesAtRevision] = None,
+    ) -> FilesAtRevision:
+        """
+        List files inside of the given directory at the given revision by applying
+        the changes between the previously listed revision and this one to the previous
+        listing. If there is no previous listing, all files are considered to be added.
+        A directory which does not exist at a revision is treated as empty.
+        Used when listing the same directory at consecutive commits, so that
+        only changed subtrees are read instead of whole directories.
+        """
+        posix_path = Path(path).as_posix()
+        if previous is not None and previous.path != posix_path:
+            previous = None
+        if previous is not None and previous.commit == commit:
+            return FilesAtRevision(commit, posix_path, previous.files)
+        previous_commit = previous.commit if previous is not None else None
+        added, modified, removed = self._run_pygit(
+            "diff_files_at_path",
+            self._diff_files_at_path,
+            previous_commit,
+            commit,
+            posix_path,
+        )
+        files = previous.files if previous is not None else frozenset()
+        if added or removed:
+            files = (files - frozenset(removed)) | frozenset(added)
+        return FilesAtRevision(
+            commit,
+            posix_path,
+            files,
+            frozenset(added),
+            frozenset(modified),
+            frozenset(removed),
+        )
+
+    def _diff_files_at_path(
+        self, commit1: Optional[str], commit2: str, path: str
+    ) -> Tuple[List[str], List[str], List[str]]:
+        path = "" if path == "." else path.strip("/")
+        command = (
+            f"diff-tree -r --no-renames --name-status {commit1 or EMPTY_TREE} {commit2}"
+        )
+        if path:
+            command = f"{command} -- {path}"
+        added, modified, removed = [], [], []
+        for line in self._git(command).splitlines():
+            status, _, file_path = line.partition("\t")
+            if not file_path:
                 continue
-            file_in_repo = os.path.relpath(file_in_repo, path)
-            list_of_files.append(file_in_repo)
-        return list_of_files
+            if path:
+                file_path = file_path[len(path) + 1 :]
+            if status == "A":
+                added.append(file_path)
+            elif status == "D":
+                removed.append(file_path)
+            else:
+                modified.append(file_path)
+        return added, modified, removed
 
     def list_changed_files_at_revision(self, commit: str) -> List[str]:
         repo = self.pygit_repo
@@ -1277,9 +1745,14 @@ class GitRepository:
     def list_modified_files(
         self, path: Optional[str] = None, with_status: Optional[bool] = False
     ) -> List[Tuple]:
-        # TODO
-        # repo.diff("HEAD")
-        # go over the returned diff object
+        modified_files = self._run_pygit(
+            "list_modified_files", self._list_modified_files, path
+        )
+        if with_status:
+            return modified_files
+        return [file_path for _, file_path in modified_files]
+
+    def _list_modified_files(self, path: Optional[str] = None) -> List[Tuple]:
         diff_command = "diff --name-status"
         if path is not None:
             diff_command = f"{diff_command} {path}"
@@ -1288,10 +1761,7 @@ class GitRepository:
         for modified_file in modified_files:
             # ignore warning lines
             if len(modified_file) and modified_file[0] in ["A", "M", "D"]:
-                if with_status:
-                    files.append(tuple(modified_file.split(maxsplit=1)))
-                else:
-                    files.append(modified_file.split(maxsplit=1)[1])
+                files.append(tuple(modified_file.split(maxsplit=1)))
         return files
 
     def list_tags(self) -> List[str]:
@@ -1315,12 +1785,26 @@ class GitRepository:
             ...
         }
         """
-        worktrees_list = self._git("worktree list")
-        worktrees = [w.split() for w in worktrees_list.splitlines() if w]
-        return {
-            Path(wt[0]): (Path(wt[0]), wt[1], wt[2].replace("[", "").replace("]", ""))
-            for wt in worktrees
-        }
+        return self._run_pygit("list_worktrees", self._list_worktrees)
+
+    def _list_worktrees(self) -> Dict[Path, Tuple[Path, str, str]]:
+        worktrees = {}
+        # worktree records are separated by an empty line
+        for record in self._git("worktree list --porcelain").split("\n\n"):
+            attributes = dict(
+                (line.split(" ", 1) + [""])[:2] for line in record.splitlines()
+            )
+            if "worktree" not in attributes:
+                continue
+            path = Path(attributes["worktree"])
+            if "bare" in attributes:
+                branch = "(bare)"
+            elif "detached" in attributes:
+                branch = "(detached HEAD)"
+            else:
+                branch = _remote_branch_re.sub("", attributes.get("branch", ""))
+            worktrees[path] = (path, attributes.get("HEAD", ""), branch)
+        return worktrees
 
     def merge_commit(
         self,
@@ -1446,6 +1930,9 @@ class GitRepository:
 
     def something_to_commit(self) -> bool:
         """Checks if there are any uncommitted changes"""
+        return self._run_pygit("something_to_commit", self._something_to_commit)
+
+    def _something_to_commit(self) -> bool:
         uncommitted_changes = self._git("status --porcelain")
         return bool(uncommitted_changes)
 
@@ -0,0 +1,138 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import taf.settings as settings
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(
+        f"{type(self).__name__} is read only. Use copy.deepcopy to get a mutable copy"
+    )
+
+
+class FrozenDict(dict):
+    """
+    Read only dictionary handed out by the parsed JSON cache, so that a
+    document which is shared by all callers cannot be modified by one of them.
+    A copy made using copy.copy or copy.deepcopy is a regular, mutable dictionary.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return dict, (thaw(self),)
+
+
+class FrozenList(list):
+    """
+    Read only list handed out by the parsed JSON cache. See FrozenDict.
+    """
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return list, (thaw(self),)
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert dictionaries and lists of a parsed JSON document
+    to their read only counterparts
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Return a mutable deep copy of a (possibly frozen) JSON document
+    """
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+class JSONCache:
+    """
+    Least recently used cache of parsed JSON documents keyed by the id of the
+    blob they were parsed from, so that a document is parsed once no matter
+    at how many revisions it is read. Documents are stored frozen.
+    If max_size is not specified, settings.json_cache_max_size is used.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self._max_size = max_size
+        self._documents: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return settings.json_cache_max_size
+
+    def __contains__(self, git_id: str) -> bool:
+        return git_id in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, git_id: str) -> Optional[Any]:
+        with self._lock:
+            if git_id not in self._documents:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(git_id)
+            self.hits += 1
+            return self._documents[git_id]
+
+    def put(self, git_id: str, document: Any) -> Any:
+        """
+        Freeze and cache the document. Return the frozen document
+        """
+        document = freeze(document)
+        with self._lock:
+            if self.max_size <= 0:
+                return document
+            self._documents[git_id] = document
+            self._documents.move_to_end(git_id)
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+                self.evictions += 1
+        return document
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "documents": len(self._documents),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
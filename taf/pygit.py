@@ -1,11 +1,63 @@
-from typing import Dict
+import datetime
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import pygit2
-from collections import defaultdict
+import taf.settings as settings
+from taf.blob_cache import BlobCache
 from taf.log import taf_logger as logger
 from taf.exceptions import GitError
 import os.path
 
 
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+# returned by TreePathIndex.get if the path was never resolved
+_NOT_INDEXED = object()
+
+
+class TreePathIndex:
+    """
+    Bounded, least recently used mapping of (tree id, path) to the id of the object
+    at that path, or to None if no object exists at that path.
+    Since trees are identified by their content, the resolved ids never change.
+    If max_size is not specified, settings.tree_path_index_max_size is used.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self._max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return settings.tree_path_index_max_size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, tree_id, path):
+        with self._lock:
+            key = (tree_id, path)
+            if key not in self._entries:
+                return _NOT_INDEXED
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, tree_id, path, oid) -> None:
+        with self._lock:
+            self._entries[(tree_id, path)] = oid
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class PyGitRepository:
     def __init__(
         self,
@@ -17,7 +69,11 @@ class PyGitRepository:
         self.path = encapsulating_repo.path
         self.repo = pygit2.Repository(str(self.path))
 
-    _files_cache: Dict = defaultdict(dict)
+    # shared by all repositories, since blobs are identified by their content
+    blob_cache: BlobCache = BlobCache()
+
+    # shared by all repositories, since trees are identified by their content
+    tree_path_index: TreePathIndex = TreePathIndex()
 
     def _get_child(self, parent, path_part):
         """
@@ -36,15 +92,42 @@ class PyGitRepository:
         for the given commit object,
         get the object at the given path
         """
-        working = obj.tree
-        if path.endswith("/"):
-            path = path[:-1]
-        path = path.split("/")
-        for part in path:
-            working = self._get_child(working, part)
-            if working is None:
-                return None
-        return working
+        tree = obj.tree
+        path = path.strip("/")
+        if path in ("", "."):
+            return tree
+        oid = self._resolve_path(tree.id, path, tree)
+        if oid is None:
+            return None
+        # raises KeyError if the object was filtered out by a partial clone
+        return self.repo[oid]
+
+    def _resolve_path(self, tree_id, path, tree=None):
+        """
+        Return id of the object at the given path relative to the tree with the
+        given id, or None if there is no such object.
+        Resolved paths are memoized for every subtree along the path, so
+        a tree is only loaded if the remainder of the path was not resolved before
+        """
+        oid = self.tree_path_index.get(tree_id, path)
+        if oid is not _NOT_INDEXED:
+            return oid
+        if tree is None:
+            tree = self.repo[tree_id]
+        name, _, rest = path.partition("/")
+        try:
+            entry = tree[name]
+        except KeyError:
+            oid = None
+        else:
+            if not rest:
+                oid = entry.id
+            elif entry.type_str == "tree":
+                oid = self._resolve_path(entry.id, rest)
+            else:
+                oid = None
+        self.tree_path_index.put(tree_id, path, oid)
+        return oid
 
     def _get_blob_at_path(self, obj, path):
         """
@@ -80,11 +163,11 @@ class PyGitRepository:
             )
         else:
             git_id = blob.hex
-            type = "raw" if raw else "decoded"
-            if git_id not in self._files_cache or type not in self._files_cache[git_id]:
-                content = blob.read_raw() if raw else blob.read_raw().decode()
-                self._files_cache[git_id] |= {type: content}
-            return git_id, self._files_cache[git_id][type]
+            content = self.blob_cache.get(git_id)
+            if content is None:
+                content = blob.read_raw()
+                self.blob_cache.put(git_id, content)
+            return git_id, content if raw else content.decode()
 
     def _list_files_at_revision(self, tree, path="", results=None):
         """
@@ -121,3 +204,263 @@ class PyGitRepository:
                 message=f"fatal: Path '{path}' does not exist in '{commit}'",
             )
         return self._list_files_at_revision(root)
+
+    def diff_files_at_path(
+        self, commit1: Optional[str], commit2: str, path: str
+    ) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Return paths relative to the given path of files which were added, modified
+        and removed between the two commits. If commit1 is None, all files
+        at commit2 are considered to be added. A path which does not exist, or is not
+        a directory, is treated as an empty directory. Unchanged subtrees are
+        skipped without being read, so the cost depends on the number of changes.
+        """
+        tree1 = self._get_tree_at_path(commit1, path) if commit1 is not None else None
+        tree2 = self._get_tree_at_path(commit2, path)
+        if tree1 is None and tree2 is None:
+            return [], [], []
+        if tree1 is None:
+            diff = tree2.diff_to_tree(swap=True)
+        elif tree2 is None:
+            diff = tree1.diff_to_tree()
+        elif tree1.id == tree2.id:
+            return [], [], []
+        else:
+            diff = tree1.diff_to_tree(tree2)
+        added, modified, removed = [], [], []
+        for delta in diff.deltas:
+            status = delta.status_char()
+            if status == "A":
+                added.append(delta.new_file.path)
+            elif status == "D":
+                removed.append(delta.old_file.path)
+            else:
+                modified.append(delta.new_file.path)
+        return added, modified, removed
+
+    def get_object_id_at_path(self, commit, path):
+        """
+        Return id of the object (blob or tree) at the given path at the given commit,
+        or None if there is no such object. The object itself is not loaded
+        """
+        obj = self.repo.get(commit)
+        if obj is None:
+            raise GitError(
+                self.encapsulating_repo,
+                message=f"fatal: Commit {commit} does not exist",
+            )
+        tree = obj.peel(pygit2.Tree)
+        path = path.strip("/")
+        if path in ("", "."):
+            return str(tree.id)
+        oid = self._resolve_path(tree.id, path, tree)
+        return str(oid) if oid is not None else None
+
+    def _get_tree_at_path(self, commit, path):
+        obj = self.repo.get(commit)
+        if obj is None:
+            raise GitError(
+                self.encapsulating_repo,
+                message=f"fatal: Commit {commit} does not exist",
+            )
+        tree = self._get_object_at_path(obj, path)
+        return tree if isinstance(tree, pygit2.Tree) else None
+
+    def missing_blobs(
+        self, commits: List[str], paths: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Return ids of blobs inside of the given commits (or only inside of the given
+        directories of those commits) which are not in the object database, because
+        they were filtered out by a partial clone. Every tree is only read once.
+        """
+        missing = set()
+        visited = set()
+        for commit in commits:
+            tree = self.repo[commit].peel(pygit2.Tree)
+            if paths is None:
+                oids = [tree.id]
+            else:
+                oids = [
+                    self._resolve_path(tree.id, path.strip("/"), tree) for path in paths
+                ]
+            stack = [oid for oid in oids if oid is not None]
+            while stack:
+                oid = stack.pop()
+                if oid in visited:
+                    continue
+                visited.add(oid)
+                obj = self.repo.get(oid)
+                if obj is None:
+                    missing.add(oid.hex)
+                elif isinstance(obj, pygit2.Tree):
+                    for entry in obj:
+                        if entry.type_str == "tree":
+                            stack.append(entry.id)
+                        elif entry.type_str == "blob" and entry.id not in self.repo:
+                            missing.add(entry.hex)
+        return sorted(missing)
+
+    def _get_tree(self, revision):
+        """
+        Return the tree the given revision points to. The empty tree is
+        returned as None, since it does not have to exist in the object database.
+        """
+        if revision == EMPTY_TREE:
+            return None
+        return self.repo.revparse_single(revision).peel(pygit2.Tree)
+
+    def _get_top_commit(self, branch_name):
+        """
+        Return id of the top commit of a local branch or of the commit
+        a reference like HEAD points to
+        """
+        branch = self.repo.branches.get(branch_name)
+        if branch is not None:
+            return branch.target
+        return self.repo.revparse_single(branch_name).peel(pygit2.Commit).id
+
+    def commit_exists(self, commit_sha: str) -> str:
+        """
+        Return sha of the commit the given revision points to, or raise GitError
+        if the revision cannot be resolved to a commit
+        """
+        try:
+            obj = self.repo.revparse_single(commit_sha)
+            return obj.peel(pygit2.Commit).hex
+        except (KeyError, ValueError, pygit2.GitError, pygit2.InvalidSpecError):
+            raise GitError(
+                self.encapsulating_repo,
+                message=f"fatal: Needed a single revision. Commit {commit_sha} does not exist",
+            )
+
+    def get_commit_date(self, commit_sha: str) -> str:
+        """
+        Return the date of the given commit in the committer's timezone
+        formatted as YYYY-MM-DD
+        """
+        commit = self.repo.get(commit_sha)
+        # offset is expressed in minutes
+        date = datetime.datetime.utcfromtimestamp(
+            commit.commit_time + commit.commit_time_offset * 60
+        )
+        return date.strftime("%Y-%m-%d")
+
+    def get_commit_message(self, commit_sha: str) -> str:
+        commit = self.repo.get(commit_sha)
+        return commit.message
+
+    def get_merge_base(self, branch1: str, branch2: str) -> str:
+        commit1 = self._get_top_commit(branch1)
+        commit2 = self._get_top_commit(branch2)
+        return self.repo.merge_base(commit1, commit2).hex
+
+    def get_tracking_branch(self, branch: str = "") -> Optional[str]:
+        """
+        Return the name of the upstream branch of the given (or the currently checked out)
+        local branch in format origin/branch-name, or None if there is no upstream
+        """
+        if not branch or branch == "HEAD":
+            if self.repo.head_is_detached or self.repo.head_is_unborn:
+                return None
+            branch = self.repo.head.shorthand
+        local_branch = self.repo.branches.local.get(branch)
+        if local_branch is None:
+            return None
+        try:
+            upstream = local_branch.upstream
+        except (KeyError, pygit2.GitError):
+            # upstream is configured, but the remote tracking branch does not exist
+            return None
+        return upstream.shorthand if upstream is not None else None
+
+    def diff_between_revisions(self, revision1: str, revision2: str) -> str:
+        """
+        Return changes between two revisions in the format of git diff --name-status
+        """
+        tree1 = self._get_tree(revision1)
+        tree2 = self._get_tree(revision2)
+        if tree1 is None and tree2 is None:
+            return ""
+        if tree1 is None:
+            diff = tree2.diff_to_tree(swap=True)
+        else:
+            diff = tree1.diff_to_tree(tree2)
+        diff.find_similar()
+        lines = []
+        for delta in diff.deltas:
+            status = delta.status_char()
+            if status in ("R", "C"):
+                lines.append(
+                    f"{status}{delta.similarity:03d}\t{delta.old_file.path}\t{delta.new_file.path}"
+                )
+            else:
+                lines.append(f"{status}\t{delta.new_file.path}")
+        return "\n".join(lines)
+
+    def list_modified_files(self, path: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Return (status, path) of all files whose working tree version differs from the
+        one in the index, like git diff --name-status
+        """
+        if path is not None:
+            path = Path(path).as_posix().rstrip("/")
+            if path == ".":
+                path = None
+        modified_files = []
+        for delta in self.repo.index.diff_to_workdir().deltas:
+            file_path = delta.new_file.path
+            if (
+                path is not None
+                and file_path != path
+                and not file_path.startswith(f"{path}/")
+            ):
+                continue
+            modified_files.append((delta.status_char(), file_path))
+        return modified_files
+
+    def something_to_commit(self) -> bool:
+        """
+        Check if there are staged, modified or untracked files
+        """
+        if self.repo.is_bare:
+            raise GitError(
+                self.encapsulating_repo,
+                message="fatal: this operation must be run in a work tree",
+            )
+        return bool(self.repo.status(untracked_files="normal"))
+
+    def list_worktrees(self) -> Dict[Path, Tuple[Path, str, str]]:
+        """
+        Return path, HEAD commit and checked out branch of the main and all linked worktrees
+        """
+
+        def _worktree_info(repo, path):
+            path = Path(path)
+            if repo.is_bare:
+                return path, ("", "(bare)")
+            if repo.head_is_detached:
+                return path, (repo.head.target.hex, "(detached HEAD)")
+            return path, (repo.head.target.hex, repo.head.shorthand)
+
+        main_path = self.repo.path if self.repo.is_bare else self.repo.workdir
+        worktrees = [_worktree_info(self.repo, main_path)]
+        for name in self.repo.list_worktrees():
+            worktree = self.repo.lookup_worktree(name)
+            worktrees.append(
+                _worktree_info(pygit2.Repository(worktree.path), worktree.path)
+            )
+        return {path: (path, commit, branch) for path, (commit, branch) in worktrees}
+
+    def get_last_branch_by_committer_date(self) -> Optional[str]:
+        """
+        Return name of the local branch whose top commit is the most recent one
+        """
+        local_branches = self.repo.branches.local
+        branches = [
+            (self.repo.get(local_branches[name].target).commit_time, name)
+            for name in local_branches
+        ]
+        if not branches:
+            return None
+        return max(branches)[1]
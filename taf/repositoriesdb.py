@@ -37,9 +37,16 @@ MIRRORS_JSON_PATH = f"{TARGETS_DIRECTORY_NAME}/{MIRRORS_JSON_NAME}"
 REPOSITORIES_JSON_PATH = f"{TARGETS_DIRECTORY_NAME}/{REPOSITORIES_JSON_NAME}"
 
 
-def clear_repositories_db():
+def clear_repositories_db(auth_repo: Optional[AuthenticationRepository] = None):
+    """
+    Remove repositories loaded from the specified authentication repository,
+    or all loaded repositories if it is not specified
+    """
     global _repositories_dict
-    _repositories_dict.clear()
+    if auth_repo is None:
+        _repositories_dict.clear()
+    else:
+        _repositories_dict.pop(auth_repo.path, None)
 
 
 def clear_dependencies_db():
@@ -308,7 +315,7 @@ def _determine_repo_class(repo_classes, name):
 
 
 def _get_custom_data(repo, target):
-    custom = repo.get("custom", {})
+    custom = dict(repo.get("custom", {}))
     target_custom = target.get("custom") if target is not None else None
     if target_custom is not None:
         custom.update(target_custom)
@@ -26,9 +26,108 @@ overwrite_last_validated_commit = False
 
 last_validated_commit = None
 
+# maximum total size in bytes of file contents read from git repositories
+# which are kept in memory. Set to 0 to disable caching
+blob_cache_max_bytes = 64 * 1024 * 1024
+
+# maximum number of resolved (tree, path) pairs which are kept in memory
+# so that paths inside of unchanged trees do not have to be walked again
+tree_path_index_max_size = 100000
+
+# maximum number of parsed JSON documents (metadata files, repositories.json...)
+# which are kept in memory. Set to 0 to disable caching
+json_cache_max_size = 4096
+
+# maximum number of successfully verified metadata signatures which are kept
+# in memory, so that unchanged metadata is not verified again. Set to 0 to
+# disable caching
+signature_cache_max_size = 100000
+
+# store verified signatures in the authentication repository's configuration
+# directory, so that they are not verified again by the following updates and
+# validations. The stored file is protected by an HMAC
+persist_signature_cache = False
+
+# file containing the user's secret used to compute HMACs of stored signature
+# caches. It is created if it does not exist and must not be writable by anyone
+# who can write to the configuration directories. Defaults to
+# ~/.taf/signature_cache.key
+signature_cache_key_path = None
+
+# before validating commits of the authentication repository one by one, verify
+# signatures of metadata of all commits using the updater's CPU pool, so that
+# the updater finds them in the signature cache
+parallel_signature_verification = False
+
+# validate commits of each target repository independently using the updater's
+# CPU pool, instead of validating all target repositories commit by commit of
+# the authentication repository. Results are combined so that the last valid
+# commit of the authentication repository is the same
+parallel_target_validation = False
+
+# number of validated commits of the authentication repository after which a
+# checkpoint is stored in its configuration directory, so that an interrupted
+# update resumes validation from it. Set to 0 to disable checkpoints
+validation_checkpoint_interval = 0
+
+# maximum number of linked authentication repositories (dependencies) which are
+# validated and updated at the same time. Dependencies which do not depend on each
+# other are updated concurrently if it is greater than 1
+max_concurrent_dependency_updates = 1
+
+# clone and fetch repositories in-process using pygit2 instead of running git,
+# which reports progress and can be cancelled. Credential helpers and ssh
+# configuration are only supported by git, so if an in-process transfer fails
+# it is repeated using git
+in_process_transport = False
+
+# clone the validation repository and target repositories which are not on disk
+# without file contents (git clone --filter=blob:none), so that only commits and
+# trees are transferred. Metadata and target files which are validated are fetched
+# afterwards. Remotes which do not support partial clones send everything
+partial_clone = False
+
+# keep a bare mirror of the remote authentication repository in the configuration
+# directory of the user's repository and only fetch new commits into it on each
+# update, instead of cloning the whole repository to a temp directory. The validation
+# repository is cloned from the mirror without copying its objects. Mirrors are
+# locked while they are updated and are never partial clones
+validation_repo_mirror_cache = False
+
+# keep bare mirrors of target repositories next to the authentication repository's
+# mirror and clone temp target repositories from them, so that only new commits are
+# fetched. Mirrors of target repositories which are already on disk are created from
+# the user's repositories, whose objects the temp repositories read
+target_repo_mirror_cache = False
+
+# maximum size of all mirrors of an authentication repository and its target repositories
+# in bytes. Least recently used mirrors are removed after an update until the rest fit,
+# except for the ones used in the last hour. Not limited if set to None
+mirror_cache_max_size = None
+
+# create temp clones of target repositories which are already on disk without
+# copying their objects. The temp repositories read objects from the user's
+# repositories (git alternates) and only store newly fetched ones
+share_objects_with_temp_repositories = False
+
+# do not clone or fetch target repositories whose commits did not change since the last
+# validated commit of the authentication repository, if their local branches are at the
+# last validated commits. New commits of their remotes which are not authenticated and
+# uncommitted changes of these repositories are then not detected
+skip_unchanged_target_repositories = False
+
 # determines if script files will be loaded from disk
 development_mode = False
 
+# run lifecycle handler scripts in a long-lived interpreter shared by all handlers,
+# instead of starting a new one for every script. Scripts are read from the last
+# validated commit of the authentication repository and durations of their executions
+# are logged. Modules imported by the scripts, except for the ones inside the
+# scripts' directories, stay imported for the following scripts. Scripts are not
+# isolated from each other: state of those modules, logging and signal handlers and
+# threads started by a script are seen by the following ones
+lifecycle_script_worker = False
+
 # The 'log.py' module manages TUF's logging system.  Users have the option to
 # enable/disable logging to a file via 'ENABLE_FILE_LOGGING', or
 # tuf.log.enable_file_logging() and tuf.log.disable_file_logging().
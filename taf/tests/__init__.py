@@ -1,3 +1,4 @@
 import os
 
 TEST_WITH_REAL_YK = os.environ.get("REAL_YK", False)
+RUN_BENCHMARKS = os.environ.get("RUN_BENCHMARKS", False)
@@ -4,8 +4,9 @@ from contextlib import contextmanager
 from pathlib import Path
 
 
+import pytest
 from pytest import fixture
-from taf.tests import TEST_WITH_REAL_YK
+from taf.tests import RUN_BENCHMARKS, TEST_WITH_REAL_YK
 from taf.utils import on_rm_error
 
 TEST_DATA_PATH = Path(__file__).parent / "data"
@@ -21,6 +22,21 @@ HANDLERS_DATA_INPUT_DIR = TEST_DATA_PATH / "handler_inputs"
 TEST_INIT_DATA_PATH = Path(__file__).parent / "init_data"
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: slow benchmark, only run if RUN_BENCHMARKS is set"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if RUN_BENCHMARKS:
+        return
+    skip_benchmark = pytest.mark.skip(reason="set RUN_BENCHMARKS to run benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 def pytest_generate_tests(metafunc):
     if "repositories" in metafunc.fixturenames:
         # When running tests with real yubikey, use just rsa-pkcs1v15-sha256 scheme
@@ -10,6 +10,7 @@ from taf.tests.conftest import TEST_DATA_REPOS_PATH
 TEST_DIR = Path(TEST_DATA_REPOS_PATH, "test-git")
 REPO_NAME = "repository"
 CLONE_REPO_NAME = "repository2"
+SECOND_CLONE_REPO_NAME = "repository3"
 
 
 @fixture
@@ -41,3 +42,13 @@ def clone_repository():
     yield repo
     repo.cleanup()
     shutil.rmtree(path, onerror=on_rm_error)
+
+
+@fixture
+def second_clone_repository():
+    path = TEST_DIR / SECOND_CLONE_REPO_NAME
+    path.mkdir(exist_ok=True, parents=True)
+    repo = GitRepository(path=path)
+    yield repo
+    repo.cleanup()
+    shutil.rmtree(path, onerror=on_rm_error)
@@ -1,3 +1,11 @@
+import copy
+import json
+import pickle
+import pytest
+from taf.exceptions import GitError
+from taf.json_cache import FrozenDict, JSONCache
+
+
 def test_clone_from_local(repository, clone_repository):
     clone_repository.clone_from_disk(repository.path)
     assert clone_repository.is_git_repository
@@ -13,3 +21,173 @@ def test_is_branch_with_unpushed_commits(repository, clone_repository):
     (clone_repository.path / "test3.txt").write_text("Updated test3")
     clone_repository.commit(message="Update test3.txt")
     assert clone_repository.is_branch_with_unpushed_commits(branch)
+
+
+def test_cat_file_get_file(repository):
+    commit = repository.head_commit_sha()
+    git_id, content = repository.cat_file.get_file(commit, "test1.txt")
+    assert (git_id, content) == repository.pygit.get_file(commit, "test1.txt")
+    _, raw_content = repository.cat_file.get_file(commit, "test2.txt", raw=True)
+    assert raw_content == b"Some example text 2"
+
+
+def test_cat_file_get_file_missing_path(repository):
+    commit = repository.head_commit_sha()
+    with pytest.raises(GitError):
+        repository.cat_file.get_file(commit, "missing.txt")
+    # the process should still be usable after a missing object
+    assert repository.cat_file.get_file(commit, "test3.txt")[1] == "Some example text 3"
+
+
+def test_cat_file_list_files_at_revision(repository):
+    commit = repository.head_commit_sha()
+    files = ["test1.txt", "test2.txt", "test3.txt"]
+    assert repository.cat_file.list_files_at_revision(commit) == files
+    assert repository.cat_file.list_files_at_revision(commit, ".") == files
+
+
+def test_cat_file_processes_stopped_on_cleanup(repository):
+    commit = repository.head_commit_sha()
+    cat_file = repository.cat_file
+    cat_file.get_file(commit, "test1.txt")
+    process = cat_file.batch._process
+    assert process.poll() is None
+    repository.cleanup()
+    assert process.poll() is not None
+
+
+def test_cat_file_list_files_at_revision_nested(repository):
+    (repository.path / "dir" / "sub").mkdir(parents=True)
+    (repository.path / "dir" / "b.txt").write_text("b")
+    (repository.path / "dir" / "sub" / "a.txt").write_text("a")
+    (repository.path / "dir-file.txt").write_text("c")
+    commit = repository.commit(message="Add nested files")
+    assert repository.cat_file.list_files_at_revision(
+        commit, "dir"
+    ) == repository.pygit.list_files_at_revision(commit, "dir")
+    # same order as git ls-tree
+    ls_tree = repository._git(f"ls-tree -r --name-only {commit}").split("\n")
+    assert repository.cat_file.list_files_at_revision(commit) == ls_tree
+
+
+def test_get_object_id_at_path(repository):
+    (repository.path / "dir").mkdir()
+    (repository.path / "dir" / "a.txt").write_text("a")
+    first_commit = repository.commit(message="Add dir")
+    (repository.path / "test1.txt").write_text("Updated test1")
+    second_commit = repository.commit(message="Update test1.txt")
+    for commit in (first_commit, second_commit):
+        for path in ("", "dir", "dir/a.txt", "test1.txt", "missing"):
+            assert repository.get_object_id_at_path(
+                commit, path
+            ) == repository._get_object_id_at_path(commit, path)
+    assert repository.get_object_id_at_path(second_commit, "missing") is None
+    # unchanged trees have the same id
+    assert repository.get_object_id_at_path(
+        first_commit, "dir"
+    ) == repository.get_object_id_at_path(second_commit, "dir")
+    assert repository.get_object_id_at_path(
+        first_commit, "test1.txt"
+    ) != repository.get_object_id_at_path(second_commit, "test1.txt")
+
+
+def test_get_json_cached_by_blob_id(repository, monkeypatch):
+    cache = JSONCache(max_size=10)
+    monkeypatch.setattr(repository, "json_cache", cache)
+    document = {"commit": "abc", "custom": {"list": [1, 2]}}
+    (repository.path / "data.json").write_text(json.dumps(document))
+    commit1 = repository.commit(message="Add data.json")
+    (repository.path / "test1.txt").write_text("Updated test1")
+    commit2 = repository.commit(message="Update test1.txt")
+
+    data1 = repository.get_json(commit1, "data.json")
+    data2 = repository.get_json(commit2, "data.json")
+    assert data1 == document
+    assert data1 is data2
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+    with pytest.raises(TypeError):
+        data1.pop("commit")
+    with pytest.raises(TypeError):
+        data1["custom"]["list"].append(3)
+    mutable = copy.deepcopy(data1)
+    mutable["custom"]["list"].append(3)
+    assert type(mutable["custom"]) is dict
+    assert data2["custom"]["list"] == [1, 2]
+    assert json.loads(json.dumps(data1)) == document
+    assert pickle.loads(pickle.dumps(data1)) == document
+
+
+def test_json_cache_eviction():
+    cache = JSONCache(max_size=2)
+    cache.put("a", {"a": 1})
+    cache.put("b", {"b": 1})
+    assert cache.get("a") == {"a": 1}
+    cache.put("c", {"c": 1})
+    assert "b" not in cache
+    assert isinstance(cache.get("c"), FrozenDict)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_partial_clone(repository, clone_repository, second_clone_repository):
+    (repository.path / "metadata").mkdir()
+    (repository.path / "metadata" / "root.json").write_text("{}")
+    repository.commit(message="Add metadata")
+    (repository.path / "metadata" / "root.json").write_text('{"version": 2}')
+    commit = repository.commit(message="Update metadata")
+    repository._git("config uploadpack.allowFilter true")
+    repository._git("config uploadpack.allowAnySHA1InWant true")
+    # file urls are not accepted by url validation
+    clone_repository.urls = [repository.path.as_uri()]
+    clone_repository.clone(bare=True, filter="blob:none")
+    assert clone_repository.is_partial_clone
+    assert not repository.is_partial_clone
+    commits = clone_repository.all_commits_on_branch()
+    assert len(clone_repository.pygit.missing_blobs(commits)) == 5
+
+    fetched = clone_repository.fetch_missing_blobs(commits[-2:], ["metadata"])
+    assert len(fetched) == 2
+    assert clone_repository.pygit.missing_blobs(commits[-2:], ["metadata"]) == []
+    assert clone_repository.pygit.get_file(commit, "metadata/root.json")[1] == (
+        '{"version": 2}'
+    )
+    # not fetched yet, read using git, which fetches it
+    assert clone_repository.get_file(commit, "test1.txt") == "Some example text 1"
+    assert len(clone_repository.pygit.missing_blobs(commits)) == 2
+
+    clone_repository.fetch_missing_blobs()
+    assert clone_repository.pygit.missing_blobs(commits) == []
+    second_clone_repository.clone_from_disk(clone_repository.path)
+    assert (second_clone_repository.path / "metadata" / "root.json").read_text() == (
+        '{"version": 2}'
+    )
+
+
+@pytest.mark.parametrize("is_bare", [True, False])
+def test_clone_from_disk_shared(
+    repository, clone_repository, second_clone_repository, is_bare
+):
+    repository._git("tag v1")
+    repository.checkout_branch("feature", create=True)
+    repository.checkout_branch(repository.default_branch)
+    clone_repository.clone_from_disk(repository.path, is_bare=is_bare, keep_remote=True)
+    shared = second_clone_repository
+    shared.clone_from_disk(
+        repository.path, is_bare=is_bare, keep_remote=True, shared=True
+    )
+    refs = "for-each-ref --format=%(refname)=%(objectname)=%(upstream)=%(symref)"
+    assert shared._git(refs) == clone_repository._git(refs)
+    assert shared.head_commit_sha() == repository.head_commit_sha()
+    assert "count: 0" in shared._git("count-objects -v")
+    assert "in-pack: 0" in shared._git("count-objects -v")
+    assert shared.get_file("HEAD", "test1.txt") == "Some example text 1"
+    if not is_bare:
+        assert not shared.something_to_commit()
+        assert (shared.path / "test1.txt").read_text() == "Some example text 1"
+        (shared.path / "test4.txt").write_text("Some example text 4")
+        commit = shared.commit(message="Add test4.txt")
+        # only the new blob, tree and commit are stored in the shared repository
+        assert "count: 3" in shared._git("count-objects -v")
+        repository.fetch_from_disk(shared.path)
+        assert repository.commit_exists(commit)
@@ -0,0 +1,300 @@
+import os
+import shutil
+import pytest
+from taf.blob_cache import BlobCache
+from taf.exceptions import GitError
+from taf.git import EMPTY_TREE
+from taf.pygit import TreePathIndex
+from taf.utils import on_rm_error
+
+
+def _commit_with_date(repo, message, date):
+    env = dict(os.environ, GIT_COMMITTER_DATE=date, GIT_AUTHOR_DATE=date)
+    repo._git("add -A")
+    repo._git(f"commit --quiet -m {message}", env=env)
+    return repo.head_commit_sha()
+
+
+def test_commit_exists_parity(repository):
+    head = repository.head_commit_sha()
+    for revision in ("HEAD", "HEAD~1", head, head[:10]):
+        assert repository.pygit.commit_exists(revision) == repository._commit_exists(
+            revision
+        )
+    for revision in ("HEAD~10", "0" * 40, "missing"):
+        with pytest.raises(GitError):
+            repository.pygit.commit_exists(revision)
+        with pytest.raises(GitError):
+            repository._commit_exists(revision)
+
+
+def test_get_commit_date_and_message_parity(repository):
+    (repository.path / "test4.txt").write_text("Some example text 4")
+    # committed close to midnight in a timezone east of UTC
+    commit = _commit_with_date(repository, "Add-test4.txt", "2023-01-01T23:30:00+0200")
+    assert repository.pygit.get_commit_date(commit) == "2023-01-01"
+    assert repository._get_commit_date(commit) == "2023-01-01"
+    for commit in repository.all_commits_on_branch():
+        assert repository.pygit.get_commit_message(
+            commit
+        ) == repository._get_commit_message(commit)
+
+
+def test_get_merge_base_parity(repository):
+    branch = repository.get_current_branch()
+    repository.checkout_branch("feature", create=True)
+    (repository.path / "feature.txt").write_text("feature")
+    repository.commit(message="Add feature.txt")
+    repository.checkout_branch(branch)
+    merge_base = repository.head_commit_sha()
+    (repository.path / "test1.txt").write_text("Updated test1")
+    repository.commit(message="Update test1.txt")
+    assert repository.pygit.get_merge_base(branch, "feature") == merge_base
+    assert repository._get_merge_base(branch, "feature") == merge_base
+
+
+def test_get_tracking_branch_parity(repository, clone_repository):
+    clone_repository.clone_from_disk(repository.path, keep_remote=True)
+    branch = clone_repository.get_current_branch()
+    for name in ("", branch, "missing"):
+        assert clone_repository.pygit.get_tracking_branch(
+            name
+        ) == clone_repository._get_tracking_branch(name)
+    assert clone_repository.get_tracking_branch(branch) == f"origin/{branch}"
+    assert clone_repository.get_tracking_branch(branch, strip_remote=True) == branch
+    assert repository.get_tracking_branch(repository.get_current_branch()) is None
+
+
+def test_diff_between_revisions_parity(repository):
+    (repository.path / "test1.txt").unlink()
+    (repository.path / "test2.txt").rename(repository.path / "renamed.txt")
+    (repository.path / "test3.txt").write_text("Updated test3")
+    (repository.path / "dir").mkdir()
+    (repository.path / "dir" / "test4.txt").write_text("Some example text 4")
+    repository.commit(message="Update files")
+    for revisions in ((EMPTY_TREE, "HEAD"), ("HEAD~1", "HEAD"), ("HEAD", "HEAD~2")):
+        assert repository.pygit.diff_between_revisions(
+            *revisions
+        ) == repository._diff_between_revisions(*revisions)
+    assert repository.diff_between_revisions("HEAD~1").split("\n") == [
+        "A\tdir/test4.txt",
+        "R100\ttest2.txt\trenamed.txt",
+        "D\ttest1.txt",
+        "M\ttest3.txt",
+    ]
+
+
+def test_list_modified_files_parity(repository):
+    (repository.path / "test1.txt").unlink()
+    (repository.path / "test3.txt").write_text("Updated test3")
+    (repository.path / "untracked.txt").write_text("untracked")
+    for path in (None, ".", "test3.txt"):
+        assert repository.pygit.list_modified_files(
+            path
+        ) == repository._list_modified_files(path)
+    assert repository.list_modified_files() == ["test1.txt", "test3.txt"]
+    assert repository.list_modified_files(with_status=True) == [
+        ("D", "test1.txt"),
+        ("M", "test3.txt"),
+    ]
+
+
+def test_something_to_commit_parity(repository):
+    assert not repository.pygit.something_to_commit()
+    assert not repository._something_to_commit()
+    (repository.path / "dir").mkdir()
+    (repository.path / "dir" / "untracked.txt").write_text("untracked")
+    assert repository.pygit.something_to_commit()
+    assert repository._something_to_commit()
+
+
+def test_list_worktrees_parity(repository):
+    worktree_path = repository.path.parent / "repository-worktree"
+    detached_path = repository.path.parent / "repository-detached"
+    try:
+        repository._git(f"worktree add -q -b worktree-branch {worktree_path}")
+        repository._git(f"worktree add -q --detach {detached_path} HEAD~1")
+        worktrees = repository.pygit.list_worktrees()
+        assert worktrees == repository._list_worktrees()
+        assert len(worktrees) == 3
+        assert (
+            repository.find_worktree_path_by_branch("worktree-branch")
+            == worktree_path.resolve()
+        )
+    finally:
+        shutil.rmtree(worktree_path, onerror=on_rm_error)
+        shutil.rmtree(detached_path, onerror=on_rm_error)
+        repository._git("worktree prune")
+
+
+def test_get_last_branch_by_committer_date_parity(repository):
+    branch = repository.get_current_branch()
+    repository.checkout_branch("feature", create=True)
+    (repository.path / "test4.txt").write_text("Some example text 4")
+    _commit_with_date(repository, "Add-test4.txt", "2050-01-01T00:00:00+0000")
+    repository.checkout_branch(branch)
+    assert repository.pygit.get_last_branch_by_committer_date() == "feature"
+    assert repository._get_last_branch_by_committer_date() == "feature"
+
+
+def test_blob_cache_eviction():
+    cache = BlobCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"
+    # "b" is the least recently used blob
+    cache.put("c", b"1234")
+    assert "b" not in cache
+    assert cache.get("b") is None
+    # larger than the whole budget, not cached
+    cache.put("d", b"12345678901")
+    assert "d" not in cache
+    assert cache.stats() == {
+        "blobs": 2,
+        "size": 8,
+        "max_bytes": 10,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+def test_get_file_uses_blob_cache(repository, monkeypatch):
+    cache = BlobCache(max_bytes=1024)
+    monkeypatch.setattr(repository.pygit, "blob_cache", cache)
+    commit = repository.head_commit_sha()
+    git_id, content = repository.pygit.get_file(commit, "test1.txt")
+    assert content == "Some example text 1"
+    assert cache.get(git_id) == b"Some example text 1"
+    assert repository.pygit.get_file(commit, "test1.txt", raw=True) == (
+        git_id,
+        b"Some example text 1",
+    )
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_tree_path_index(repository, monkeypatch):
+    index = TreePathIndex(max_size=100)
+    monkeypatch.setattr(repository.pygit, "tree_path_index", index)
+    (repository.path / "metadata" / "nested").mkdir(parents=True)
+    (repository.path / "metadata" / "nested" / "root.json").write_text("{}")
+    commit1 = repository.commit(message="Add metadata")
+    (repository.path / "test1.txt").write_text("Updated test1")
+    commit2 = repository.commit(message="Update test1.txt")
+
+    assert repository.get_file(commit1, "metadata/nested/root.json") == "{}"
+    assert len(index) == 3
+    # metadata tree did not change, so only the root tree is walked again
+    assert repository.get_file(commit2, "metadata/nested/root.json") == "{}"
+    assert len(index) == 4
+    metadata_tree = repository.pygit.repo.get(commit2).tree["metadata"].id
+    assert index.get(metadata_tree, "nested/root.json") is not None
+
+    for path in ("metadata/missing.json", "test1.txt/x", "missing/root.json"):
+        with pytest.raises(GitError):
+            repository.get_file(commit2, path)
+        assert index.get(repository.pygit.repo.get(commit2).tree.id, path) is None
+    assert repository.list_files_at_revision(commit2, "metadata/") == [
+        "nested/root.json"
+    ]
+    assert "metadata/nested/root.json" in repository.list_files_at_revision(commit2)
+
+
+def test_tree_path_index_eviction():
+    index = TreePathIndex(max_size=2)
+    index.put("tree1", "a", "oid1")
+    index.put("tree1", "b", None)
+    assert index.get("tree1", "a") == "oid1"
+    index.put("tree2", "a", "oid2")
+    assert len(index) == 2
+    # least recently used entry was evicted, unlike a path which does not exist
+    assert index.get("tree1", "b") is not None
+    assert index.get("tree2", "a") == "oid2"
+
+
+def test_list_files_at_revision_incremental(repository):
+    targets = repository.path / "targets"
+    (targets / "dir").mkdir(parents=True)
+    (targets / "a.json").write_text("a")
+    (targets / "dir" / "b.json").write_text("b")
+    commits = [repository.commit(message="Add targets")]
+    (targets / "dir" / "b.json").write_text("b updated")
+    (targets / "dir" / "c.json").write_text("c")
+    commits.append(repository.commit(message="Update targets"))
+    (targets / "a.json").unlink()
+    commits.append(repository.commit(message="Remove a.json"))
+    (repository.path / "test1.txt").write_text("Updated test1")
+    commits.append(repository.commit(message="Update test1.txt"))
+    shutil.rmtree(targets)
+    commits.append(repository.commit(message="Remove targets"))
+
+    listing = None
+    listings = []
+    for commit in commits:
+        listing = repository.list_files_at_revision_incremental(
+            commit, "targets", listing
+        )
+        listings.append(listing)
+        assert repository.pygit.diff_files_at_path(
+            commits[0], commit, "targets"
+        ) == repository._diff_files_at_path(commits[0], commit, "targets")
+
+    for listing in listings[:-1]:
+        assert listing.files == set(
+            repository.list_files_at_revision(listing.commit, "targets")
+        )
+    assert listings[0].added == {"a.json", "dir/b.json"}
+    assert listings[1].added == {"dir/c.json"}
+    assert listings[1].modified == {"dir/b.json"}
+    assert listings[2].removed == {"a.json"}
+    assert not listings[3].changed
+    assert listings[3].files == listings[2].files
+    assert listings[4].files == set()
+    assert listings[4].removed == {"dir/b.json", "dir/c.json"}
+
+
+def test_commit_graph_not_written_by_queries(repository):
+    commits = repository.all_commits_on_branch()
+    assert repository.branches_containing_commit(commits[0])
+    assert not repository.commit_graph.loaded_from_file
+    assert not (repository.path / ".git/objects/info/commit-graph").exists()
+
+
+def test_commit_graph_reachability(repository):
+    branch = repository.get_current_branch()
+    initial_commits = repository.all_commits_on_branch()
+    repository.checkout_branch("feature", create=True)
+    (repository.path / "feature.txt").write_text("feature")
+    feature_commit = repository.commit(message="Add feature.txt")
+    repository.checkout_branch(branch)
+    repository.write_commit_graph()
+    assert (repository.path / ".git/objects/info/commit-graph").is_file()
+    # commits newer than the commit-graph file
+    (repository.path / "test1.txt").write_text("Updated test1")
+    main_commit = repository.commit(message="Update test1.txt")
+    repository._git("branch other")
+
+    graph = repository.commit_graph
+    assert graph.loaded_from_file
+    assert graph.generation(initial_commits[0]) == 1
+    assert graph.generation(main_commit) == 4
+    assert graph.is_ancestor(initial_commits[1], feature_commit)
+    assert not graph.is_ancestor(feature_commit, main_commit)
+
+    assert list(repository.branches_containing_commit(initial_commits[-1])) == [
+        "other",
+        branch,
+        "feature",
+    ]
+    assert list(repository.branches_containing_commit(feature_commit)) == ["feature"]
+    assert list(repository.branches_containing_commit("0" * 40)) == []
+
+
+def test_all_commits_since_commit(repository):
+    commits = repository.all_commits_on_branch()
+    assert repository.all_commits_since_commit(commits[0]) == commits[1:]
+    assert repository.all_commits_since_commit(commits[0], reverse=False) == list(
+        reversed(commits[1:])
+    )
+    assert repository.all_commits_since_commit(commits[-1]) == []
@@ -0,0 +1,147 @@
+import threading
+import time
+import pygit2
+import pytest
+import taf.settings as settings
+from taf.exceptions import TransferCancelledError
+from taf.git import GitRepository
+
+
+@pytest.fixture
+def in_process_transport(monkeypatch):
+    monkeypatch.setattr(settings, "in_process_transport", True)
+
+
+def _refs(repo):
+    return repo._git("for-each-ref --format=%(refname)=%(objectname)").split("\n")
+
+
+def _origin(repository):
+    branch = repository.get_current_branch()
+    repository.checkout_branch("feature", create=True)
+    (repository.path / "feature.txt").write_text("feature")
+    repository.commit(message="Add feature.txt")
+    repository.checkout_branch(branch)
+    repository._git("tag v1")
+    return repository.path.as_uri()
+
+
+def _clone(path, url, bare):
+    repo = GitRepository(path=path)
+    # file urls are not accepted by url validation
+    repo.urls = [url]
+    repo.clone(bare=bare)
+    return repo
+
+
+@pytest.mark.parametrize("bare", [True, False])
+def test_clone_in_process_parity(
+    repository, clone_repository, second_clone_repository, monkeypatch, bare
+):
+    url = _origin(repository)
+    cli_clone = _clone(second_clone_repository.path, url, bare)
+    assert not cli_clone.transfer_stats
+
+    monkeypatch.setattr(settings, "in_process_transport", True)
+    clone = _clone(clone_repository.path, url, bare)
+    assert _refs(clone) == _refs(cli_clone)
+    assert clone.get_current_branch() == cli_clone.get_current_branch()
+    assert clone.default_branch == cli_clone.default_branch
+    # bare clones do not have a fetch refspec
+    assert clone._git(
+        "config --get-all remote.origin.fetch", log_error=True
+    ) == cli_clone._git("config --get-all remote.origin.fetch", log_error=True)
+    assert clone.get_remote_url() == url
+    if not bare:
+        assert not clone.something_to_commit()
+        assert (clone.path / "test1.txt").read_text() == "Some example text 1"
+
+    (stats,) = clone.transfer_stats
+    assert stats.operation == "clone"
+    assert stats.url == url
+    assert stats.received_objects == stats.total_objects > 0
+    assert stats.received_bytes > 0
+    assert stats.finished_at is not None
+    assert "refs/tags/v1" in stats.updated_refs
+
+
+@pytest.mark.parametrize("fetch_all", [True, False])
+def test_fetch_in_process_parity(
+    repository, clone_repository, second_clone_repository, monkeypatch, fetch_all
+):
+    url = _origin(repository)
+    clone = _clone(clone_repository.path, url, False)
+    cli_clone = _clone(second_clone_repository.path, url, False)
+    branch = repository.get_current_branch()
+    (repository.path / "test4.txt").write_text("Some example text 4")
+    repository.commit(message="Add test4.txt")
+    repository.checkout_branch("feature")
+    (repository.path / "feature.txt").write_text("feature updated")
+    repository.commit(message="Update feature.txt")
+
+    cli_clone.fetch(fetch_all=fetch_all, branch=branch)
+    monkeypatch.setattr(settings, "in_process_transport", True)
+    clone.fetch(fetch_all=fetch_all, branch=branch)
+    assert _refs(clone) == _refs(cli_clone)
+    assert clone.top_commit_of_branch(f"origin/{branch}") == (
+        repository.top_commit_of_branch(branch)
+    )
+
+    (stats,) = clone.transfer_stats
+    assert stats.operation == "fetch"
+    assert stats.received_objects > 0
+    assert f"refs/remotes/origin/{branch}" in stats.updated_refs
+
+
+def test_clone_in_process_cancelled(repository, clone_repository, in_process_transport):
+    url = _origin(repository)
+    clone = GitRepository(path=clone_repository.path)
+    clone.urls = [url]
+    clone.cancel_event = threading.Event()
+    clone.cancel_event.set()
+    with pytest.raises(TransferCancelledError):
+        clone.clone(bare=True)
+    assert not any(clone.path.iterdir())
+    assert clone.transfer_stats[0].cancelled
+
+
+def test_clone_in_process_falls_back_to_git(
+    repository, clone_repository, in_process_transport, monkeypatch
+):
+    url = _origin(repository)
+
+    def clone_repository_error(*args, **kwargs):
+        raise pygit2.GitError("unsupported")
+
+    monkeypatch.setattr(pygit2, "clone_repository", clone_repository_error)
+    clone = _clone(clone_repository.path, url, False)
+    assert clone.head_commit_sha() == repository.head_commit_sha()
+    assert clone.transfer_stats[0].finished_at is not None
+
+
+@pytest.mark.benchmark
+def test_transport_benchmark(
+    repository, clone_repository, second_clone_repository, monkeypatch, record_property
+):
+    """
+    Compare the duration of in-process and git subprocess clones and fetches
+    of a local repository. Checks that both produce the same result and that the
+    in-process transport is not considerably slower. Durations are recorded as
+    test properties (see --junitxml)
+    """
+    url = _origin(repository)
+    durations = {}
+    for in_process, target in (
+        (False, second_clone_repository),
+        (True, clone_repository),
+    ):
+        monkeypatch.setattr(settings, "in_process_transport", in_process)
+        start = time.monotonic()
+        clone = _clone(target.path, url, True)
+        for _ in range(10):
+            clone.fetch(fetch_all=True)
+        durations[in_process] = time.monotonic() - start
+    assert _refs(clone_repository) == _refs(second_clone_repository)
+    record_property("git_subprocess_duration", durations[False])
+    record_property("in_process_duration", durations[True])
+    assert durations[True] <= 2 * durations[False]
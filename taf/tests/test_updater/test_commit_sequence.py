@@ -0,0 +1,118 @@
+import pickle
+import time
+
+import pytest
+
+from taf.updater.commit_sequence import CommitSequence
+from taf.updater.updater_pipeline import _find_target_commit
+
+NUM_OF_BENCHMARK_COMMITS = 100000
+
+
+def _commits(num_of_commits, prefix="c"):
+    return [f"{prefix}{index:039d}" for index in range(num_of_commits)]
+
+
+def test_commit_sequence_without_duplicates():
+    commits = _commits(5)
+    sequence = CommitSequence(commits)
+    sequence.extend(reversed(commits))
+    sequence.append(commits[2])
+    assert sequence == commits
+    assert len(sequence) == 5
+    assert sequence[0] == commits[0]
+    assert sequence[1:3] == commits[1:3]
+    assert commits[3] in sequence
+    assert "missing" not in sequence
+
+
+def test_commit_sequence_positions():
+    commits = _commits(5)
+    sequence = CommitSequence(commits)
+    assert sequence.index(commits[3]) == 3
+    assert sequence.next_commit(commits[3]) == commits[4]
+    assert sequence.next_commit(commits[4]) is None
+    assert sequence.next_commit("missing") is None
+    assert sequence.commits_after(commits[1]) == commits[2:]
+    assert sequence.commits_after(commits[4]) == []
+    with pytest.raises(ValueError):
+        sequence.index("missing")
+    with pytest.raises(ValueError):
+        sequence.commits_after("missing")
+
+
+def test_commit_sequence_pickled():
+    sequence = CommitSequence(_commits(5))
+    unpickled = pickle.loads(pickle.dumps(sequence))
+    assert unpickled == sequence
+    assert unpickled.index(sequence[2]) == 2
+
+
+@pytest.mark.benchmark
+def test_target_validation_benchmark(record_property):
+    """
+    Merge local and fetched commits of a target repository's branch with 100k
+    commits and validate all of them, first as if each commit of the authentication
+    repository moved the target repository forward by one commit, and then as if
+    every other target commit was unauthenticated. Durations are recorded as test
+    properties (see --junitxml). Finding each commit takes constant time, so
+    validating twice as many commits should not take much more than twice as long
+    """
+    commits = _commits(NUM_OF_BENCHMARK_COMMITS)
+
+    # local commits, followed by the fetched ones, which include them
+    start = time.monotonic()
+    branch_commits = CommitSequence(commits[: NUM_OF_BENCHMARK_COMMITS // 2])
+    branch_commits.extend(commits)
+    fetched_duration = time.monotonic() - start
+    assert branch_commits == commits
+    target_commits = {"main": branch_commits}
+
+    start = time.monotonic()
+    previous_commit = commits[0]
+    for current_commit in commits[1:]:
+        previous_commit = _find_target_commit(
+            "namespace/target",
+            "main",
+            previous_commit,
+            "main",
+            current_commit,
+            target_commits,
+            False,
+        )
+    authenticated_duration = time.monotonic() - start
+    assert previous_commit == commits[-1]
+
+    start = time.monotonic()
+    previous_commit = commits[0]
+    for current_commit in commits[2::2]:
+        previous_commit = _find_target_commit(
+            "namespace/target",
+            "main",
+            previous_commit,
+            "main",
+            current_commit,
+            target_commits,
+            True,
+        )
+    unauthenticated_duration = time.monotonic() - start
+    assert previous_commit == commits[-2]
+
+    record_property("building_sequence_duration", fetched_duration)
+    record_property("authenticated_commits_duration", authenticated_duration)
+    record_property("unauthenticated_commits_duration", unauthenticated_duration)
+    # validation of a quarter of the commits, if it was linear
+    start = time.monotonic()
+    previous_commit = commits[0]
+    for current_commit in commits[1 : NUM_OF_BENCHMARK_COMMITS // 4]:
+        previous_commit = _find_target_commit(
+            "namespace/target",
+            "main",
+            previous_commit,
+            "main",
+            current_commit,
+            target_commits,
+            False,
+        )
+    quarter_duration = time.monotonic() - start
+    assert authenticated_duration < 8 * quarter_duration + 0.5
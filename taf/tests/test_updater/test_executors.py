@@ -0,0 +1,58 @@
+import pytest
+
+from taf.updater.executors import UpdaterExecutors, UpdaterPool
+
+
+def _square(number):
+    if number < 0:
+        raise ValueError(number)
+    return number * number
+
+
+def test_pool_map_records_stats():
+    pool = UpdaterPool("network", 2)
+    try:
+        assert pool.map(_square, range(10)) == [number * number for number in range(10)]
+    finally:
+        pool.shutdown()
+    stats = pool.stats.to_dict()
+    assert stats["submitted"] == 10
+    assert stats["completed"] == 10
+    assert stats["failed"] == 0
+    assert 1 <= stats["max_pending"] <= 10
+    assert stats["wall_time"] >= 0
+
+
+def test_pool_records_failed_tasks():
+    pool = UpdaterPool("cpu", 1, processes=True)
+    try:
+        with pytest.raises(ValueError):
+            pool.map(_square, [1, -1])
+    finally:
+        pool.shutdown()
+    assert pool.stats.completed == 1
+    assert pool.stats.failed == 1
+    assert pool.stats.kind == "process"
+
+
+def test_pool_processes_not_forked():
+    pool = UpdaterPool("cpu", 1, processes=True)
+    try:
+        assert pool.map(_square, [2]) == [4]
+        start_method = pool._executor._mp_context.get_start_method()
+    finally:
+        pool.shutdown()
+    assert start_method in ("forkserver", "spawn")
+
+
+def test_executors_worker_limits():
+    with UpdaterExecutors(
+        network_workers=4, cpu_workers=2, cpu_processes=False
+    ) as executors:
+        assert executors.network.max_workers == 4
+        assert executors.disk.max_workers >= 1
+        assert executors.cpu.max_workers == 2
+        assert not executors.cpu.processes
+        # workers are only started once a task is submitted
+        assert all(pool._executor is None for pool in executors.pools)
+    assert set(executors.stats()) == {"network", "disk", "cpu"}
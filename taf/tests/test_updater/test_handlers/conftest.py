@@ -1,7 +1,6 @@
 from taf.tests.conftest import TEST_DATA_PATH
 
 
-from tuf.ngclient._internal import trusted_metadata_set
 from pytest import fixture
 
 
@@ -15,8 +14,6 @@ UPDATE_HANDLERS_DATA_VALID_INPUT_IDR = HANDLERS_DATA_INPUT_DIR / "valid" / "upda
 REPO_HANDLERS_DATA_INVALID_INPUT_IDR = HANDLERS_DATA_INPUT_DIR / "invalid" / "repo"
 UPDATE_HANDLERS_DATA_INVALID_INPUT_IDR = HANDLERS_DATA_INPUT_DIR / "invalid" / "update"
 
-original_tuf_trusted_metadata_set = trusted_metadata_set.TrustedMetadataSet
-
 
 @fixture
 def types_update_valid_inputs():
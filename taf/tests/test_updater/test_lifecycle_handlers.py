@@ -0,0 +1,79 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+import taf.settings as settings
+from taf.auth_repo import AuthenticationRepository
+from taf.updater.lifecycle_handlers import Event, handle_repo_event
+
+SCRIPT = """
+import json
+import sys
+import time
+from pathlib import Path
+
+data = json.loads(sys.stdin.read())
+event = Path(__file__).parent.name
+repo_name = Path(__file__).parents[2].name
+persistent = data["state"]["persistent"]
+time.sleep(0.1)
+persistent[repo_name] = event
+print(json.dumps({"transient": {}, "persistent": persistent}))
+"""
+
+
+@pytest.mark.parametrize("script_worker", [False, True])
+def test_persistent_data_of_repositories_handled_concurrently_kept(
+    script_worker, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(settings, "development_mode", True)
+    monkeypatch.setattr(settings, "lifecycle_script_worker", script_worker)
+    scripts_root_dir = tmp_path / "scripts"
+    library_dir = tmp_path / "library"
+    library_dir.mkdir()
+    auth_repos = [
+        AuthenticationRepository(library_dir, f"org/{name}")
+        for name in ("first", "second")
+    ]
+    for auth_repo in auth_repos:
+        for event in ("changed", "succeeded", "completed"):
+            script_path = Path(scripts_root_dir, auth_repo.name, "repo", event, "a.py")
+            script_path.parent.mkdir(parents=True)
+            script_path.write_text(SCRIPT)
+
+    # repo handlers of dependencies are called from the threads of the
+    # dependency scheduler, see DependencyScheduler
+    barrier = threading.Barrier(len(auth_repos), timeout=60)
+    errors = []
+
+    def _handle_repo_event(auth_repo):
+        try:
+            barrier.wait()
+            handle_repo_event(
+                Event.CHANGED,
+                None,
+                library_dir,
+                str(scripts_root_dir),
+                auth_repo,
+                {"before_pull": None, "new": [], "after_pull": "commit"},
+                None,
+                {},
+            )
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=_handle_repo_event, args=(auth_repo,))
+        for auth_repo in auth_repos
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+    # changes made by scripts of both repositories are stored
+    persistent_data = json.loads(Path(library_dir, "persistent.json").read_text())
+    assert persistent_data == {"first": "completed", "second": "completed"}
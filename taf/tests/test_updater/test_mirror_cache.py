@@ -0,0 +1,44 @@
+import pytest
+
+import taf.settings as settings
+from taf.git import GitRepository
+from taf.updater.mirror_cache import MirrorCache
+
+
+@pytest.fixture
+def origin_repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "update_from_filesystem", True)
+    path = tmp_path / "origin"
+    path.mkdir()
+    repo = GitRepository(path=path)
+    repo.init_repo()
+    for i in range(2):
+        (repo.path / "file.txt").write_text(str(i))
+        repo.commit(message=f"Commit {i}")
+    return repo
+
+
+def test_mirror_objects_read_by_clones_not_pruned(origin_repo, tmp_path, monkeypatch):
+    # run gc even though git would not consider it necessary
+    gc = GitRepository.gc
+
+    def _gc(repo, auto=True, **kwargs):
+        return gc(repo, False, **kwargs)
+
+    monkeypatch.setattr(GitRepository, "gc", _gc)
+    url = str(origin_repo.path)
+    mirror_cache = MirrorCache(tmp_path / "mirrors")
+    with mirror_cache.lock(url):
+        mirror = mirror_cache.update_mirror(url)
+    # objects which are not reachable would be pruned immediately by default
+    mirror._git("config gc.pruneExpire now")
+    clone = GitRepository(path=tmp_path / "clone", urls=[url])
+    mirror_cache.clone_from_mirror(url, clone)
+    head_commit = clone.head_commit_sha()
+
+    # the last commit is only reachable from the clone after a force push
+    origin_repo.reset_num_of_commits(1, hard=True)
+    with mirror_cache.lock(url):
+        mirror_cache.update_mirror(url)
+    assert mirror.head_commit_sha() != head_commit
+    clone._git("fsck --full", reraise_error=True)
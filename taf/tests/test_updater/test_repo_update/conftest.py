@@ -16,12 +16,9 @@ from taf.tests.conftest import (
     origin_repos_group,
 )
 from taf.utils import on_rm_error
-from tuf.ngclient._internal import trusted_metadata_set
 from pytest import fixture
 from tuf.repository_tool import TARGETS_DIRECTORY_NAME
 
-original_tuf_trusted_metadata_set = trusted_metadata_set.TrustedMetadataSet
-
 NAMESPACE1 = "namespace1"
 NAMESPACE2 = "namespace2"
 TARGET1_NAME = "target1"
@@ -49,6 +49,7 @@ import fnmatch
 from pathlib import Path
 from collections import defaultdict
 import json
+import threading
 
 import pytest
 from pytest import fixture
@@ -57,7 +58,6 @@ from datetime import datetime
 
 import taf.settings as settings
 
-from tuf.ngclient._internal import trusted_metadata_set
 from taf.auth_repo import AuthenticationRepository
 from taf.exceptions import UpdateFailedError
 from taf.git import GitRepository
@@ -71,9 +71,13 @@ from taf.utils import on_rm_error
 
 from taf.log import disable_console_logging, disable_file_logging
 
-from taf.tests.test_updater.test_repo_update.conftest import (
-    original_tuf_trusted_metadata_set,
-)
+import taf.updater.updater as updater_module
+import taf.updater.updater_pipeline as updater_pipeline
+from taf.updater.git_trusted_metadata_set import GitTrustedMetadataSet
+from taf.updater.handlers import GitUpdater
+from taf.updater.mirror_cache import MirrorCache
+import taf.updater.signature_cache as signature_cache_module
+from taf.updater.signature_cache import signature_cache
 from taf.updater.types.update import OperationType
 
 AUTH_REPO_REL_PATH = "organization/auth_repo"
@@ -361,10 +365,6 @@ def test_valid_update_no_auth_repo_one_invalid_target_repo_exists(
 
 
 def test_updater_expired_metadata(updater_repositories, origin_dir, client_dir):
-    # tuf patch state is shared between tests
-    # so we manually revert to original tuf implementation
-    trusted_metadata_set.TrustedMetadataSet = original_tuf_trusted_metadata_set
-
     # without using freeze_time, we expect to get metadata expired error
     repositories = updater_repositories["test-updater-expired-metadata"]
     clients_auth_repo_path = client_dir / AUTH_REPO_REL_PATH
@@ -526,6 +526,450 @@ def test_update_repository_with_dependencies(
     )
 
 
+def test_update_repository_dependencies_concurrently(
+    library_with_dependencies, origin_dir, client_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "max_concurrent_dependency_updates", 2)
+    monkeypatch.setattr(settings, "validation_repo_path", None)
+    # both dependencies have to be updated at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=60)
+    root_url = str(library_with_dependencies["root/auth"]["auth_repo"].path)
+    update_current_repository = updater_module._update_current_repository
+
+    def _update_current_repository(operation, url, *args):
+        if url != root_url:
+            barrier.wait()
+        return update_current_repository(operation, url, *args)
+
+    monkeypatch.setattr(
+        updater_module, "_update_current_repository", _update_current_repository
+    )
+    _update_full_library(
+        OperationType.CLONE,
+        library_with_dependencies,
+        origin_dir,
+        client_dir,
+        expected_repo_type=UpdateType.EITHER,
+        auth_repo_name_exists=True,
+        excluded_target_globs=None,
+    )
+    # settings are not used to pass state of concurrently running pipelines
+    assert settings.validation_repo_path is None
+
+
+@pytest.mark.parametrize(
+    "test_name",
+    ["test-updater-valid-with-updated-expiration-dates", "test-updater-updated-root"],
+)
+def test_unchanged_metadata_verified_once(
+    test_name, updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    verified = []
+    verify = GitTrustedMetadataSet._verify
+
+    def _verify(self, role_name, data, delegator, *args):
+        delegator_version = delegator.signed.version if delegator else None
+        verified.append((role_name, data, delegator_version))
+        return verify(self, role_name, data, delegator, *args)
+
+    monkeypatch.setattr(GitTrustedMetadataSet, "_verify", _verify)
+    repositories = updater_repositories[test_name]
+    origin_dir = origin_dir / test_name
+    _update_and_check_commit_shas(
+        OperationType.CLONE, None, repositories, origin_dir, client_dir
+    )
+    assert verified
+    assert len(verified) == len(set(verified))
+
+
+def test_commits_which_do_not_modify_metadata_not_validated(
+    updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    validated_commits = []
+    update_tuf_current_revision = updater_pipeline._update_tuf_current_revision
+
+    def _update_tuf_current_revision(git_fetcher, updater, auth_repo_name):
+        validated_commits.append(git_fetcher.current_commit)
+        return update_tuf_current_revision(git_fetcher, updater, auth_repo_name)
+
+    monkeypatch.setattr(
+        updater_pipeline, "_update_tuf_current_revision", _update_tuf_current_revision
+    )
+    repositories = updater_repositories["test-updater-valid"]
+    origin_dir = origin_dir / "test-updater-valid"
+    origin_auth_repo = GitRepository(path=repositories[AUTH_REPO_REL_PATH])
+    head_commit = origin_auth_repo.head_commit_sha()
+    all_commits = origin_auth_repo.all_commits_on_branch()
+    readme_commits = []
+    try:
+        for i in range(2):
+            (origin_auth_repo.path / "README.md").write_text(f"Update {i}")
+            readme_commits.append(origin_auth_repo.commit(message=f"Update README {i}"))
+        _update_and_check_commit_shas(
+            OperationType.CLONE, None, repositories, origin_dir, client_dir
+        )
+    finally:
+        origin_auth_repo.reset_to_commit(head_commit, hard=True)
+    # the first commit is trusted, the last one is validated even though
+    # it did not modify metadata or targets
+    assert validated_commits == all_commits[1:] + readme_commits[1:]
+
+
+def test_unchanged_target_files_verified_once(
+    updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    loaded_targets = []
+    get_current_target_data = GitUpdater.get_current_target_data
+
+    def _get_current_target_data(self, filepath, raw=False):
+        loaded_targets.append(self.get_current_target_id(filepath))
+        return get_current_target_data(self, filepath, raw)
+
+    monkeypatch.setattr(GitUpdater, "get_current_target_data", _get_current_target_data)
+    repositories = updater_repositories["test-updater-valid"]
+    origin_dir = origin_dir / "test-updater-valid"
+    _update_and_check_commit_shas(
+        OperationType.CLONE, None, repositories, origin_dir, client_dir
+    )
+    assert loaded_targets
+    assert len(loaded_targets) == len(set(loaded_targets))
+
+
+def test_verified_signatures_persisted(
+    updater_repositories, origin_dir, client_dir, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(settings, "persist_signature_cache", True)
+    monkeypatch.setattr(
+        settings, "signature_cache_key_path", str(tmp_path / "signature_cache.key")
+    )
+    signature_cache.clear()
+    repositories = updater_repositories["test-updater-valid"]
+    origin_dir = origin_dir / "test-updater-valid"
+    _update_and_check_commit_shas(
+        OperationType.CLONE, None, repositories, origin_dir, client_dir
+    )
+    conf_dir = AuthenticationRepository(path=client_dir / AUTH_REPO_REL_PATH).conf_dir
+    signature_cache.clear()
+    signature_cache.load(conf_dir)
+    assert len(signature_cache)
+
+
+@pytest.mark.parametrize(
+    "test_name",
+    ["test-updater-delegated-roles", "test-updater-updated-root"],
+)
+def test_signatures_verified_in_parallel(
+    test_name, updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "parallel_signature_verification", True)
+    signature_cache.clear()
+    verified_sequentially = []
+    verify_signature = signature_cache_module._verify_signature
+
+    def _verify_signature(key, metadata, signed_serializer=None):
+        verified_sequentially.append(key.keyid)
+        return verify_signature(key, metadata, signed_serializer)
+
+    monkeypatch.setattr(signature_cache_module, "_verify_signature", _verify_signature)
+    repositories = updater_repositories[test_name]
+    origin_dir = origin_dir / test_name
+    _update_and_check_commit_shas(
+        OperationType.CLONE, None, repositories, origin_dir, client_dir, cpu_workers=2
+    )
+    assert len(signature_cache)
+    assert not verified_sequentially
+
+
+def test_validation_repo_cloned_from_mirror(
+    updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "validation_repo_mirror_cache", True)
+    fetched_mirrors = []
+    fetch_mirror = GitRepository.fetch_mirror
+
+    def _fetch_mirror(repo, *args, **kwargs):
+        fetched_mirrors.append(repo.path)
+        return fetch_mirror(repo, *args, **kwargs)
+
+    monkeypatch.setattr(GitRepository, "fetch_mirror", _fetch_mirror)
+    repositories = updater_repositories["test-updater-valid"]
+    origin_dir = origin_dir / "test-updater-valid"
+    client_repos = _clone_and_revert_client_repositories(
+        repositories, origin_dir, client_dir, 3
+    )
+    _create_last_validated_commit(
+        client_dir, client_repos[AUTH_REPO_REL_PATH].head_commit_sha()
+    )
+    # the mirror is created from the user's repository and fetched by the first update
+    _update_and_check_commit_shas(
+        OperationType.UPDATE, client_repos, repositories, origin_dir, client_dir
+    )
+    conf_dir = AuthenticationRepository(path=client_dir / AUTH_REPO_REL_PATH).conf_dir
+    mirrors = [path for path in Path(conf_dir, "mirrors").iterdir() if path.is_dir()]
+    assert len(mirrors) == 1
+    assert fetched_mirrors == mirrors
+    # and fetched by the following ones
+    _update_and_check_commit_shas(
+        OperationType.UPDATE, client_repos, repositories, origin_dir, client_dir
+    )
+    assert fetched_mirrors == mirrors * 2
+
+
+def test_target_repositories_cloned_from_mirrors(
+    updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "validation_repo_mirror_cache", True)
+    monkeypatch.setattr(settings, "target_repo_mirror_cache", True)
+    fetched_mirrors = []
+    fetch_mirror = GitRepository.fetch_mirror
+
+    def _fetch_mirror(repo, *args, **kwargs):
+        fetched_mirrors.append(repo.path)
+        return fetch_mirror(repo, *args, **kwargs)
+
+    monkeypatch.setattr(GitRepository, "fetch_mirror", _fetch_mirror)
+    repositories = updater_repositories["test-updater-valid"]
+    origin_dir = origin_dir / "test-updater-valid"
+    client_repos = _clone_and_revert_client_repositories(
+        repositories, origin_dir, client_dir, 3
+    )
+    _create_last_validated_commit(
+        client_dir, client_repos[AUTH_REPO_REL_PATH].head_commit_sha()
+    )
+    # mirrors are created from the user's repositories, and then fetched
+    _update_and_check_commit_shas(
+        OperationType.UPDATE, client_repos, repositories, origin_dir, client_dir
+    )
+    conf_dir = AuthenticationRepository(path=client_dir / AUTH_REPO_REL_PATH).conf_dir
+    mirrors = [path for path in Path(conf_dir, "mirrors").iterdir() if path.is_dir()]
+    assert len(mirrors) == len(repositories)
+    assert sorted(fetched_mirrors) == sorted(mirrors)
+
+    # a repository which is not on disk is cloned from its mirror
+    fetched_mirrors.clear()
+    removed_repo_rel_path = next(
+        path for path in repositories if path != AUTH_REPO_REL_PATH
+    )
+    client_repos.pop(removed_repo_rel_path).cleanup()
+    shutil.rmtree(client_dir / removed_repo_rel_path, onerror=on_rm_error)
+    _update_and_check_commit_shas(
+        OperationType.UPDATE, client_repos, repositories, origin_dir, client_dir
+    )
+    assert sorted(fetched_mirrors) == sorted(mirrors)
+    # and it does not read objects from the mirror
+    shutil.rmtree(Path(conf_dir, "mirrors"), onerror=on_rm_error)
+    GitRepository(path=client_dir / removed_repo_rel_path)._git(
+        "fsck --full", reraise_error=True
+    )
+
+
+def test_unchanged_target_repositories_not_fetched(
+    updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "skip_unchanged_target_repositories", True)
+    fetched_repos = []
+    fetch = GitRepository.fetch
+    clone_from_disk = GitRepository.clone_from_disk
+
+    def _fetch(repo, *args, **kwargs):
+        fetched_repos.append(repo.name)
+        return fetch(repo, *args, **kwargs)
+
+    def _clone_from_disk(repo, *args, **kwargs):
+        fetched_repos.append(repo.name)
+        return clone_from_disk(repo, *args, **kwargs)
+
+    monkeypatch.setattr(GitRepository, "fetch", _fetch)
+    monkeypatch.setattr(GitRepository, "clone_from_disk", _clone_from_disk)
+    test_name = "test-updater-valid-with-updated-expiration-dates"
+    repositories = updater_repositories[test_name]
+    origin_dir = origin_dir / test_name
+    # only the last commit of the authentication repository updates a target file
+    client_repos = _clone_and_revert_client_repositories(
+        repositories, origin_dir, client_dir, 2
+    )
+    _create_last_validated_commit(
+        client_dir, client_repos[AUTH_REPO_REL_PATH].head_commit_sha()
+    )
+    _update_and_check_commit_shas(
+        OperationType.UPDATE, client_repos, repositories, origin_dir, client_dir
+    )
+    assert "namespace/TargetRepo1" in fetched_repos
+    assert "namespace/TargetRepo2" not in fetched_repos
+    assert "namespace/TargetRepo3" not in fetched_repos
+
+
+def test_least_recently_used_mirrors_evicted(
+    updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "validation_repo_mirror_cache", True)
+    monkeypatch.setattr(settings, "target_repo_mirror_cache", True)
+    monkeypatch.setattr(settings, "mirror_cache_max_size", 0)
+    repositories = updater_repositories["test-updater-valid"]
+    origin_dir = origin_dir / "test-updater-valid"
+    client_repos = _clone_and_revert_client_repositories(
+        repositories, origin_dir, client_dir, 3
+    )
+    _create_last_validated_commit(
+        client_dir, client_repos[AUTH_REPO_REL_PATH].head_commit_sha()
+    )
+    _update_and_check_commit_shas(
+        OperationType.UPDATE, client_repos, repositories, origin_dir, client_dir
+    )
+    conf_dir = AuthenticationRepository(path=client_dir / AUTH_REPO_REL_PATH).conf_dir
+    mirrors_dir = Path(conf_dir, "mirrors")
+    mirrors = [path for path in mirrors_dir.iterdir() if path.is_dir()]
+    # mirrors which were just used are kept, even though they do not fit
+    assert len(mirrors) == len(repositories)
+    mirror_cache = MirrorCache(mirrors_dir)
+    assert mirror_cache.evict(0, min_age=3600) == []
+    assert sorted(mirror_cache.evict(0, min_age=0)) == sorted(mirrors)
+    assert not [path for path in mirrors_dir.iterdir() if path.is_dir()]
+    assert len(list(mirrors_dir.glob("*.lock"))) == len(repositories)
+
+
+def test_update_output_contains_pool_stats(
+    updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "parallel_target_validation", True)
+    repositories = updater_repositories["test-updater-valid"]
+    origin_dir = origin_dir / "test-updater-valid"
+    output = _update_and_check_commit_shas(
+        OperationType.CLONE,
+        None,
+        repositories,
+        origin_dir,
+        client_dir,
+        network_workers=2,
+        disk_workers=3,
+        cpu_workers=1,
+        cpu_processes=False,
+    )
+    pool_stats = output["pool_stats"]
+    num_of_target_repos = len(repositories) - 1
+    # the validation repository and target repositories are cloned from the remote
+    assert pool_stats["network"]["max_workers"] == 2
+    assert pool_stats["network"]["completed"] == num_of_target_repos + 1
+    # commits of the cloned target repositories are read from disk
+    assert pool_stats["disk"]["max_workers"] == 3
+    assert pool_stats["disk"]["completed"] >= num_of_target_repos
+    assert pool_stats["cpu"]["max_workers"] == 1
+    assert pool_stats["cpu"]["kind"] == "thread"
+    assert pool_stats["cpu"]["completed"] == num_of_target_repos
+    assert all(stats["failed"] == 0 for stats in pool_stats.values())
+
+
+@pytest.mark.parametrize("tampered_root", [False, True])
+def test_interrupted_validation_resumed_from_checkpoint(
+    tampered_root, updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    monkeypatch.setattr(settings, "validation_checkpoint_interval", 1)
+    repositories = updater_repositories["test-updater-valid"]
+    origin_dir = origin_dir / "test-updater-valid"
+    all_commits = GitRepository(
+        path=repositories[AUTH_REPO_REL_PATH]
+    ).all_commits_on_branch()
+    interrupted_commit = all_commits[3]
+    interrupted = []
+    validated_commits = []
+    update_tuf_current_revision = updater_pipeline._update_tuf_current_revision
+
+    def _update_tuf_current_revision(git_fetcher, updater, auth_repo_name):
+        if git_fetcher.current_commit == interrupted_commit and not interrupted:
+            interrupted.append(interrupted_commit)
+            raise KeyboardInterrupt()
+        validated_commits.append(git_fetcher.current_commit)
+        return update_tuf_current_revision(git_fetcher, updater, auth_repo_name)
+
+    monkeypatch.setattr(
+        updater_pipeline, "_update_tuf_current_revision", _update_tuf_current_revision
+    )
+    with pytest.raises(UpdateFailedError):
+        _update_and_check_commit_shas(
+            OperationType.CLONE, None, repositories, origin_dir, client_dir
+        )
+    conf_repo = AuthenticationRepository(path=client_dir / AUTH_REPO_REL_PATH)
+    checkpoint = conf_repo.validation_checkpoint
+    assert checkpoint["commit"] == all_commits[2]
+    if tampered_root:
+        # a checkpoint whose root is not the root at its commit is ignored
+        root = json.loads(checkpoint["root"])
+        root["signed"]["expires"] = "2100-01-01T00:00:00Z"
+        checkpoint["root"] = json.dumps(root)
+        conf_repo.set_validation_checkpoint(checkpoint)
+
+    validated_commits.clear()
+    _update_and_check_commit_shas(
+        OperationType.CLONE, None, repositories, origin_dir, client_dir
+    )
+    assert validated_commits == all_commits[1 if tampered_root else 3 :]
+    # the checkpoint is removed once the last validated commit is updated
+    assert conf_repo.validation_checkpoint is None
+
+
+@pytest.mark.parametrize(
+    "test_name, expected_error",
+    [
+        ("test-updater-valid", None),
+        ("test-updater-multiple-branches", None),
+        ("test-updater-allow-unauthenticated-commits", None),
+        ("test-updater-invalid-target-sha", TARGET_MISSMATCH_PATTERN),
+        ("test-updater-missing-target-commit", TARGET_ADDITIONAL_COMMIT_PATTERN),
+        ("test-updater-delegated-roles-wrong-sha", TARGET_MISSMATCH_PATTERN),
+    ],
+)
+def test_parallel_target_validation(
+    test_name, expected_error, updater_repositories, origin_dir, client_dir, monkeypatch
+):
+    # validate target repositories sequentially and in parallel
+    # and check that the results are the same
+    validate_target_repositories = (
+        updater_pipeline.AuthenticationRepositoryUpdatePipeline.validate_target_repositories
+    )
+    results = []
+
+    def _validate_target_repositories(self):
+        validation_results = []
+        errors = []
+        for parallel in (False, True):
+            monkeypatch.setattr(settings, "parallel_target_validation", parallel)
+            num_of_errors = len(self.state.errors)
+            status = validate_target_repositories(self)
+            errors = self.state.errors[num_of_errors:]
+            validation_results.append(
+                (
+                    status,
+                    list(self.state.validated_auth_commits),
+                    dict(self.state.validated_commits_per_target_repos_branches),
+                    [str(error) for error in errors],
+                )
+            )
+            del self.state.errors[num_of_errors:]
+        # the pipeline continues with errors of the parallel validation
+        assert all(isinstance(error, Exception) for error in errors)
+        self.state.errors.extend(errors)
+        results.append(validation_results)
+        return status
+
+    monkeypatch.setattr(
+        updater_pipeline.AuthenticationRepositoryUpdatePipeline,
+        "validate_target_repositories",
+        _validate_target_repositories,
+    )
+    repositories = updater_repositories[test_name]
+    if expected_error is None:
+        _update_and_check_commit_shas(
+            OperationType.CLONE, None, repositories, origin_dir / test_name, client_dir
+        )
+    else:
+        _update_invalid_repos_and_check_if_repos_exist(
+            OperationType.CLONE, client_dir, repositories, expected_error, True
+        )
+    assert len(results) == 1
+    sequential_result, parallel_result = results[0]
+    assert sequential_result == parallel_result
+
+
 def _check_last_validated_commit(clients_auth_repo_path):
     # check if last validated commit is created and the saved commit is correct
     client_auth_repo = AuthenticationRepository(path=clients_auth_repo_path)
@@ -676,6 +1120,7 @@ def _update_and_check_commit_shas(
     expected_repo_type=UpdateType.EITHER,
     auth_repo_name_exists=True,
     excluded_target_globs=None,
+    **config_kwargs,
 ):
     start_head_shas = _get_head_commit_shas(client_repos)
     clients_auth_repo_path = client_dir / AUTH_REPO_REL_PATH
@@ -689,19 +1134,21 @@ def _update_and_check_commit_shas(
         library_dir=str(client_dir),
         expected_repo_type=expected_repo_type,
         excluded_target_globs=excluded_target_globs,
+        **config_kwargs,
     )
 
     with freeze_time(_get_valid_update_time(origin_auth_repo_path)):
         if operation == OperationType.CLONE:
-            clone_repository(config)
+            output = clone_repository(config)
         else:
-            update_repository(config)
+            output = update_repository(config)
 
     _check_if_commits_match(
         repositories, origin_dir, client_dir, start_head_shas, excluded_target_globs
     )
     if not excluded_target_globs:
         _check_last_validated_commit(clients_auth_repo_path)
+    return output
 
 
 def _update_full_library(
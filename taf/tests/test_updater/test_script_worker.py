@@ -0,0 +1,89 @@
+import json
+import sys
+
+import pytest
+
+from taf.exceptions import ScriptExecutionError
+from taf.updater.script_worker import ScriptWorker
+from taf.utils import run
+
+SCRIPT = """
+import json
+import os
+import sys
+
+data = json.loads(sys.stdin.read())
+print("not json")
+print(json.dumps({"transient": {"pid": os.getpid()}, "persistent": data}))
+"""
+
+
+@pytest.fixture
+def worker():
+    worker = ScriptWorker()
+    yield worker
+    worker.shutdown()
+
+
+def _write_script(path, source):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+    return str(path)
+
+
+def test_worker_output_matches_new_interpreter(worker, tmp_path):
+    script_path = _write_script(tmp_path / "script.py", SCRIPT)
+    data = json.dumps({"counter": 1})
+    output = worker.run(script_path, data)
+    expected_output = run(sys.executable, script_path, input=data)
+    assert output.splitlines()[0] == expected_output.splitlines()[0] == "not json"
+    assert json.loads(output.splitlines()[1])["persistent"] == {"counter": 1}
+    # scripts run in the same process
+    assert worker.run(script_path, data) == output
+    assert [timing.script for timing in worker.timings] == [script_path] * 2
+
+
+def test_output_of_started_processes_captured(worker, tmp_path):
+    script_path = _write_script(
+        tmp_path / "script.py",
+        "import os, subprocess, sys\n"
+        "print('script', flush=True)\n"
+        "subprocess.run([sys.executable, '-c', 'print(\"child\")'])\n"
+        "os.write(2, b'stderr')\n",
+    )
+    output = worker.run(script_path, "")
+    assert output == run(sys.executable, script_path) == "script\nchild\nstderr"
+    # the worker's channel is not affected
+    assert worker.run(script_path, "") == output
+
+
+def test_worker_runs_source_instead_of_file(worker, tmp_path):
+    script_path = _write_script(tmp_path / "script.py", "print('file')")
+    assert worker.run(script_path, "", source="print('source')") == "source"
+
+
+def test_modules_of_script_directories_not_shared(worker, tmp_path):
+    scripts = []
+    for name in ("first", "second"):
+        _write_script(tmp_path / name / "helper.py", f"NAME = '{name}'")
+        scripts.append(
+            _write_script(
+                tmp_path / name / "script.py", "import helper\nprint(helper.NAME)"
+            )
+        )
+    assert [worker.run(script, "") for script in scripts] == ["first", "second"]
+
+
+def test_worker_restarted_after_failures(worker, tmp_path):
+    failing_script = _write_script(
+        tmp_path / "failing.py", "import sys\nprint('output')\nsys.exit(1)"
+    )
+    exiting_script = _write_script(tmp_path / "exiting.py", "import os\nos._exit(0)")
+    script_path = _write_script(tmp_path / "script.py", SCRIPT)
+    with pytest.raises(ScriptExecutionError, match="output"):
+        worker.run(failing_script, "")
+    assert worker.is_running
+    with pytest.raises(ScriptExecutionError):
+        worker.run(exiting_script, "")
+    assert not worker.is_running
+    assert "not json" in worker.run(script_path, "{}")
@@ -0,0 +1,145 @@
+import json
+
+import pytest
+from pytest import fixture
+from securesystemslib.interface import (
+    import_rsa_privatekey_from_file,
+    import_rsa_publickey_from_file,
+)
+from securesystemslib.signer import SSlibSigner
+from tuf.api.exceptions import UnsignedMetadataError
+from tuf.api.metadata import Key, Metadata, Timestamp
+
+import taf.settings as settings
+import taf.updater.signature_cache as signature_cache_module
+from taf.tests.conftest import KEYSTORE_PATH
+from taf.updater.signature_cache import (
+    SIGNATURE_CACHE_FILENAME,
+    SIGNATURE_CACHE_KEY_FILENAME,
+    SignatureCache,
+)
+
+SCHEME = "rsa-pkcs1v15-sha256"
+
+
+@fixture
+def conf_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "signature_cache_key_path",
+        str(tmp_path / "home" / SIGNATURE_CACHE_KEY_FILENAME),
+    )
+    conf_dir = tmp_path / "conf"
+    conf_dir.mkdir()
+    return conf_dir
+
+
+@fixture
+def private_key():
+    key = import_rsa_publickey_from_file(
+        str(KEYSTORE_PATH / "timestamp.pub"), scheme=SCHEME
+    )
+    priv_key = import_rsa_privatekey_from_file(
+        str(KEYSTORE_PATH / "timestamp"), scheme=SCHEME
+    )
+    key["keyval"]["private"] = priv_key["keyval"]["private"]
+    return key
+
+
+@fixture
+def key(private_key):
+    return Key.from_securesystemslib_key(private_key)
+
+
+@fixture
+def metadata(private_key):
+    metadata = Metadata(Timestamp())
+    metadata.sign(SSlibSigner(private_key))
+    return metadata
+
+
+@fixture
+def verified_signatures(monkeypatch):
+    verified = []
+    verify_signature = signature_cache_module._verify_signature
+
+    def _verify_signature(key, metadata, signed_serializer=None):
+        verified.append(metadata.signatures[key.keyid].signature)
+        return verify_signature(key, metadata, signed_serializer)
+
+    monkeypatch.setattr(signature_cache_module, "_verify_signature", _verify_signature)
+    return verified
+
+
+def test_signature_verified_once(key, metadata, verified_signatures):
+    cache = SignatureCache(max_size=10)
+    cache.verify_signature(key, metadata)
+    cache.verify_signature(key, metadata)
+    assert len(verified_signatures) == 1
+    # modified metadata is verified again
+    metadata.signed.version += 1
+    with pytest.raises(UnsignedMetadataError):
+        cache.verify_signature(key, metadata)
+    with pytest.raises(UnsignedMetadataError):
+        cache.verify_signature(key, metadata)
+    assert len(verified_signatures) == 3
+    assert len(cache) == 1
+
+
+def test_key_verification_not_cached(key, metadata, verified_signatures):
+    cache = SignatureCache(max_size=10)
+    cache.verify_signature(key, metadata)
+    # only verification done through the cache uses it
+    key.verify_signature(metadata)
+    assert len(verified_signatures) == 1
+    assert Key.verify_signature.__module__ == "tuf.api.metadata"
+
+
+def test_signature_cache_disabled(key, metadata, verified_signatures):
+    cache = SignatureCache(max_size=0)
+    cache.verify_signature(key, metadata)
+    cache.verify_signature(key, metadata)
+    assert len(verified_signatures) == 2
+    assert len(cache) == 0
+
+
+def test_signature_cache_persisted(key, metadata, verified_signatures, conf_dir):
+    cache = SignatureCache(max_size=10)
+    cache.verify_signature(key, metadata)
+    cache.save(str(conf_dir))
+
+    loaded_cache = SignatureCache(max_size=10)
+    loaded_cache.load(str(conf_dir))
+    loaded_cache.verify_signature(key, metadata)
+    assert len(verified_signatures) == 1
+
+
+def test_tampered_signature_cache_ignored(key, metadata, conf_dir):
+    cache = SignatureCache(max_size=10)
+    cache.verify_signature(key, metadata)
+    cache.save(str(conf_dir))
+
+    path = conf_dir / SIGNATURE_CACHE_FILENAME
+    data = json.loads(path.read_text())
+    data["entries"].append("0" * 64)
+    path.write_text(json.dumps(data))
+
+    loaded_cache = SignatureCache(max_size=10)
+    loaded_cache.load(str(conf_dir))
+    assert len(loaded_cache) == 0
+
+
+def test_signature_cache_secret_not_stored_in_conf_dir(key, metadata, conf_dir):
+    cache = SignatureCache(max_size=10)
+    cache.verify_signature(key, metadata)
+    cache.save(str(conf_dir))
+    assert [path.name for path in conf_dir.iterdir()] == [SIGNATURE_CACHE_FILENAME]
+
+    # a cache protected by any other secret, e.g. one stored in the
+    # configuration directory, is ignored
+    entries = ["0" * 64]
+    data = {"entries": entries, "mac": signature_cache_module._mac(b"0" * 32, entries)}
+    (conf_dir / SIGNATURE_CACHE_FILENAME).write_text(json.dumps(data))
+    loaded_cache = SignatureCache(max_size=10)
+    loaded_cache.load(str(conf_dir))
+    assert len(loaded_cache) == 0
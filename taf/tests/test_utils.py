@@ -1,5 +1,12 @@
 import json
-from taf.utils import normalize_line_endings, safely_save_json_to_disk, safely_move_file
+import threading
+import time
+from taf.utils import (
+    FileLock,
+    normalize_line_endings,
+    safely_save_json_to_disk,
+    safely_move_file,
+)
 
 
 def test_normalize_line_ending_extra_lines():
@@ -51,3 +58,33 @@ def test_safely_move_file_same_filesystem(output_path):
     assert not src_path.is_file()
     assert dst_path.is_file()
     assert dst_path.read_text() == data
+
+
+def test_file_lock_is_exclusive(output_path):
+    lock_path = output_path / "test.lock"
+    holders = []
+    max_holders = []
+
+    def _hold_lock():
+        with FileLock(lock_path):
+            holders.append(threading.get_ident())
+            max_holders.append(len(holders))
+            time.sleep(0.05)
+            holders.remove(threading.get_ident())
+
+    threads = [threading.Thread(target=_hold_lock) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max_holders == [1, 1, 1, 1]
+    assert lock_path.is_file()
+
+
+def test_file_lock_not_acquired_without_blocking(output_path):
+    lock_path = output_path / "test.lock"
+    with FileLock(lock_path):
+        lock = FileLock(lock_path)
+        assert not lock.acquire(blocking=False)
+    assert lock.acquire(blocking=False)
+    lock.release()
@@ -15,6 +15,10 @@ def common_update_options(f):
     f = click.option("--format-output", is_flag=True, help="Return formatted output which includes information on if build was successful and error message if it was raised")(f)
     f = click.option("--exclude-target", multiple=True, help="Globs defining which target repositories should be ignored during update.")(f)
     f = click.option("--strict", is_flag=True, default=False, help="Enable/disable strict mode - return an error if warnings are raised.")(f)
+    f = click.option("--network-workers", type=int, default=None, help="Maximum number of repositories cloned or fetched from remotes at the same time.")(f)
+    f = click.option("--disk-workers", type=int, default=None, help="Maximum number of repositories cloned or read from the file system at the same time.")(f)
+    f = click.option("--cpu-workers", type=int, default=None, help="Maximum number of workers which verify signatures and validate target repositories. Defaults to the number of CPUs.")(f)
+    f = click.option("--cpu-threads", is_flag=True, default=False, help="Run CPU-bound validation in threads instead of processes.")(f)
     return f
 
 
@@ -131,6 +135,12 @@ def clone_repo_command():
         The update can be performed in strict or non-strict mode. Strict mode is enabled by specifying
         --strict, which will raise errors during the update if any warnings are found. By default, --strict
         is disabled.
+
+        The number of repositories which are cloned or fetched from remotes at the same time can be
+        limited using --network-workers, and the number of repositories cloned or read from the file
+        system using --disk-workers. Signatures and target repositories are validated by --cpu-workers
+        processes, or threads if --cpu-threads is specified. Statistics of these pools are included in
+        the formatted output.
         """)
     @catch_cli_exception(handle=UpdateFailedError)
     @click.argument("url")
@@ -138,7 +148,7 @@ def clone_repo_command():
     @click.option("--path", help="Authentication repository's location. If not specified, calculated by combining repository's name specified in info.json and library dir")
     @click.option("--library-dir", default=None, help="Directory where target repositories and, optionally, authentication repository are located. If not specified, set to the current directory")
     @click.option("--from-fs", is_flag=True, default=False, help="Indicates if we want to clone a repository from the filesystem")
-    def clone(path, url, library_dir, from_fs, expected_repo_type, scripts_root_dir, profile, format_output, exclude_target, strict):
+    def clone(path, url, library_dir, from_fs, expected_repo_type, scripts_root_dir, profile, format_output, exclude_target, strict, network_workers, disk_workers, cpu_workers, cpu_threads):
         if profile:
             start_profiling()
 
@@ -151,13 +161,17 @@ def clone_repo_command():
             expected_repo_type=UpdateType(expected_repo_type),
             scripts_root_dir=scripts_root_dir,
             excluded_target_globs=exclude_target,
-            strict=strict
+            strict=strict,
+            network_workers=network_workers,
+            disk_workers=disk_workers,
+            cpu_workers=cpu_workers,
+            cpu_processes=not cpu_threads,
         )
 
         try:
-            clone_repository(config)
+            output = clone_repository(config)
             if format_output:
-                print(json.dumps({'updateSuccessful': True}))
+                print(json.dumps({'updateSuccessful': True, 'poolStats': output["pool_stats"]}))
         except Exception as e:
             if format_output:
                 error_data = {'updateSuccessful': False, 'error': str(e)}
@@ -198,12 +212,18 @@ def update_repo_command():
         The update can be performed in strict or non-strict mode. Strict mode is enabled by specifying
         --strict, which will raise errors during the update if any warnings are found. By default, --strict
         is disabled.
+
+        The number of repositories which are cloned or fetched from remotes at the same time can be
+        limited using --network-workers, and the number of repositories cloned or read from the file
+        system using --disk-workers. Signatures and target repositories are validated by --cpu-workers
+        processes, or threads if --cpu-threads is specified. Statistics of these pools are included in
+        the formatted output.
         """)
     @catch_cli_exception(handle=UpdateFailedError)
     @common_update_options
     @click.option("--path", default=None, help="Authentication repository's location. If not specified, set to the current directory")
     @click.option("--library-dir", default=None, help="Directory where target repositories and, optionally, authentication repository are located. If not specified, calculated based on the authentication repository's path")
-    def update(path, library_dir, expected_repo_type, scripts_root_dir, profile, format_output, exclude_target, strict):
+    def update(path, library_dir, expected_repo_type, scripts_root_dir, profile, format_output, exclude_target, strict, network_workers, disk_workers, cpu_workers, cpu_threads):
         if profile:
             start_profiling()
 
@@ -214,13 +234,17 @@ def update_repo_command():
             expected_repo_type=UpdateType(expected_repo_type),
             scripts_root_dir=scripts_root_dir,
             excluded_target_globs=exclude_target,
-            strict=strict
+            strict=strict,
+            network_workers=network_workers,
+            disk_workers=disk_workers,
+            cpu_workers=cpu_workers,
+            cpu_processes=not cpu_threads,
         )
 
         try:
-            update_repository(config)
+            output = update_repository(config)
             if format_output:
-                print(json.dumps({'updateSuccessful': True}))
+                print(json.dumps({'updateSuccessful': True, 'poolStats': output["pool_stats"]}))
         except Exception as e:
             if format_output:
                 error_data = {'updateSuccessful': False, 'error': str(e)}
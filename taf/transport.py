@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Dict, Optional
+
+import pygit2
+from attr import define, field
+
+from taf.exceptions import TransferCancelledError
+
+
+@define
+class TransferStats:
+    """
+    Progress of a single clone or fetch executed in-process using pygit2.
+    Counters are updated while the transfer is running, so they can be read
+    from another thread to report progress.
+    """
+
+    repo_name: str
+    operation: str
+    url: str
+    started_at: float = field(factory=time.monotonic)
+    finished_at: Optional[float] = field(default=None)
+    total_objects: int = field(default=0)
+    received_objects: int = field(default=0)
+    indexed_objects: int = field(default=0)
+    local_objects: int = field(default=0)
+    received_bytes: int = field(default=0)
+    # updated references and number of seconds since the start of the transfer
+    # at which they were updated
+    updated_refs: Dict[str, float] = field(factory=dict)
+    cancelled: bool = field(default=False)
+
+    @property
+    def duration(self) -> float:
+        finished_at = (
+            self.finished_at if self.finished_at is not None else time.monotonic()
+        )
+        return finished_at - self.started_at
+
+    def finish(self) -> None:
+        if self.finished_at is None:
+            self.finished_at = time.monotonic()
+
+    def __str__(self) -> str:
+        return (
+            f"{self.operation} of {self.repo_name} from {self.url}: "
+            f"{self.received_objects}/{self.total_objects} objects, "
+            f"{self.received_bytes} bytes, {len(self.updated_refs)} updated refs "
+            f"in {self.duration:.3f}s{' (cancelled)' if self.cancelled else ''}"
+        )
+
+
+class TransportCallbacks(pygit2.RemoteCallbacks):
+    """
+    Remote callbacks which record the progress of a transfer in TransferStats
+    and abort it once the cancel event is set. An exception raised inside of
+    a callback stops the transfer and is re-raised by pygit2.
+    """
+
+    def __init__(
+        self,
+        stats: TransferStats,
+        cancel_event: Optional[threading.Event] = None,
+        credentials=None,
+        certificate=None,
+    ):
+        super().__init__(credentials=credentials, certificate=certificate)
+        self.stats = stats
+        self.cancel_event = cancel_event
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            self.stats.cancelled = True
+            raise TransferCancelledError(self.stats.repo_name, self.stats.operation)
+
+    def sideband_progress(self, string: str) -> None:
+        self.check_cancelled()
+
+    def transfer_progress(self, progress) -> None:
+        self.stats.total_objects = progress.total_objects
+        self.stats.received_objects = progress.received_objects
+        self.stats.indexed_objects = progress.indexed_objects
+        self.stats.local_objects = progress.local_objects
+        self.stats.received_bytes = progress.received_bytes
+        self.check_cancelled()
+
+    def update_tips(self, refname: str, old: pygit2.Oid, new: pygit2.Oid) -> None:
+        self.stats.updated_refs[refname] = time.monotonic() - self.stats.started_at
@@ -0,0 +1,80 @@
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional
+
+
+class CommitSequence(Sequence):
+    """
+    Ordered commits of a branch, without duplicates. Adding a commit which is
+    already in the sequence does nothing. Position of a commit is looked up in
+    constant time, so finding the commit which follows a validated commit does
+    not depend on the number of commits on the branch.
+    Slicing returns a list of commits.
+    """
+
+    def __init__(self, commits: Iterable[str] = ()):
+        self._commits: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self.extend(commits)
+
+    def append(self, commit: str) -> None:
+        if commit in self._positions:
+            return
+        self._positions[commit] = len(self._commits)
+        self._commits.append(commit)
+
+    def extend(self, commits: Iterable[str]) -> None:
+        for commit in commits:
+            self.append(commit)
+
+    def index(self, commit, start: int = 0, stop: Optional[int] = None) -> int:
+        position = self._positions.get(commit)
+        if (
+            position is None
+            or position < start
+            or (stop is not None and position >= stop)
+        ):
+            raise ValueError(f"{commit} is not in the sequence")
+        return position
+
+    def next_commit(self, commit: str) -> Optional[str]:
+        """
+        Return the commit following the given one, or None if it is the last
+        commit or if it is not in the sequence
+        """
+        position = self._positions.get(commit)
+        if position is None or position == len(self._commits) - 1:
+            return None
+        return self._commits[position + 1]
+
+    def commits_after(self, commit: str) -> List[str]:
+        """
+        Return commits following the given one
+        """
+        return self._commits[self.index(commit) + 1 :]
+
+    def __contains__(self, commit) -> bool:
+        return commit in self._positions
+
+    def __getitem__(self, index):
+        return self._commits[index]
+
+    def __iter__(self):
+        return iter(self._commits)
+
+    def __len__(self) -> int:
+        return len(self._commits)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CommitSequence):
+            return self._commits == other._commits
+        if isinstance(other, list):
+            return self._commits == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._commits!r})"
+
+    def __reduce__(self):
+        # positions are rebuilt when unpickled, so that only commits are sent to
+        # the processes which validate target repositories
+        return type(self), (self._commits,)
@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import taf.settings as settings
+
+
+class DependencyScheduler:
+    """
+    Schedules updates of an authentication repository and of the authentication
+    repositories it depends on (directly or indirectly), which form a directed
+    graph that is discovered as the repositories are validated. Dependencies
+    of a repository are updated concurrently, and so are their own dependencies,
+    but validation and update of at most max_workers repositories runs at the same time.
+    Repositories which are waiting for their dependencies do not count toward that limit.
+    If max_workers is not specified, settings.max_concurrent_dependency_updates is used.
+
+    A repository which is a dependency of more than one repository is only updated
+    once. The other repositories which depend on it wait for that update to finish,
+    unless the repository depends on them as well (a recursive dependency).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        if max_workers is None:
+            max_workers = settings.max_concurrent_dependency_updates
+        self.max_workers = max(max_workers or 1, 1)
+        self.slots = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+        # url of the repository whose dependencies are updated by the current thread
+        self._local = threading.local()
+        # urls of repositories which each of the repositories waits for
+        self._dependencies: Dict[str, Set[str]] = {}
+        self._done: Dict[str, threading.Event] = {}
+
+    def visit(self, url: str, visited: List[str]) -> bool:
+        """
+        Return True if the repository was not visited yet and should be updated by
+        the caller. Otherwise, wait until it is updated, unless doing so would
+        mean that two repositories wait for each other
+        """
+        dependent = getattr(self._local, "url", None)
+        with self._lock:
+            if url not in visited:
+                visited.append(url)
+                self._done[url] = threading.Event()
+                self._add_dependency(dependent, url)
+                return True
+            if dependent is None or self._depends_on(url, dependent):
+                return False
+            self._add_dependency(dependent, url)
+            done = self._done.get(url)
+        if done is not None:
+            done.wait()
+        return False
+
+    def run(self, dependent: str, updates: List[Tuple[str, Callable]]) -> List:
+        """
+        Call the functions which update dependencies of the given repository, paired
+        with the dependencies' urls, and return their results in the order in which
+        they were specified. If a function raises an error, the error is returned.
+        A function returns None if its dependency was already visited
+        """
+
+        def _run(url, update):
+            previous = getattr(self._local, "url", None)
+            self._local.url = dependent
+            try:
+                result = update()
+            except Exception as e:
+                result = e
+            finally:
+                self._local.url = previous
+            # None is returned if the dependency was already visited,
+            # in which case its update is done by another call
+            if result is not None:
+                with self._lock:
+                    done = self._done.get(url)
+                if done is not None:
+                    done.set()
+            return result
+
+        if self.max_workers == 1 or len(updates) < 2:
+            return [_run(url, update) for url, update in updates]
+        with ThreadPoolExecutor(max_workers=len(updates)) as executor:
+            futures = [executor.submit(_run, url, update) for url, update in updates]
+            return [future.result() for future in futures]
+
+    def _add_dependency(self, dependent: Optional[str], url: str) -> None:
+        if dependent is not None:
+            self._dependencies.setdefault(dependent, set()).add(url)
+
+    def _depends_on(self, url: str, other_url: str) -> bool:
+        to_check = [url]
+        checked = set()
+        while to_check:
+            current = to_check.pop()
+            if current == other_url:
+                return True
+            if current in checked:
+                continue
+            checked.add(current)
+            to_check.extend(self._dependencies.get(current, ()))
+        return False
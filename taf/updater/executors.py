@@ -0,0 +1,189 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional
+
+from attr import define, field
+from cattr import unstructure
+
+from taf.log import taf_logger
+
+
+def _default_io_workers() -> int:
+    # same as the default number of workers of ThreadPoolExecutor
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+@define
+class PoolStats:
+    """
+    Statistics of tasks submitted to a pool. Task time is measured from the moment
+    a task is submitted until it is done, so it includes the time it waited for a worker
+    """
+
+    name: str
+    kind: str
+    max_workers: int
+    submitted: int = field(default=0)
+    completed: int = field(default=0)
+    failed: int = field(default=0)
+    # maximum number of tasks which were submitted, but not done, at the same time
+    max_pending: int = field(default=0)
+    total_task_time: float = field(default=0.0)
+    first_submitted_at: Optional[float] = field(default=None)
+    last_done_at: Optional[float] = field(default=None)
+
+    @property
+    def wall_time(self) -> float:
+        if self.first_submitted_at is None or self.last_done_at is None:
+            return 0.0
+        return self.last_done_at - self.first_submitted_at
+
+    def to_dict(self) -> Dict:
+        data = unstructure(self)
+        del data["first_submitted_at"]
+        del data["last_done_at"]
+        data["wall_time"] = self.wall_time
+        return data
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name} pool ({self.max_workers} {self.kind}s): "
+            f"{self.completed}/{self.submitted} tasks done, {self.failed} failed, "
+            f"at most {self.max_pending} pending, {self.total_task_time:.3f}s "
+            f"task time in {self.wall_time:.3f}s"
+        )
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    """
+    Pools are used while other threads of the update are running, and a process
+    forked while one of them holds a lock (e.g. a logging or an import lock) could
+    deadlock, so workers are never forked from the updater's process
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class UpdaterPool:
+    """
+    Pool of threads or processes with a limited number of workers, which records
+    statistics of the tasks submitted to it. Workers are started when the first
+    task is submitted. Processes are started using a fork server where available,
+    otherwise as new interpreters, see _process_context.
+    """
+
+    def __init__(self, name: str, max_workers: int, processes: bool = False):
+        self.name = name
+        self.max_workers = max_workers
+        self.processes = processes
+        self.stats = PoolStats(
+            name=name,
+            kind="process" if processes else "thread",
+            max_workers=max_workers,
+        )
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.processes:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=_process_context()
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        executor = self._get_executor()
+        submitted_at = time.monotonic()
+        # counted before submitting, since the task can be done before submit returns
+        with self._lock:
+            self._pending += 1
+            self.stats.max_pending = max(self.stats.max_pending, self._pending)
+        try:
+            future = executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        with self._lock:
+            self.stats.submitted += 1
+            if self.stats.first_submitted_at is None:
+                self.stats.first_submitted_at = submitted_at
+        future.add_done_callback(partial(self._task_done, submitted_at))
+        return future
+
+    def map(self, fn: Callable, iterable: Iterable) -> List:
+        """
+        Call the function with each of the items and return the results in order
+        """
+        futures = [self.submit(fn, item) for item in iterable]
+        return [future.result() for future in futures]
+
+    def _task_done(self, submitted_at: float, future: Future) -> None:
+        done_at = time.monotonic()
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.stats.failed += 1
+            else:
+                self.stats.completed += 1
+            self.stats.total_task_time += done_at - submitted_at
+            self.stats.last_done_at = done_at
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class UpdaterExecutors:
+    """
+    Pools shared by all steps of an update, including updates of dependencies.
+    Cloning and fetching of remote repositories runs in the network pool, cloning
+    from the file system and reading repositories on disk in the disk pool, and
+    validation in the CPU pool, so that the number of workers of each kind can be
+    limited separately. CPU-bound work runs in processes unless cpu_processes is
+    set to False. Network and disk pools default to as many workers as a
+    ThreadPoolExecutor, and the CPU pool to the number of CPUs.
+    """
+
+    def __init__(
+        self,
+        network_workers: Optional[int] = None,
+        disk_workers: Optional[int] = None,
+        cpu_workers: Optional[int] = None,
+        cpu_processes: bool = True,
+    ):
+        self.network = UpdaterPool("network", network_workers or _default_io_workers())
+        self.disk = UpdaterPool("disk", disk_workers or _default_io_workers())
+        self.cpu = UpdaterPool(
+            "cpu", cpu_workers or os.cpu_count() or 1, processes=cpu_processes
+        )
+
+    @property
+    def pools(self) -> List[UpdaterPool]:
+        return [self.network, self.disk, self.cpu]
+
+    def stats(self) -> Dict[str, Dict]:
+        return {pool.name: pool.stats.to_dict() for pool in self.pools}
+
+    def shutdown(self) -> None:
+        for pool in self.pools:
+            pool.shutdown()
+            taf_logger.debug(str(pool.stats))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
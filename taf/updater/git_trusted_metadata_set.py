@@ -1,6 +1,21 @@
 import datetime
+from typing import Dict, NamedTuple, Optional
+
+from tuf.api import exceptions
+from tuf.api.metadata import Metadata, Root, Snapshot, Targets, Timestamp
 from tuf.ngclient._internal import trusted_metadata_set
 
+from taf.log import taf_logger
+from taf.updater.signature_cache import SignatureCache
+
+
+class VerifiedMetadata(NamedTuple):
+    data: bytes
+    metadata: Metadata
+    # metadata whose keys were used to verify signatures of this metadata,
+    # None in case of the trusted root, which is only verified by itself
+    delegator: Optional[Metadata]
+
 
 class GitTrustedMetadataSet(trusted_metadata_set.TrustedMetadataSet):
     """
@@ -11,11 +26,229 @@ class GitTrustedMetadataSet(trusted_metadata_set.TrustedMetadataSet):
     TAF validates metadata across history. We do not want to validate expiration for each commit (revision),
     since it will always be considered "expired".
     Instead, for each revision in commit history we override the "reference_time" attribute so that
-    past metadata will not be considered expired.
+    past metadata will not be considered expired. Current time is only used when validating the most
+    recent revision.
+
+    A new trusted set is created for every revision, but metadata which was already verified at one
+    of the previous revisions is not deserialized and verified again. It is reused if it is byte for
+    byte the same and if the metadata whose keys were used to verify it is the same object as before
+    (so the keys did not change). All other checks (versions, hashes, expiration) are still performed.
+    Signatures are verified using the signature cache, if one is specified, so signatures which
+    were already verified are not verified again. The update methods mirror those of
+    TrustedMetadataSet and perform the same checks in the same order.
 
-    See: GitUpdater
+    See: RevisionUpdater
     """
 
-    def __init__(self, data):
-        super(GitTrustedMetadataSet, self).__init__(data)
-        self.reference_time = datetime.datetime.min
+    def __init__(
+        self,
+        data: bytes,
+        reference_time: datetime.datetime = datetime.datetime.min,
+        verified: Optional[Dict[str, VerifiedMetadata]] = None,
+        signature_cache: Optional[SignatureCache] = None,
+    ):
+        self._verified = verified if verified is not None else {}
+        self._signature_cache = signature_cache
+        super().__init__(data)
+        self.reference_time = reference_time
+
+    def _get_verified(
+        self, role_name: str, data: bytes, delegator: Optional[Metadata]
+    ) -> Optional[Metadata]:
+        verified = self._verified.get(role_name)
+        if (
+            verified is not None
+            and verified.delegator is delegator
+            and verified.data == data
+        ):
+            return verified.metadata
+        return None
+
+    def _load(
+        self,
+        role_name: str,
+        data: bytes,
+        delegator: Optional[Metadata],
+        metadata_type: str,
+    ) -> Metadata:
+        """
+        Return the metadata verified at one of the previous revisions,
+        or deserialize and verify it
+        """
+        metadata = self._get_verified(role_name, data, delegator)
+        if metadata is None:
+            metadata = self._verify(role_name, data, delegator, metadata_type)
+        return metadata
+
+    def _verify(
+        self,
+        role_name: str,
+        data: bytes,
+        delegator: Optional[Metadata],
+        metadata_type: str,
+    ) -> Metadata:
+        """
+        Deserialize the metadata, verify that it is signed by the threshold of the
+        delegator's keys (or of its own keys if delegator is None) and remember it,
+        even if it is rejected as final metadata afterwards
+        """
+        new_metadata = _deserialize(data, metadata_type)
+        self._verify_delegate(delegator or new_metadata, role_name, new_metadata)
+        self._verified[role_name] = VerifiedMetadata(data, new_metadata, delegator)
+        return new_metadata
+
+    def _verify_delegate(
+        self, delegator: Metadata, role_name: str, delegate: Metadata
+    ) -> None:
+        """
+        Same as Metadata.verify_delegate, but signatures are verified using the
+        signature cache
+        """
+        role = None
+        if isinstance(delegator.signed, Root):
+            keys = delegator.signed.keys
+            role = delegator.signed.roles.get(role_name)
+        elif isinstance(delegator.signed, Targets):
+            delegations = delegator.signed.delegations
+            if delegations is None:
+                raise ValueError(f"No delegation found for {role_name}")
+            keys = delegations.keys
+            if delegations.roles is not None:
+                role = delegations.roles.get(role_name)
+            elif delegations.succinct_roles is not None:
+                if delegations.succinct_roles.is_delegated_role(role_name):
+                    role = delegations.succinct_roles
+        else:
+            raise TypeError("Call is valid only on delegator metadata")
+
+        if role is None:
+            raise ValueError(f"No delegation found for {role_name}")
+
+        signing_keys = set()
+        for keyid in role.keyids:
+            key = keys[keyid]
+            try:
+                if self._signature_cache is not None:
+                    self._signature_cache.verify_signature(key, delegate)
+                else:
+                    key.verify_signature(delegate)
+                signing_keys.add(key.keyid)
+            except exceptions.UnsignedMetadataError:
+                taf_logger.debug("Key {} failed to verify {}", keyid, role_name)
+
+        if len(signing_keys) < role.threshold:
+            raise exceptions.UnsignedMetadataError(
+                f"{role_name} was signed by {len(signing_keys)}/"
+                f"{role.threshold} keys",
+            )
+
+    def _load_trusted_root(self, data: bytes) -> None:
+        self._trusted_set[Root.type] = self._load(Root.type, data, None, Root.type)
+
+    def update_root(self, data: bytes) -> Metadata[Root]:
+        if self.timestamp is not None:
+            raise RuntimeError("Cannot update root after timestamp")
+
+        new_root = _deserialize(data, Root.type)
+        self._verify_delegate(self.root, Root.type, new_root)
+        if new_root.signed.version != self.root.signed.version + 1:
+            raise exceptions.BadVersionNumberError(
+                f"Expected root version {self.root.signed.version + 1}"
+                f" instead got version {new_root.signed.version}"
+            )
+        # new root is verified by itself as well, so it can be trusted as is
+        # at the following revisions
+        self._verify_delegate(new_root, Root.type, new_root)
+        self._verified[Root.type] = VerifiedMetadata(data, new_root, None)
+        self._trusted_set[Root.type] = new_root
+        return new_root
+
+    def update_timestamp(self, data: bytes) -> Metadata[Timestamp]:
+        if self.snapshot is not None:
+            raise RuntimeError("Cannot update timestamp after snapshot")
+        if self.root.signed.is_expired(self.reference_time):
+            raise exceptions.ExpiredMetadataError("Final root.json is expired")
+
+        new_timestamp = self._load(Timestamp.type, data, self.root, Timestamp.type)
+        if self.timestamp is not None:
+            if new_timestamp.signed.version < self.timestamp.signed.version:
+                raise exceptions.BadVersionNumberError(
+                    f"New timestamp version {new_timestamp.signed.version} must"
+                    f" be >= {self.timestamp.signed.version}"
+                )
+            if new_timestamp.signed.version == self.timestamp.signed.version:
+                raise exceptions.EqualVersionNumberError()
+            snapshot_meta = self.timestamp.signed.snapshot_meta
+            new_snapshot_meta = new_timestamp.signed.snapshot_meta
+            if new_snapshot_meta.version < snapshot_meta.version:
+                raise exceptions.BadVersionNumberError(
+                    f"New snapshot version must be >= {snapshot_meta.version}"
+                    f", got version {new_snapshot_meta.version}"
+                )
+        self._trusted_set[Timestamp.type] = new_timestamp
+        self._check_final_timestamp()
+        return new_timestamp
+
+    def update_snapshot(
+        self, data: bytes, trusted: Optional[bool] = False
+    ) -> Metadata[Snapshot]:
+        if self.timestamp is None:
+            raise RuntimeError("Cannot update snapshot before timestamp")
+        if self.targets is not None:
+            raise RuntimeError("Cannot update snapshot after targets")
+        self._check_final_timestamp()
+        if not trusted:
+            self.timestamp.signed.snapshot_meta.verify_length_and_hashes(data)
+
+        new_snapshot = self._load(Snapshot.type, data, self.root, Snapshot.type)
+        if self.snapshot is not None:
+            for filename, fileinfo in self.snapshot.signed.meta.items():
+                new_fileinfo = new_snapshot.signed.meta.get(filename)
+                if new_fileinfo is None:
+                    raise exceptions.RepositoryError(
+                        f"New snapshot is missing info for '{filename}'"
+                    )
+                if new_fileinfo.version < fileinfo.version:
+                    raise exceptions.BadVersionNumberError(
+                        f"Expected {filename} version "
+                        f"{new_fileinfo.version}, got {fileinfo.version}."
+                    )
+        self._trusted_set[Snapshot.type] = new_snapshot
+        self._check_final_snapshot()
+        return new_snapshot
+
+    def update_delegated_targets(
+        self, data: bytes, role_name: str, delegator_name: str
+    ) -> Metadata[Targets]:
+        if self.snapshot is None:
+            raise RuntimeError("Cannot load targets before snapshot")
+        self._check_final_snapshot()
+        delegator: Optional[Metadata] = self.get(delegator_name)
+        if delegator is None:
+            raise RuntimeError("Cannot load targets before delegator")
+        meta = self.snapshot.signed.meta.get(f"{role_name}.json")
+        if meta is None:
+            raise exceptions.RepositoryError(
+                f"Snapshot does not contain information for '{role_name}'"
+            )
+        meta.verify_length_and_hashes(data)
+
+        new_delegate = self._load(role_name, data, delegator, Targets.type)
+        version = new_delegate.signed.version
+        if version != meta.version:
+            raise exceptions.BadVersionNumberError(
+                f"Expected {role_name} v{meta.version}, got v{version}."
+            )
+        if new_delegate.signed.is_expired(self.reference_time):
+            raise exceptions.ExpiredMetadataError(f"New {role_name} is expired")
+        self._trusted_set[role_name] = new_delegate
+        return new_delegate
+
+
+def _deserialize(data: bytes, metadata_type: str) -> Metadata:
+    metadata: Metadata = Metadata.from_bytes(data)
+    if metadata.signed.type != metadata_type:
+        raise exceptions.RepositoryError(
+            f"Expected '{metadata_type}', got '{metadata.signed.type}'"
+        )
+    return metadata
@@ -1,17 +1,14 @@
+import datetime
 import os
 import shutil
-import tempfile
-from functools import wraps
 from pathlib import Path
 
-from tuf.ngclient._internal import trusted_metadata_set
 from taf.exceptions import GitError
 from taf.log import taf_logger
 import taf.settings as settings
 from taf.auth_repo import AuthenticationRepository
 from taf.exceptions import UpdateFailedError
 from taf.utils import on_rm_error
-from taf.updater.git_trusted_metadata_set import GitTrustedMetadataSet
 
 from tuf.ngclient.fetcher import FetcherInterface
 from tuf.api.exceptions import DownloadHTTPError
@@ -49,7 +46,8 @@ class GitUpdater(FetcherInterface):
 
     Attributes:
         - repository_directory: the client's local repository's location
-        - metadata_dir_path: path of the metadata directory needed by the updater.
+        - initial_metadata: content of metadata files at the first commit, which
+        are trusted by the updater.
         - validation_auth_repo: a fresh clone of the metadata repository. It is
         a bare git repository. An instance of the `BareGitRepo` class.
         - commits: a list of commits, starting with the most recent commit in the
@@ -69,38 +67,62 @@ class GitUpdater(FetcherInterface):
         return self.commits[self.current_commit_index - 1]
 
     @property
-    def metadata_dir(self):
-        return str(self.metadata_dir_path)
+    def reference_time(self):
+        """
+        Time used to check if metadata expired. Expiration is only validated
+        at the most recent commit.
+        """
+        if self.current_commit_index == len(self.commits) - 1:
+            return datetime.datetime.utcnow()
+        return datetime.datetime.min
 
     @property
     def targets_dir(self):
         return str(self.validation_auth_repo.path / "targets")
 
-    def __init__(self, auth_url, repository_directory, repository_name):
+    def __init__(
+        self,
+        auth_url,
+        repository_directory,
+        repository_name,
+        users_auth_repo=None,
+        validation_repo_path=None,
+        last_validated_commit=None,
+    ):
         """
         Args:
         auth_url: repository url of the git repository which we want to clone.
         repository_directory: the client's local repository's location
         repository_name: name of the repository in 'organization/namespace' format.
+        users_auth_repo: the client's authentication repository, whose configuration
+        directory stores validation checkpoints. It does not have to exist yet.
+        validation_repo_path: path of the cloned validation repository. Defaults to
+        settings.validation_repo_path, which the updater does not set
+        last_validated_commit: commit from which the validation starts. All commits
+        are validated if it is not specified
         """
-        self._original_tuf_trusted_metadata_set = (
-            trusted_metadata_set.TrustedMetadataSet
-        )
-        self._patch_tuf_metadata_set(GitTrustedMetadataSet)
-
-        validation_path = settings.validation_repo_path
+        validation_path = validation_repo_path or settings.validation_repo_path
 
         self.set_validation_repo(validation_path, auth_url)
+        self.users_auth_repo = users_auth_repo
+        self.last_validated_commit = last_validated_commit
 
         self._init_commits()
+        self._pending_checkpoint = None
+        self._validated_since_checkpoint = 0
+        # root trusted at the checkpoint from which the validation is resumed
+        self._checkpoint_root = self._resume_from_checkpoint()
 
         self.repository_directory = str(repository_directory)
 
-        tmp_dir = tempfile.mkdtemp()
-        metadata_path = Path(tmp_dir, "metadata")
-        metadata_path.mkdir(parents=True, exist_ok=True)
+        # listings of the previously validated commit, updated incrementally
+        self._targets_at_revision = None
+        self._metadata_at_revision = None
+        # (blob id, length, hashes) of target files whose length and hashes
+        # were already verified at one of the previous commits
+        self.verified_targets = set()
 
-        self.metadata_dir_path = metadata_path
+        self.initial_metadata = {}
 
         try:
             self._init_metadata()
@@ -132,7 +154,7 @@ class GitUpdater(FetcherInterface):
         We have to presume that the initial metadata is correct though (or at least
         the initial root.json).
         """
-        last_validated_commit = settings.last_validated_commit
+        last_validated_commit = self.last_validated_commit
 
         try:
             commits_since = self.validation_auth_repo.all_commits_since_commit(
@@ -177,44 +199,101 @@ This could mean that the a commit was removed from the remote repository or that
 
     def _init_metadata(self):
         """
-        TUF updater expects the existence of a client
-        metadata directory. This directory stores
-        the current metadata files (which will get deleted after the update).
-        Directory must exist and contain at least root.json. Otherwise, update will
-        fail. We actually want to validate the remote authentication repository,
-        but will create a Temp directory in order to avoid modifying the updater.
+        TUF updater expects the existence of trusted client metadata, which
+        has to contain at least root.json. Otherwise, update will fail.
+        Metadata files at the first commit are used as the trusted metadata.
+        They are kept in memory by RevisionUpdater instead of being stored
+        in a local metadata directory.
         """
         metadata_files = self.validation_auth_repo.list_files_at_revision(
             self.current_commit, "metadata"
         )
         for filename in metadata_files:
-            metadata = self.validation_auth_repo.get_file(
-                self.current_commit, "metadata/" + filename
+            self.initial_metadata[filename] = self.validation_auth_repo.get_file(
+                self.current_commit, "metadata/" + filename, raw=True
             )
-            current_filename = self.metadata_dir_path / filename
-            current_filename.write_text(metadata)
+        if self._checkpoint_root is not None:
+            self.initial_metadata["root.json"] = self._checkpoint_root
 
-    def _patch_tuf_metadata_set(self, cls):
-        """
-        Used to address TUF metadata expiration.
-        We skip validating expiration for metadata in older commits and
-        revert-back to TUF metadata validation on the latest commit"""
-        trusted_metadata_set.TrustedMetadataSet = cls
+    @property
+    def _checkpoints_enabled(self):
+        return (
+            self.users_auth_repo is not None
+            and settings.validation_checkpoint_interval > 0
+        )
 
-    def revert_tuf_patch_on_last_commit(f):
+    def _resume_from_checkpoint(self):
         """
-        We only want to validate metadata expiration date for most recent commit.
-        Since we turned off metadata validation for all commits, we want to revert this patch for the most recent commit.
-        This decorator reverts our metadata expiration patch to original TUF implementation.
+        If validation of the same commits was interrupted, continue TUF validation
+        after the last commit which was validated before the interruption, instead
+        of from the first commit. The list of commits does not change, since all of
+        them still need to be processed by the rest of the update.
+        Return the root which was trusted at that commit. The stored root is only
+        used if it is the same as root.json at that commit of the validation
+        repository, otherwise the checkpoint is ignored.
         """
-        wraps(f)
-
-        def wrapper(self):
-            if self.current_commit_index + 1 == (len(self.commits) - 1):
-                self._patch_tuf_metadata_set(self._original_tuf_trusted_metadata_set)
-            return f(self)
+        if not self._checkpoints_enabled:
+            return None
+        checkpoint = self.users_auth_repo.validation_checkpoint
+        if checkpoint is None:
+            return None
+        if checkpoint.get("last_validated_commit") != self.last_validated_commit:
+            return None
+        commit = checkpoint.get("commit")
+        if commit not in self.commits[1:-1]:
+            return None
+        root = checkpoint.get("root", "").encode()
+        try:
+            root_at_commit = self.validation_auth_repo.get_file(
+                commit, "metadata/root.json", raw=True
+            )
+        except GitError:
+            root_at_commit = None
+        if root != root_at_commit:
+            taf_logger.warning(
+                "Root stored in the validation checkpoint of {} is not root.json at commit {}. Ignoring the checkpoint",
+                self.validation_auth_repo.name,
+                commit,
+            )
+            return None
+        self.current_commit_index = self.commits.index(commit)
+        taf_logger.info(
+            "Resuming validation of {} after commit {}",
+            self.validation_auth_repo.name,
+            commit,
+        )
+        return root
 
-        return wrapper
+    def commit_validated(self, commit, trusted_root):
+        """
+        Record that the commit passed TUF validation. A checkpoint is stored after
+        every settings.validation_checkpoint_interval validated commits. Expiration
+        of metadata is only checked at the last commit, so it is never stored
+        """
+        if not self._checkpoints_enabled or commit == self.commits[-1]:
+            return
+        self._pending_checkpoint = (commit, trusted_root)
+        self._validated_since_checkpoint += 1
+        if self._validated_since_checkpoint >= settings.validation_checkpoint_interval:
+            self.save_checkpoint()
+
+    def save_checkpoint(self):
+        """
+        Store the last validated commit and the root trusted at that commit,
+        so that validation can be resumed from it if it gets interrupted
+        """
+        if self._pending_checkpoint is None:
+            return
+        commit, trusted_root = self._pending_checkpoint
+        self._pending_checkpoint = None
+        self._validated_since_checkpoint = 0
+        self.users_auth_repo.set_validation_checkpoint(
+            {
+                "last_validated_commit": self.last_validated_commit,
+                "commit": commit,
+                "root": trusted_root.decode(),
+            }
+        )
 
     def set_validation_repo(self, path, url):
         """
@@ -224,12 +303,9 @@ This could mean that the a commit was removed from the remote repository or that
 
     def cleanup(self):
         """
-        Removes the bare authentication repository and metadata
-        directory. This should be called after the update is finished,
-        either successfully or unsuccessfully.
+        Removes the bare authentication repository. This should be called
+        after the update is finished, either successfully or unsuccessfully.
         """
-        if self.metadata_dir_path.is_dir():
-            shutil.rmtree(self.metadata_dir_path)
         self.validation_auth_repo.cleanup()
         temp_dir = Path(self.validation_auth_repo.path, os.pardir).parent
         if temp_dir.is_dir():
@@ -237,19 +313,49 @@ This could mean that the a commit was removed from the remote repository or that
 
     def get_current_targets(self):
         try:
-            return self.validation_auth_repo.list_files_at_revision(
-                self.current_commit, "targets"
+            self._targets_at_revision = (
+                self.validation_auth_repo.list_files_at_revision_incremental(
+                    self.current_commit, "targets", self._targets_at_revision
+                )
             )
         except GitError:
+            self._targets_at_revision = None
             return []
+        return sorted(self._targets_at_revision.files)
 
     def get_current_metadata(self):
         try:
-            return self.validation_auth_repo.list_files_at_revision(
-                self.current_commit, "metadata"
+            self._metadata_at_revision = (
+                self.validation_auth_repo.list_files_at_revision_incremental(
+                    self.current_commit, "metadata", self._metadata_at_revision
+                )
             )
         except GitError:
+            self._metadata_at_revision = None
             return []
+        return sorted(self._metadata_at_revision.files)
+
+    def is_current_commit_unchanged(self):
+        """
+        Check if metadata and target files at the current commit are the same as
+        at the previous one, by comparing ids of the metadata and targets trees.
+        If they are, validation of the current commit would have the same outcome
+        as validation of the previous commit
+        """
+        if self.current_commit_index == 0:
+            return False
+        return all(
+            self.validation_auth_repo.get_object_id_at_path(self.current_commit, path)
+            == self.validation_auth_repo.get_object_id_at_path(
+                self.previous_commit, path
+            )
+            for path in ("metadata", "targets")
+        )
+
+    def get_current_target_id(self, filepath):
+        return self.validation_auth_repo.get_object_id_at_path(
+            self.current_commit, f"targets/{filepath}"
+        )
 
     def get_current_target_data(self, filepath, raw=False):
         return self.validation_auth_repo.get_file(
@@ -261,7 +367,6 @@ This could mean that the a commit was removed from the remote repository or that
             self.current_commit, f"metadata/{filepath}", raw=raw
         )
 
-    @revert_tuf_patch_on_last_commit  # type: ignore
     def update_done(self):
         """Used to indicate whether updater has finished with update.
         Update is considered done when all commits have been validated"""
@@ -3,8 +3,10 @@ import glob
 import json
 import subprocess
 import sys
+import threading
 from functools import partial
 from pathlib import Path
+from typing import Dict
 
 import taf.settings as settings
 from taf.repository_tool import get_target_path
@@ -15,6 +17,7 @@ from taf.utils import (
 )
 from taf.exceptions import GitError, ScriptExecutionError
 from taf.log import taf_logger
+from taf.updater.script_worker import script_worker
 from taf.updater.types.update import Update
 from cattr import structure
 
@@ -45,6 +48,17 @@ config_db = {}
 
 # persistent data should be read from persistent file and updated after every handler call
 # should be one file per library root
+# scripts of different repositories can run concurrently, so changes made by each
+# script are merged into the file's current content while the file is locked
+_persistent_file_locks: Dict[str, threading.Lock] = {}
+_persistent_file_locks_lock = threading.Lock()
+
+
+def _persistent_file_lock(persistent_path):
+    with _persistent_file_locks_lock:
+        return _persistent_file_locks.setdefault(
+            str(Path(persistent_path).resolve()), threading.Lock()
+        )
 
 
 def _get_script_path(lifecycle_stage, event):
@@ -74,6 +88,11 @@ def get_config(library_root, config_name=CONFIG_NAME):
 
 def get_persistent_data(library_root, persistent_file=PERSISTENT_FILE_NAME):
     persistent_file = Path(library_root, PERSISTENT_FILE_NAME)
+    with _persistent_file_lock(persistent_file):
+        return _read_persistent_file(persistent_file)
+
+
+def _read_persistent_file(persistent_file):
     if not persistent_file.is_file():
         persistent_file.touch()
 
@@ -83,6 +102,27 @@ def get_persistent_data(library_root, persistent_file=PERSISTENT_FILE_NAME):
         return {}
 
 
+def _save_persistent_data(persistent_path, previous_data, persistent_data):
+    """
+    Store the persistent data output by a script which received previous_data.
+    Keys which the script added, modified or removed are updated in the file's
+    current content, so changes stored by scripts of other repositories while the
+    script was running are not lost. Return the stored data
+    """
+    with _persistent_file_lock(persistent_path):
+        if isinstance(previous_data, dict) and isinstance(persistent_data, dict):
+            current_data = _read_persistent_file(persistent_path)
+            if isinstance(current_data, dict):
+                for key in previous_data.keys() - persistent_data.keys():
+                    current_data.pop(key, None)
+                for key, value in persistent_data.items():
+                    if key not in previous_data or previous_data[key] != value:
+                        current_data[key] = value
+                persistent_data = current_data
+        safely_save_json_to_disk(persistent_data, persistent_path)
+    return persistent_data
+
+
 def _handle_event(
     lifecycle_stage,
     event,
@@ -168,7 +208,7 @@ def execute_scripts(auth_repo, last_commit, scripts_rel_path, data, scripts_root
             path = Path(scripts_root_dir) / auth_repo.name / scripts_rel_path
         else:
             path = Path(auth_repo.path) / scripts_rel_path
-        script_paths = glob.glob(f"{path}/*.py")
+        scripts = [(script_path, None) for script_path in glob.glob(f"{path}/*.py")]
     else:
         try:
             script_names = auth_repo.list_files_at_revision(
@@ -180,24 +220,34 @@ def execute_scripts(auth_repo, last_commit, scripts_rel_path, data, scripts_root
                 if Path(script_name).suffix == ".py"
             ]
             auth_repo.checkout_paths(last_commit, *script_rel_paths)
-            script_paths = [
-                str(auth_repo.path / script_rel_path)
+            scripts = [
+                (str(auth_repo.path / script_rel_path), script_rel_path)
                 for script_rel_path in script_rel_paths
             ]
         except GitError:
             taf_logger.debug(f"{scripts_rel_path} does not contain any scripts")
-            script_paths = []
+            scripts = []
 
-    for script_path in sorted(script_paths):
+    for script_path, script_rel_path in sorted(scripts):
         taf_logger.info("Executing script {}", script_path)
         json_data = json.dumps(data)
-        try:
-            output = run(sys.executable, script_path, input=json_data)
-        except subprocess.CalledProcessError as e:
-            taf_logger.error(
-                "An error occurred while executing {}: {}", script_path, e.output
+        if settings.lifecycle_script_worker:
+            # the worker runs the script as it is at the last validated commit
+            source = (
+                auth_repo.get_file(last_commit, script_rel_path)
+                if script_rel_path is not None
+                else None
             )
-            raise ScriptExecutionError(script_path, e.output)
+            with script_worker() as worker:
+                output = worker.run(script_path, json_data, source)
+        else:
+            try:
+                output = run(sys.executable, script_path, input=json_data)
+            except subprocess.CalledProcessError as e:
+                taf_logger.error(
+                    "An error occurred while executing {}: {}", script_path, e.output
+                )
+                raise ScriptExecutionError(script_path, e.output)
         if output is not None and output != "":
             # if the script contains print statements other than the final
             # print which outputs transient and persistent data
@@ -214,13 +264,14 @@ def execute_scripts(auth_repo, last_commit, scripts_rel_path, data, scripts_root
         taf_logger.debug("Transient data: {}", transient_data)
         # overwrite current persistent and transient data
         data["state"]["transient"] = transient_data
-        data["state"]["persistent"] = persistent_data
         try:
             # if persistent data is not a valid json or if an error happens while storing
             # to disk, raise an error
             # we save to disk by copying a temp file, so the likelihood of an error
             # should be decreased
-            safely_save_json_to_disk(persistent_data, persistent_path)
+            data["state"]["persistent"] = _save_persistent_data(
+                persistent_path, data["state"]["persistent"], persistent_data
+            )
         except Exception as e:
             raise ScriptExecutionError(
                 script_path,
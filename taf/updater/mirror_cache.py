@@ -0,0 +1,172 @@
+import hashlib
+import shutil
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from taf.exceptions import GitError
+from taf.git import GitRepository
+from taf.log import taf_logger
+from taf.utils import FileLock, on_rm_error
+
+# mirrors used in the last hour are not removed when the cache is too large, since
+# repositories cloned from them by updates which are still running read their objects
+MIN_EVICTION_AGE = 3600
+
+
+class MirrorCache:
+    """
+    Bare mirrors of remote repositories, which are kept in the given directory between
+    updates and keyed by the remote's URL. Each update only fetches new commits
+    into a mirror. Repositories used during an update are cloned from a mirror without
+    copying its objects (git alternates), so a mirror must not be removed while they are used.
+    Mirrors are locked while they are updated and cloned, so that concurrent updates
+    do not modify the same mirror at the same time. Clones of other updates still read
+    objects from a mirror after it is unlocked, and a fetch can make some of them
+    unreachable (e.g. if a branch was force pushed), so objects of mirrors are never
+    pruned. They are removed together with the mirror, see evict.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def mirror_path(self, url: str) -> Path:
+        return self.root / hashlib.sha256(url.encode()).hexdigest()[:32]
+
+    def lock(self, url: str) -> FileLock:
+        return FileLock(self.mirror_path(url).with_suffix(".lock"))
+
+    def update_mirror(
+        self,
+        url: str,
+        urls: Optional[List[str]] = None,
+        local_path: Optional[Path] = None,
+    ) -> GitRepository:
+        """
+        Fetch new commits of the remote repository into its mirror. Create the mirror if
+        it does not exist, or if it could not be updated (e.g. an earlier clone was
+        interrupted). If the local path of a clone of the remote repository is specified,
+        the mirror is created from it, so only objects which the clone does not contain
+        are fetched. Otherwise, the remote repository is cloned, trying all of its urls.
+        Mirrors are never partial clones, so that files of all commits can be read.
+        Should be called while the mirror is locked
+        """
+        path = self.mirror_path(url)
+        mirror = GitRepository(path=path, urls=urls or [url], alias=f"Mirror of {url}")
+        if Path(path, "HEAD").is_file():
+            try:
+                mirror.fetch_mirror()
+                mirror.gc(prune=False)
+                return mirror
+            except GitError as e:
+                taf_logger.warning(
+                    "Could not update mirror of {} due to error: {}. Cloning it again",
+                    url,
+                    e,
+                )
+            mirror.cleanup()
+        if path.exists():
+            shutil.rmtree(path, onerror=on_rm_error)
+        if local_path is not None:
+            mirror.urls = [str(local_path)]
+            try:
+                mirror.clone(bare=True)
+            finally:
+                mirror.urls = urls or [url]
+            mirror.set_remote_url(url)
+            # remove the local repository's branches which the remote does not contain
+            mirror.fetch_mirror()
+        else:
+            mirror.clone(bare=True)
+        return mirror
+
+    def clone_from_mirror(
+        self, url: str, repository: GitRepository, local_path: Optional[Path] = None
+    ) -> None:
+        """
+        Update the mirror of the remote repository and create a bare clone of it at the
+        repository's path, which reads objects from the mirror. The clone's origin is set
+        to the remote repository, as if it was cloned from it. See update_mirror for
+        the local path
+        """
+        with self._use(url) as lock:
+            mirror = self.update_mirror(url, repository.urls, local_path)
+            mirror.cleanup()
+            urls, repository.urls = repository.urls, [str(mirror.path)]
+            try:
+                repository.clone(bare=True, shared=True)
+            finally:
+                repository.urls = urls
+            lock.path.touch()
+        repository.set_remote_url(url)
+
+    def clone_from_disk(
+        self, url: str, repository: GitRepository, local_path: Path
+    ) -> None:
+        """
+        Create a bare clone of a local clone of the remote repository at the repository's
+        path, which reads objects from the local clone, and fetch new commits from the
+        mirror of the remote repository, which is updated first. The clone's origin
+        is the mirror, so fetching from it does not access the remote repository
+        """
+        with self._use(url) as lock:
+            mirror = self.update_mirror(url, repository.urls, local_path)
+            mirror.cleanup()
+            repository.clone_from_disk(
+                local_path, str(mirror.path), is_bare=True, shared=True
+            )
+            lock.path.touch()
+
+    def _use(self, url: str) -> FileLock:
+        """
+        Lock the mirror. Modification time of the lock file is the time when
+        the mirror was last used
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.lock(url)
+
+    def evict(self, max_size: int, min_age: Optional[float] = None) -> List[Path]:
+        """
+        Remove least recently used mirrors until the size of all mirrors is at most
+        max_size bytes. Mirrors which are locked or which were used in the last min_age
+        seconds (MIN_EVICTION_AGE by default) are not removed. Return paths of the
+        removed mirrors
+        """
+        if not self.root.is_dir():
+            return []
+        if min_age is None:
+            min_age = MIN_EVICTION_AGE
+        mirrors = []
+        for lock_path in self.root.glob("*.lock"):
+            path = lock_path.with_suffix("")
+            size = _directory_size(path)
+            mirrors.append((lock_path.stat().st_mtime, path, size))
+        total_size = sum(size for _, _, size in mirrors)
+        removed: List[Path] = []
+        now = time.time()
+        for last_used, path, size in sorted(mirrors):
+            if total_size <= max_size:
+                break
+            if now - last_used < min_age:
+                break
+            lock = FileLock(path.with_suffix(".lock"))
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                # could have been used after its modification time was read
+                if lock.path.stat().st_mtime != last_used:
+                    continue
+                if path.exists():
+                    shutil.rmtree(path, onerror=on_rm_error)
+            finally:
+                lock.release()
+            total_size -= size
+            removed.append(path)
+            taf_logger.debug("Removed mirror {} ({} bytes)", path, size)
+        return removed
+
+
+def _directory_size(path: Path) -> int:
+    if not path.is_dir():
+        return 0
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
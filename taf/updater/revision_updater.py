@@ -0,0 +1,87 @@
+import datetime
+from typing import Dict, Optional
+from urllib import parse
+
+from tuf.api.metadata import Root
+from tuf.ngclient.config import UpdaterConfig
+from tuf.ngclient.updater import Updater
+
+from taf.updater.git_trusted_metadata_set import GitTrustedMetadataSet, VerifiedMetadata
+from taf.updater.signature_cache import SignatureCache
+
+
+class RevisionUpdater(Updater):
+    """
+    TUF updater which validates metadata of consecutive revisions of the
+    authentication repository. TUF's updater can only be refreshed once, so a new one
+    would have to be created for every revision, loading all trusted metadata from
+    the disk and verifying it again.
+    Instead, metadata which TUF would store in the local metadata directory is kept
+    in memory and every call of refresh validates the fetcher's current revision
+    against the metadata trusted after validating the previous one. Metadata which
+    was not modified is not verified again, see GitTrustedMetadataSet.
+
+    Args:
+        fetcher: GitUpdater which provides metadata and target files of the current revision
+        local_metadata: trusted metadata files, at least root.json, to start from
+        signature_cache: cache of verified signatures used when verifying metadata, if any
+    """
+
+    def __init__(
+        self,
+        fetcher,
+        local_metadata: Dict[str, bytes],
+        config: Optional[UpdaterConfig] = None,
+        signature_cache: Optional[SignatureCache] = None,
+    ):
+        # read by TUF's constructor, which loads the trusted root
+        self._local_metadata = dict(local_metadata)
+        self._verified: Dict[str, VerifiedMetadata] = {}
+        self._signature_cache = signature_cache
+        # metadata is not stored in a local directory, see _load_local_metadata
+        # and _persist_metadata
+        super().__init__(
+            metadata_dir="",
+            metadata_base_url="metadata/",
+            target_dir=fetcher.targets_dir,
+            target_base_url="targets/",
+            fetcher=fetcher,
+            config=config,
+        )
+        # the trusted root is loaded again at every refresh
+        self._trusted_set = self._create_trusted_set()
+
+    def _create_trusted_set(
+        self, reference_time: datetime.datetime = datetime.datetime.min
+    ) -> GitTrustedMetadataSet:
+        return GitTrustedMetadataSet(
+            self._load_local_metadata(Root.type),
+            reference_time,
+            self._verified,
+            self._signature_cache,
+        )
+
+    def refresh(self, reference_time: datetime.datetime = datetime.datetime.min):
+        """
+        Validate top-level metadata of the fetcher's current revision.
+        Metadata is considered to be expired if it expired before the reference time.
+        """
+        self._trusted_set = self._create_trusted_set(reference_time)
+        super().refresh()
+
+    def get_local_metadata(self, filename: str) -> Optional[bytes]:
+        """
+        Return the trusted content of a metadata file, if it exists
+        """
+        return self._local_metadata.get(filename)
+
+    def _load_local_metadata(self, rolename: str) -> bytes:
+        filename = f"{parse.quote(rolename, '')}.json"
+        try:
+            return self._local_metadata[filename]
+        except KeyError:
+            # TUF's updater handles missing local files
+            raise FileNotFoundError(filename)
+
+    def _persist_metadata(self, rolename: str, data: bytes) -> None:
+        self._local_metadata[f"{parse.quote(rolename, '')}.json"] = data
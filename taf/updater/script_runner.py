@@ -0,0 +1,164 @@
+"""
+Runs lifecycle handler scripts sent by the updater in a long-lived interpreter, so
+that the interpreter is started and the scripts' dependencies are imported only once.
+The updater starts this module as a script, which is why it only uses the standard
+library. Requests and responses are JSON objects, each preceded by its length in bytes
+(a 4 byte big-endian unsigned integer). They are sent over duplicates of the process's
+stdin and stdout, which scripts cannot write to.
+"""
+import io
+import json
+import os
+import runpy
+import struct
+import sys
+import tempfile
+import time
+import traceback
+from typing import BinaryIO, Dict, Optional
+
+HEADER = struct.Struct(">I")
+
+
+def write_message(stream: BinaryIO, message: Dict) -> None:
+    data = json.dumps(message).encode()
+    stream.write(HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def read_message(stream: BinaryIO) -> Optional[Dict]:
+    """
+    Return the next message, or None if the stream was closed
+    """
+    header = _read_exactly(stream, HEADER.size)
+    if header is None:
+        return None
+    (length,) = HEADER.unpack(header)
+    data = _read_exactly(stream, length)
+    if data is None:
+        raise EOFError("Stream closed in the middle of a message")
+    return json.loads(data)
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> Optional[bytes]:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            if data:
+                raise EOFError("Stream closed in the middle of a message")
+            return None
+        data += chunk
+    return data
+
+
+def run_script(path: str, input: str, source: Optional[str] = None) -> Dict:
+    """
+    Run the script as if it was started by the interpreter, with input as its
+    stdin, and return everything written to stdout and stderr while it was running,
+    including output of processes it started and of extension modules. If source is
+    specified, it is executed instead of the file's content. State of the interpreter
+    which a script could change (arguments, module search path, environment variables
+    and working directory) is restored afterwards, and modules imported from the
+    script's directory are removed, so that scripts of other repositories cannot
+    use them. Other imported modules are kept for the following scripts.
+
+    Everything else is shared by the scripts: state of the kept modules (e.g. of
+    third-party libraries), logging handlers, signal handlers and threads started by
+    a script, which keep running (and whose output is no longer captured) after it returns
+    """
+    script_dir = os.path.dirname(os.path.abspath(path))
+    saved_state = (
+        sys.argv,
+        sys.path[:],
+        dict(os.environ),
+        os.getcwd(),
+        sys.stdin,
+        sys.stdout,
+        sys.stderr,
+    )
+    saved_modules = set(sys.modules)
+    error = None
+    with tempfile.TemporaryFile() as output_file:
+        # processes started by the script write to the file descriptors
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = [os.dup(fd) for fd in (1, 2)]
+        for fd in (1, 2):
+            os.dup2(output_file.fileno(), fd)
+        output = io.TextIOWrapper(
+            io.FileIO(1, "w", closefd=False), encoding="utf-8", write_through=True
+        )
+        start = time.perf_counter()
+        try:
+            sys.argv = [path]
+            sys.path.insert(0, script_dir)
+            sys.stdin = io.StringIO(input)
+            sys.stdout = sys.stderr = output
+            if source is None:
+                runpy.run_path(path, run_name="__main__")
+            else:
+                code = compile(source, path, "exec")
+                exec(
+                    code,
+                    {
+                        "__name__": "__main__",
+                        "__file__": path,
+                        "__builtins__": __builtins__,
+                    },
+                )
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                error = f"Exit status {e.code}"
+        except BaseException:
+            error = traceback.format_exc()
+        finally:
+            duration = time.perf_counter() - start
+            argv, path_list, environ, cwd, stdin, stdout, stderr = saved_state
+            sys.argv = argv
+            sys.path[:] = path_list
+            os.environ.clear()
+            os.environ.update(environ)
+            os.chdir(cwd)
+            sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+            for name in set(sys.modules) - saved_modules:
+                module_file = getattr(sys.modules[name], "__file__", None)
+                if module_file and os.path.abspath(module_file).startswith(
+                    script_dir + os.sep
+                ):
+                    del sys.modules[name]
+            output.flush()
+            for fd, saved_fd in zip((1, 2), saved_fds):
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+        output_file.seek(0)
+        output_text = output_file.read().decode(errors="replace")
+    return {"output": output_text, "error": error, "duration": duration}
+
+
+def main() -> None:
+    # the directory of this module is not a directory of the scripts' modules
+    if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(
+        os.path.abspath(__file__)
+    ):
+        del sys.path[0]
+    # keep the channel's file descriptors and redirect the standard ones, so that
+    # scripts and processes started by them cannot corrupt the channel
+    channel_in = os.fdopen(os.dup(0), "rb")
+    channel_out = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+    while True:
+        request = read_message(channel_in)
+        if request is None:
+            break
+        write_message(
+            channel_out,
+            run_script(request["path"], request["input"], request.get("source")),
+        )
+
+
+if __name__ == "__main__":
+    main()
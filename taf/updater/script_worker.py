@@ -0,0 +1,143 @@
+import atexit
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, cast
+
+from attr import define
+
+from taf.exceptions import ScriptExecutionError
+from taf.log import taf_logger
+from taf.updater import script_runner
+from taf.updater.script_runner import read_message, write_message
+
+# seconds to wait for the worker to exit after its stdin is closed
+SHUTDOWN_TIMEOUT = 5
+
+
+@define
+class ScriptTiming:
+    script: str
+    # time spent running the script in the worker
+    duration: float
+    # including sending the data to the worker and reading the output
+    total_duration: float
+
+
+class ScriptWorker:
+    """
+    A long-lived interpreter which runs lifecycle handler scripts one at a time, so
+    that a new interpreter is not started and the scripts' dependencies are not
+    imported for every script. The worker is a separate process, started when the first
+    script is run and restarted if it exits (e.g. if a script terminated it), so
+    scripts cannot modify the updater's state. They can modify the worker's state seen
+    by the following scripts though, see run_script for the state which is restored
+    after every script and script_runner for the protocol. Durations of the executed
+    scripts are recorded in timings.
+    """
+
+    def __init__(self):
+        self.timings: List[ScriptTiming] = []
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def run(self, script_path: str, input: str, source: Optional[str] = None) -> str:
+        """
+        Run the script with input as its stdin and return its output, like running it
+        in a new interpreter would. If source is specified, it is executed instead of
+        the script file's content
+        """
+        with self._lock:
+            process = self._process
+            if process is None or process.poll() is not None:
+                process = self._start()
+            start = time.monotonic()
+            try:
+                write_message(
+                    cast(BinaryIO, process.stdin),
+                    {"path": script_path, "input": input, "source": source},
+                )
+                response = read_message(cast(BinaryIO, process.stdout))
+            except (OSError, EOFError, ValueError):
+                response = None
+            if response is None:
+                self._stop()
+                raise ScriptExecutionError(
+                    script_path, "Lifecycle script worker exited unexpectedly"
+                )
+            timing = ScriptTiming(
+                script=script_path,
+                duration=response["duration"],
+                total_duration=time.monotonic() - start,
+            )
+            self.timings.append(timing)
+        taf_logger.debug(
+            "Executed {} in {:.3f}s ({:.3f}s including communication with the worker)",
+            script_path,
+            timing.duration,
+            timing.total_duration,
+        )
+        output = response["output"]
+        if response["error"] is not None:
+            output += response["error"]
+            taf_logger.error(
+                "An error occurred while executing {}: {}", script_path, output
+            )
+            raise ScriptExecutionError(script_path, output)
+        return output.rstrip()
+
+    def _start(self) -> subprocess.Popen:
+        self._stop()
+        taf_logger.debug("Starting lifecycle script worker")
+        self._process = subprocess.Popen(
+            [sys.executable, script_runner.__file__],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        return self._process
+
+    def _stop(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            cast(BinaryIO, process.stdin).close()
+            process.wait(timeout=SHUTDOWN_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        cast(BinaryIO, process.stdout).close()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._stop()
+
+
+_idle_script_workers: List[ScriptWorker] = []
+_script_workers_lock = threading.Lock()
+
+
+@contextmanager
+def script_worker() -> Iterator[ScriptWorker]:
+    """
+    Use one of the workers shared by all handlers of the process. A new worker is
+    started if all of them are in use by handlers which run concurrently. Workers are
+    shut down when the process exits
+    """
+    with _script_workers_lock:
+        if _idle_script_workers:
+            worker = _idle_script_workers.pop()
+        else:
+            worker = ScriptWorker()
+            atexit.register(worker.shutdown)
+    try:
+        yield worker
+    finally:
+        with _script_workers_lock:
+            _idle_script_workers.append(worker)
@@ -0,0 +1,177 @@
+import hashlib
+import hmac
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from tuf.api.metadata import Key, Metadata
+from tuf.api.serialization import SignedSerializer
+from tuf.api.serialization.json import CanonicalJSONSerializer
+
+import taf.settings as settings
+from taf.log import taf_logger
+
+SIGNATURE_CACHE_FILENAME = "signature_cache.json"
+SIGNATURE_CACHE_KEY_FILENAME = "signature_cache.key"
+
+
+class SignatureCache:
+    """
+    Bounded, least recently used set of signatures which were successfully verified.
+    An entry is a digest of the key (its id, type, scheme and public value), the
+    signature and the digest of the signed bytes, so a signature is only considered
+    to be verified if all of them are the same as when it was verified.
+    Only valid signatures are cached, so invalid ones are always verified again.
+    If max_size is not specified, settings.signature_cache_max_size is used.
+
+    The cache can be stored to a file, protected by an HMAC computed using the user's
+    secret, which is not stored in the same directory (see _get_secret). A file whose
+    HMAC does not match is ignored, so entries can only be added by the user's updates.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self._max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return settings.signature_cache_max_size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, entry: str) -> bool:
+        with self._lock:
+            if entry not in self._entries:
+                return False
+            self._entries.move_to_end(entry)
+            return True
+
+    def add(self, entry: str) -> None:
+        if not self.max_size:
+            return
+        with self._lock:
+            self._entries[entry] = None
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def entry(key: Key, signature: str, data: bytes) -> str:
+        key_data = json.dumps(
+            [key.keyid, key.keytype, key.scheme, key.keyval], sort_keys=True
+        )
+        return hashlib.sha256(
+            b"\0".join(
+                [
+                    key_data.encode(),
+                    signature.encode(),
+                    hashlib.sha256(data).digest(),
+                ]
+            )
+        ).hexdigest()
+
+    def verify_signature(
+        self,
+        key: Key,
+        metadata: Metadata,
+        signed_serializer: Optional[SignedSerializer] = None,
+    ) -> None:
+        """
+        Verify the key's signature of the metadata unless it was already verified.
+        Raises the same errors as Key.verify_signature
+        """
+        signature = metadata.signatures.get(key.keyid)
+        if signature is None or not self.max_size:
+            _verify_signature(key, metadata, signed_serializer)
+            return
+        if signed_serializer is None:
+            signed_serializer = CanonicalJSONSerializer()
+        entry = self.entry(
+            key, signature.signature, signed_serializer.serialize(metadata.signed)
+        )
+        if entry in self:
+            return
+        _verify_signature(key, metadata, signed_serializer)
+        self.add(entry)
+
+    def load(self, conf_dir: str) -> None:
+        """
+        Add signatures stored in the configuration directory to the cache
+        """
+        path = Path(conf_dir, SIGNATURE_CACHE_FILENAME)
+        if not path.is_file():
+            return
+        try:
+            data = json.loads(path.read_text())
+            entries = data["entries"]
+            expected_mac = _mac(_get_secret(), entries)
+            if not hmac.compare_digest(expected_mac, data["mac"]):
+                taf_logger.warning(
+                    "Integrity check of signature cache {} failed. Ignoring it", path
+                )
+                return
+        except Exception as e:
+            taf_logger.warning("Could not load signature cache {}: {}", path, e)
+            return
+        for entry in entries:
+            self.add(entry)
+        taf_logger.debug("Loaded {} verified signatures from {}", len(entries), path)
+
+    def save(self, conf_dir: str) -> None:
+        """
+        Store the cached signatures to the configuration directory
+        """
+        with self._lock:
+            entries = list(self._entries)
+        path = Path(conf_dir, SIGNATURE_CACHE_FILENAME)
+        data = {"entries": entries, "mac": _mac(_get_secret(), entries)}
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(data))
+        os.replace(temp_path, path)
+
+
+def _get_secret() -> bytes:
+    """
+    Read the secret used to protect stored signature caches, creating it if it
+    does not exist. It is the user's secret, shared by all repositories, and is
+    kept outside of their configuration directories, so that whoever can modify
+    a stored cache cannot compute its HMAC
+    """
+    if settings.signature_cache_key_path is not None:
+        path = Path(settings.signature_cache_key_path)
+    else:
+        path = Path.home() / ".taf" / SIGNATURE_CACHE_KEY_FILENAME
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return path.read_bytes()
+    secret = os.urandom(32)
+    with os.fdopen(fd, "wb") as f:
+        f.write(secret)
+    return secret
+
+
+def _mac(secret: bytes, entries) -> str:
+    return hmac.new(secret, json.dumps(entries).encode(), hashlib.sha256).hexdigest()
+
+
+# shared by all updates, since a signature which was verified once
+# is valid no matter which repository or commit it is read from
+signature_cache = SignatureCache()
+
+
+def _verify_signature(
+    key: Key, metadata: Metadata, signed_serializer: Optional[SignedSerializer] = None
+) -> None:
+    key.verify_signature(metadata, signed_serializer)
@@ -0,0 +1,178 @@
+import json
+import os
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from securesystemslib import keys as sslib_keys
+from tuf.api.metadata import Key, Metadata, Root, Targets
+from tuf.api.serialization.json import CanonicalJSONSerializer
+
+from taf.git import GitRepository
+from taf.log import taf_logger
+from taf.updater.executors import UpdaterPool
+from taf.updater.signature_cache import SignatureCache, signature_cache
+
+# (cache entry, key, signature, signed bytes)
+WorkItem = Tuple[str, Dict, Dict, bytes]
+
+# number of signatures sent to a worker process at once
+CHUNK_SIZE = 64
+
+
+def _verify_signatures(work: List[WorkItem]) -> List[str]:
+    """
+    Executed by the worker processes. Return cache entries of the valid signatures
+    """
+    verified = []
+    for entry, key, signature, data in work:
+        try:
+            if sslib_keys.verify_signature(key, signature, data):
+                verified.append(entry)
+        except Exception:
+            # invalid signatures are reported by the updater
+            pass
+    return verified
+
+
+class _KeysInRange:
+    """
+    All keys declared by root and targets metadata (including delegations)
+    of the already processed commits, by key id. A key id can map to more
+    than one key, since TUF does not check that the id matches the key
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, Dict[str, Key]] = {}
+
+    def add_from(self, metadata: Metadata) -> None:
+        keys: Dict[str, Key] = {}
+        if isinstance(metadata.signed, Root):
+            keys = metadata.signed.keys
+        elif (
+            isinstance(metadata.signed, Targets)
+            and metadata.signed.delegations is not None
+        ):
+            keys = metadata.signed.delegations.keys or {}
+        for keyid, key in keys.items():
+            key_data = json.dumps(key.to_dict(), sort_keys=True)
+            self._keys.setdefault(keyid, {})[key_data] = key
+
+    def get(self, keyid: str) -> List[Key]:
+        return list(self._keys.get(keyid, {}).values())
+
+
+def _metadata_in_range(
+    repo: GitRepository, commits: List[str]
+) -> Iterator[List[Metadata]]:
+    """
+    Metadata files of the given commits which were not returned for one of the
+    previous commits, in order of commits
+    """
+    seen = set()
+    files_at_revision = None
+    for commit in commits:
+        try:
+            files_at_revision = repo.list_files_at_revision_incremental(
+                commit, "metadata", files_at_revision
+            )
+        except Exception:
+            files_at_revision = None
+            continue
+        metadata_at_commit = []
+        for filename in files_at_revision.added | files_at_revision.modified:
+            path = f"metadata/{filename}"
+            blob_id = repo.get_object_id_at_path(commit, path)
+            if blob_id is None or blob_id in seen:
+                continue
+            seen.add(blob_id)
+            try:
+                metadata_at_commit.append(
+                    Metadata.from_bytes(repo.get_file(commit, path, raw=True))
+                )
+            except Exception:
+                # invalid metadata is reported by the updater
+                continue
+        yield metadata_at_commit
+
+
+def _signatures_in_range(repo: GitRepository, commits: List[str]) -> Iterator[WorkItem]:
+    """
+    Signatures of all metadata files of the given commits, paired with every key
+    with the signature's key id declared at the same or at one of the previous commits.
+    These are the keys the updater could verify the signature with
+    """
+    keys = _KeysInRange()
+    serializer = CanonicalJSONSerializer()
+    for metadata_at_commit in _metadata_in_range(repo, commits):
+        # delegated roles can be signed by keys added at the same commit
+        for metadata in metadata_at_commit:
+            keys.add_from(metadata)
+        for metadata in metadata_at_commit:
+            signed = serializer.serialize(metadata.signed)
+            for keyid, signature in metadata.signatures.items():
+                for key in keys.get(keyid):
+                    entry = SignatureCache.entry(key, signature.signature, signed)
+                    if entry in signature_cache:
+                        continue
+                    yield (
+                        entry,
+                        key.to_securesystemslib_key(),
+                        signature.to_dict(),
+                        signed,
+                    )
+
+
+def preverify_signatures(
+    repo: GitRepository, commits: List[str], pool: Optional[UpdaterPool] = None
+) -> int:
+    """
+    Verify signatures of metadata files of all commits in the given range using a pool
+    of processes and add the valid ones to the signature cache. Signatures are verified
+    speculatively, against every key which could have been used to sign them,
+    before the updater decides which keys are trusted at each commit. The updater
+    still validates the commits one by one, but does not have to verify signatures
+    which were already verified. If the range contains more signatures than the
+    cache can hold, the ones verified first are evicted.
+    If the pool is not specified, a pool with a process per CPU is used.
+    Return the number of verified signatures
+    """
+    if not signature_cache.max_size:
+        return 0
+    if pool is None:
+        pool = UpdaterPool("cpu", os.cpu_count() or 1, processes=True)
+        try:
+            return preverify_signatures(repo, commits, pool)
+        finally:
+            pool.shutdown()
+    verified = 0
+    futures: set = set()
+
+    def _collect(return_when):
+        nonlocal futures, verified
+        done, futures = wait(futures, return_when=return_when)
+        for future in done:
+            for entry in future.result():
+                signature_cache.add(entry)
+                verified += 1
+
+    chunk: List[WorkItem] = []
+    for work_item in _signatures_in_range(repo, commits):
+        chunk.append(work_item)
+        if len(chunk) < CHUNK_SIZE:
+            continue
+        futures.add(pool.submit(_verify_signatures, chunk))
+        chunk = []
+        # limit the number of signatures which are kept in memory
+        if len(futures) >= 2 * pool.max_workers:
+            _collect(FIRST_COMPLETED)
+    if chunk:
+        futures.add(pool.submit(_verify_signatures, chunk))
+    _collect(ALL_COMPLETED)
+    taf_logger.debug(
+        "Verified {} signatures of {} using {} {}s",
+        verified,
+        repo.name,
+        pool.max_workers,
+        pool.stats.kind,
+    )
+    return verified
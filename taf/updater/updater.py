@@ -1,9 +1,12 @@
 from logging import ERROR
 
+from functools import partial
 from typing import Dict, Tuple, Any
 from attr import define, field
 from logdecorator import log_on_error
 from taf.git import GitRepository
+from taf.updater.dependency_scheduler import DependencyScheduler
+from taf.updater.executors import UpdaterExecutors
 from taf.updater.types.update import OperationType, UpdateType
 from taf.updater.updater_pipeline import (
     AuthenticationRepositoryUpdatePipeline,
@@ -186,6 +189,30 @@ class RepositoryConfig:
         default=False,
         metadata={"docs": "Whether update fails if a warning is raised. Optional."},
     )
+    network_workers: int = field(
+        default=None,
+        metadata={
+            "docs": "Maximum number of repositories cloned or fetched from remotes at the same time. Optional."
+        },
+    )
+    disk_workers: int = field(
+        default=None,
+        metadata={
+            "docs": "Maximum number of repositories cloned or read from the file system at the same time. Optional."
+        },
+    )
+    cpu_workers: int = field(
+        default=None,
+        metadata={
+            "docs": "Maximum number of workers which verify signatures and validate target repositories. Optional."
+        },
+    )
+    cpu_processes: bool = field(
+        default=True,
+        metadata={
+            "docs": "Whether CPU-bound validation runs in processes instead of threads. Optional."
+        },
+    )
 
     def __attrs_post_init__(self):
         if self.operation == OperationType.CLONE:
@@ -287,8 +314,13 @@ def _update_or_clone_repository(config: RepositoryConfig):
     transient_data: Dict = {}
     root_error = None
     auth_repo_name = None
+    executors = UpdaterExecutors(
+        network_workers=config.network_workers,
+        disk_workers=config.disk_workers,
+        cpu_workers=config.cpu_workers,
+        cpu_processes=config.cpu_processes,
+    )
     try:
-
         auth_repo_name, error = _update_named_repository(
             config.operation,
             config.url,
@@ -307,6 +339,7 @@ def _update_or_clone_repository(config: RepositoryConfig):
             scripts_root_dir=config.scripts_root_dir,
             checkout=config.checkout,
             excluded_target_globs=config.excluded_target_globs,
+            executors=executors,
         )
         if error:
             raise error
@@ -314,6 +347,8 @@ def _update_or_clone_repository(config: RepositoryConfig):
         root_error = UpdateFailedError(
             f"Update of {auth_repo_name or 'repository'} failed due to error: {e}"
         )
+    finally:
+        executors.shutdown()
 
     update_data = {}
     if not config.excluded_target_globs:
@@ -344,7 +379,9 @@ def _update_or_clone_repository(config: RepositoryConfig):
 
     if root_error:
         raise root_error
-    return unstructure(update_data)
+    output = unstructure(update_data)
+    output["pool_stats"] = executors.stats()
+    return output
 
 
 def _update_named_repository(
@@ -366,6 +403,8 @@ def _update_named_repository(
     scripts_root_dir=None,
     checkout=True,
     excluded_target_globs=None,
+    scheduler=None,
+    executors=None,
 ):
     """
     Arguments:
@@ -392,6 +431,10 @@ def _update_named_repository(
         checkout (optional): Whether to checkout last validated commits after update is done
         excluded_target_globs (options): globs specifying target repositories which should not get validated and updated.
         strict (optional): Whether or not update fails if a warning is raised
+        scheduler (optional): DependencyScheduler shared by all repositories which are updated. Dependencies
+            are updated concurrently if it allows more than one update at a time
+        executors (optional): UpdaterExecutors shared by all repositories which are updated. If not specified,
+            each repository is updated using its own pools
 
     The general idea of the updater is the following:
     - We have a git repository which contains the metadata files. These metadata files
@@ -421,34 +464,41 @@ def _update_named_repository(
     """
     if visited is None:
         visited = []
-    # if there is a recursive dependency
-    if url in visited:
+    if scheduler is None:
+        scheduler = DependencyScheduler()
+        # the same for all repositories of the update, so they are set before
+        # any dependencies are updated concurrently and never by their pipelines
+        settings.update_from_filesystem = update_from_filesystem
+        settings.conf_directory_root = conf_directory_root
+    # if there is a recursive dependency or the repository was already updated
+    if not scheduler.visit(url, visited):
         return
-    visited.append(url)
     # at the moment, we assume that the initial commit is valid and that it contains at least root.json
-    (
-        update_status,
-        auth_repo,
-        auth_repo_name,
-        commits_data,
-        error,
-        targets_data,
-    ) = _update_current_repository(
-        operation,
-        url,
-        auth_path,
-        library_dir,
-        update_from_filesystem,
-        expected_repo_type,
-        target_repo_classes,
-        target_factory,
-        only_validate,
-        validate_from_commit,
-        conf_directory_root,
-        out_of_band_authentication,
-        checkout,
-        excluded_target_globs,
-    )
+    with scheduler.slots:
+        (
+            update_status,
+            auth_repo,
+            auth_repo_name,
+            commits_data,
+            error,
+            targets_data,
+        ) = _update_current_repository(
+            operation,
+            url,
+            auth_path,
+            library_dir,
+            update_from_filesystem,
+            expected_repo_type,
+            target_repo_classes,
+            target_factory,
+            only_validate,
+            validate_from_commit,
+            conf_directory_root,
+            out_of_band_authentication,
+            checkout,
+            excluded_target_globs,
+            executors,
+        )
 
     # if auth_repo doesn't exist, means that either clients-auth-path isn't provided,
     # or info.json is missing from protected
@@ -478,37 +528,32 @@ def _update_named_repository(
         )
 
         if update_status != Event.FAILED:
-            errors = []
             # load the repositories from dependencies.json and update these repositories
-            child_auth_repos = repositoriesdb.get_deduplicated_auth_repositories(
-                auth_repo, commits
-            ).values()
-
-            for child_auth_repo in child_auth_repos:
-                try:
-                    _, error = _update_named_repository(
-                        operation=OperationType.CLONE_OR_UPDATE,
-                        url=child_auth_repo.urls[0],
-                        auth_path=child_auth_repo.path,
-                        library_dir=library_dir,
-                        update_from_filesystem=update_from_filesystem,
-                        expected_repo_type=expected_repo_type,
-                        target_repo_classes=target_repo_classes,
-                        target_factory=target_factory,
-                        only_validate=only_validate,
-                        validate_from_commit=validate_from_commit,
-                        conf_directory_root=conf_directory_root,
-                        visited=visited,
-                        repos_update_data=repos_update_data,
-                        transient_data=transient_data,
-                        out_of_band_authentication=child_auth_repo.out_of_band_authentication,
-                        scripts_root_dir=scripts_root_dir,
-                        checkout=checkout,
-                    )
-                    if error:
-                        raise error
-                except Exception as e:
-                    errors.append(str(e))
+            child_auth_repos = list(
+                repositoriesdb.get_deduplicated_auth_repositories(
+                    auth_repo, commits
+                ).values()
+            )
+
+            errors = _update_dependencies(
+                scheduler,
+                url,
+                child_auth_repos,
+                repos_update_data,
+                library_dir=library_dir,
+                update_from_filesystem=update_from_filesystem,
+                expected_repo_type=expected_repo_type,
+                target_repo_classes=target_repo_classes,
+                target_factory=target_factory,
+                only_validate=only_validate,
+                validate_from_commit=validate_from_commit,
+                conf_directory_root=conf_directory_root,
+                visited=visited,
+                transient_data=transient_data,
+                scripts_root_dir=scripts_root_dir,
+                checkout=checkout,
+                executors=executors,
+            )
 
             if len(errors):
                 errors = "\n".join(errors)
@@ -559,11 +604,58 @@ def _update_named_repository(
             "targets_data": targets_data,
         }
 
-    repositoriesdb.clear_repositories_db()
+    repositoriesdb.clear_repositories_db(auth_repo)
 
     return auth_repo_name, error
 
 
+def _update_dependencies(scheduler, url, child_auth_repos, repos_update_data, **kwargs):
+    """
+    Update authentication repositories which the repository depends on, concurrently
+    if the scheduler allows it. Update data of each dependency (including the data of
+    its own dependencies) is added to repos_update_data in the order of dependencies,
+    no matter in which order they are updated.
+    Return errors of dependencies which could not be updated
+    """
+    children_update_data = [
+        {} if repos_update_data is not None else None for _ in child_auth_repos
+    ]
+    updates = [
+        (
+            child_auth_repo.urls[0],
+            partial(
+                _update_named_repository,
+                operation=OperationType.CLONE_OR_UPDATE,
+                url=child_auth_repo.urls[0],
+                auth_path=child_auth_repo.path,
+                repos_update_data=child_update_data,
+                out_of_band_authentication=child_auth_repo.out_of_band_authentication,
+                scheduler=scheduler,
+                **kwargs,
+            ),
+        )
+        for child_auth_repo, child_update_data in zip(
+            child_auth_repos, children_update_data
+        )
+    ]
+    errors = []
+    for result, child_update_data in zip(
+        scheduler.run(url, updates), children_update_data
+    ):
+        if child_update_data:
+            repos_update_data.update(child_update_data)
+        # already updated as a dependency of another repository
+        if result is None:
+            continue
+        if isinstance(result, Exception):
+            errors.append(str(result))
+            continue
+        _, error = result
+        if error:
+            errors.append(str(error))
+    return errors
+
+
 def _update_current_repository(
     operation,
     url,
@@ -579,6 +671,7 @@ def _update_current_repository(
     out_of_band_authentication,
     checkout,
     excluded_target_globs,
+    executors=None,
 ):
     updater_pipeline = AuthenticationRepositoryUpdatePipeline(
         operation,
@@ -595,6 +688,7 @@ def _update_current_repository(
         out_of_band_authentication,
         checkout,
         excluded_target_globs,
+        executors,
     )
     updater_pipeline.run()
     output = updater_pipeline.output
@@ -644,17 +738,19 @@ def validate_repository(
     settings.last_validated_commit = validate_from_commit
     auth_repo_name = None
     try:
-        auth_repo_name, error = _update_named_repository(
-            operation=OperationType.UPDATE,
-            url=str(auth_path),
-            auth_path=str(auth_path),
-            library_dir=library_dir,
-            update_from_filesystem=True,
-            expected_repo_type=expected_repo_type,
-            only_validate=True,
-            validate_from_commit=validate_from_commit,
-            excluded_target_globs=excluded_target_globs,
-        )
+        with UpdaterExecutors() as executors:
+            auth_repo_name, error = _update_named_repository(
+                operation=OperationType.UPDATE,
+                url=str(auth_path),
+                auth_path=str(auth_path),
+                library_dir=library_dir,
+                update_from_filesystem=True,
+                expected_repo_type=expected_repo_type,
+                only_validate=True,
+                validate_from_commit=validate_from_commit,
+                excluded_target_globs=excluded_target_globs,
+                executors=executors,
+            )
         if error:
             raise error
     except Exception as e:
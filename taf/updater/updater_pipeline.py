@@ -1,5 +1,5 @@
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed, wait
 from enum import Enum
 import functools
 from logging import DEBUG, INFO
@@ -7,6 +7,7 @@ from pathlib import Path
 import re
 import shutil
 import tempfile
+import threading
 from typing import Any, Dict, List, Optional
 from attr import attrs, define, field
 from taf.git import GitError
@@ -22,13 +23,19 @@ from taf.exceptions import (
     UpdateFailedError,
     UnpushedCommitsError,
 )
+from taf.updater.commit_sequence import CommitSequence
+from taf.updater.executors import UpdaterExecutors
+from taf.updater.mirror_cache import MirrorCache
 from taf.updater.handlers import GitUpdater
 from taf.updater.lifecycle_handlers import Event
+from taf.updater.revision_updater import RevisionUpdater
+from taf.updater.signature_cache import signature_cache
+from taf.updater.signature_preverification import preverify_signatures
+from taf.transport import TransferStats
 from taf.updater.types.update import OperationType, UpdateType
 from taf.utils import TempPartition, on_rm_error
 from taf.log import taf_logger
-from tuf.ngclient.updater import Updater
-from tuf.repository_tool import TARGETS_DIRECTORY_NAME
+from tuf.repository_tool import METADATA_DIRECTORY_NAME, TARGETS_DIRECTORY_NAME
 
 
 EXPIRED_METADATA_ERROR = "ExpiredMetadataError"
@@ -76,9 +83,9 @@ class UpdateState:
     target_branches_data_from_auth_repo: Dict = field(factory=dict)
     targets_data_by_auth_commits: Dict = field(factory=dict)
     old_heads_per_target_repos_branches: Dict[str, Dict[str, str]] = field(factory=dict)
-    fetched_commits_per_target_repos_branches: Dict[str, Dict[str, List[str]]] = field(
-        factory=dict
-    )
+    fetched_commits_per_target_repos_branches: Dict[
+        str, Dict[str, CommitSequence]
+    ] = field(factory=dict)
     validated_commits_per_target_repos_branches: Dict[str, Dict[str, str]] = field(
         factory=dict
     )
@@ -87,6 +94,16 @@ class UpdateState:
     ] = field(factory=dict)
     validated_auth_commits: List[str] = field(factory=list)
     temp_root: TempPartition = field(default=None)
+    # mirrors which temp target repositories are cloned from, if enabled
+    target_mirror_cache: Optional[MirrorCache] = field(default=None)
+    # target repositories whose commits did not change since the last validated commit
+    # of the authentication repository and which are not fetched, mapped to temp
+    # repositories which replace them if all commits need to be validated
+    unchanged_target_repositories: Dict[str, GitRepository] = field(factory=dict)
+    # progress of clones and fetches of repositories which are not part of the state
+    transfer_stats: List[TransferStats] = field(factory=list)
+    # set to abort in-process clones and fetches which are still running
+    cancel_event: threading.Event = field(factory=threading.Event)
 
 
 @attrs
@@ -97,6 +114,7 @@ class UpdateOutput:
     commits_data: Dict[str, Any] = field()
     error: Optional[Exception] = field(default=None)
     targets_data: Dict[str, Any] = field(factory=dict)
+    transfer_stats: List[TransferStats] = field(factory=list)
 
 
 def cleanup_decorator(pipeline_function):
@@ -201,6 +219,7 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
         out_of_band_authentication,
         checkout,
         excluded_target_globs,
+        executors=None,
     ):
 
         super().__init__(
@@ -212,6 +231,7 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
                 (self.clone_or_fetch_users_auth_repo, RunMode.UPDATE),
                 (self.load_target_repositories, RunMode.ALL),
                 (self.check_if_repositories_on_disk, RunMode.LOCAL_VALIDATION),
+                (self.determine_unchanged_target_repositories, RunMode.ALL),
                 (self.clone_target_repositories_to_temp, RunMode.UPDATE),
                 (self.determine_start_commits, RunMode.ALL),
                 (self.get_targets_data_from_auth_repo, RunMode.ALL),
@@ -248,10 +268,21 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
         self.out_of_band_authentication = out_of_band_authentication
         self.checkout = checkout
         self.excluded_target_globs = excluded_target_globs
+        # pools shared with updates of dependencies, if not specified
+        # the pipeline uses its own pools
+        self._owns_executors = executors is None
+        self.executors = executors or UpdaterExecutors()
         self.state = UpdateState()
         self.state.targets_data = {}
         self._output = None
 
+    def run(self):
+        try:
+            super().run()
+        finally:
+            if self._owns_executors:
+                self.executors.shutdown()
+
     @property
     def output(self):
         if not self._output:
@@ -287,7 +318,7 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
                     for target_repo in target_repositories.values()
                     if target_repo.is_git_repository_root
                 }
-                repositoriesdb.clear_repositories_db()
+                repositoriesdb.clear_repositories_db(auth_repo)
         return UpdateStatus.SUCCESS
 
     @log_on_start(
@@ -328,14 +359,49 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
             return UpdateStatus.FAILED
         return UpdateStatus.SUCCESS
 
+    def _get_users_auth_repo(self, auth_repo_name):
+        """
+        Return the user's authentication repository, whose configuration directory
+        is used while validating the remote repository. It does not have to exist yet
+        """
+        if self.auth_path:
+            return AuthenticationRepository(path=self.auth_path)
+        return AuthenticationRepository(self.library_dir, auth_repo_name)
+
+    def _get_mirror_cache(self, enabled):
+        """
+        Return the cache of mirrors in the configuration directory of the user's
+        authentication repository, if enabled. Mirrors are only used when updating
+        repositories, since they would be created just to be used once when cloning
+        """
+        if not enabled or self.operation != OperationType.UPDATE:
+            return None
+        users_auth_repo = AuthenticationRepository(
+            path=self.auth_path, conf_directory_root=self.conf_directory_root
+        )
+        return MirrorCache(Path(users_auth_repo.conf_dir, "mirrors"))
+
+    def _get_last_validated_commit(self):
+        """
+        Return the commit from which validation starts. Dependencies can be updated
+        concurrently, so it is passed to the updater instead of being stored in the
+        settings. settings.last_validated_commit is only read, if it was set by
+        validate_repository before the update started
+        """
+        if self.operation == OperationType.CLONE:
+            last_validated_commit = None
+        elif settings.overwrite_last_validated_commit:
+            last_validated_commit = settings.last_validated_commit
+        else:
+            users_auth_repo = AuthenticationRepository(path=self.auth_path)
+            last_validated_commit = users_auth_repo.last_validated_commit
+        return last_validated_commit
+
     @log_on_start(
         INFO, "Cloning repository and running TUF updater...", logger=taf_logger
     )
     @cleanup_decorator
     def clone_remote_and_run_tuf_updater(self):
-        settings.update_from_filesystem = self.update_from_filesystem
-        settings.conf_directory_root = self.conf_directory_root
-
         if self.operation == OperationType.CLONE_OR_UPDATE:
             if (
                 self.auth_path is not None
@@ -345,24 +411,19 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
             else:
                 self.operation = OperationType.CLONE
 
-        # set last validated commit before running the updater
-        # this last validated commit is read from the settings
-        if self.operation == OperationType.CLONE:
-            settings.last_validated_commit = None
-        elif not settings.overwrite_last_validated_commit:
-            users_auth_repo = AuthenticationRepository(path=self.auth_path)
-            last_validated_commit = users_auth_repo.last_validated_commit
-            settings.last_validated_commit = last_validated_commit
+        last_validated_commit = self._get_last_validated_commit()
 
         try:
             self.state.auth_commits_since_last_validated = None
 
-            # Use ThreadPoolExecutor to run _clone_validation_repo in a separate thread
-            with ThreadPoolExecutor() as executor:
-                future_validation_repo = executor.submit(
-                    _clone_validation_repo, self.url
-                )
-                validation_repo = future_validation_repo.result()
+            validation_repo = self.executors.network.submit(
+                _clone_validation_repo,
+                self.url,
+                last_validated_commit,
+                self._get_mirror_cache(settings.validation_repo_mirror_cache),
+                self.auth_path,
+            ).result()
+            self.state.transfer_stats.extend(validation_repo.transfer_stats)
 
             # check if auth path is provided and if that is not the case
             # check if info.json exists. info.json will be read after validation
@@ -383,9 +444,16 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
                     validation_repo, top_commit_of_validation_repo
                 )
 
-            git_updater = GitUpdater(self.url, self.library_dir, validation_repo.name)
+            git_updater = GitUpdater(
+                self.url,
+                self.library_dir,
+                validation_repo.name,
+                self._get_users_auth_repo(auth_repo_name),
+                validation_repo_path=validation_repo.path,
+                last_validated_commit=last_validated_commit,
+            )
             last_validated_remote_commit, error = _run_tuf_updater(
-                git_updater, auth_repo_name
+                git_updater, auth_repo_name, self.executors.cpu
             )
             if last_validated_remote_commit is None and error is not None:
                 raise error
@@ -414,11 +482,11 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
             self.state.is_test_repo = self.state.validation_auth_repo.is_test_repo
 
             if self.operation == OperationType.UPDATE:
-                self._validate_last_validated_commit(settings.last_validated_commit)
+                self._validate_last_validated_commit(last_validated_commit)
 
             # used for testing purposes
             if settings.overwrite_last_validated_commit:
-                self.state.last_validated_commit = settings.last_validated_commit
+                self.state.last_validated_commit = last_validated_commit
             else:
                 self.state.last_validated_commit = (
                     self.state.users_auth_repo.last_validated_commit
@@ -621,41 +689,149 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
             self.state.event = Event.FAILED
             return UpdateStatus.FAILED
 
+    @log_on_start(
+        DEBUG, "Determining unchanged target repositories...", logger=taf_logger
+    )
+    def determine_unchanged_target_repositories(self):
+        """
+        Read targets data of the new commits of the authentication repository and,
+        if enabled, find target repositories which are not cloned to temp or fetched,
+        since their commits did not change and the user's repositories already contain
+        them. User's repositories are validated instead of the temp ones
+        """
+        try:
+            self.state.targets_data_by_auth_commits = (
+                self.state.users_auth_repo.targets_data_by_auth_commits(
+                    self.state.auth_commits_since_last_validated
+                )
+            )
+            self.state.unchanged_target_repositories = {}
+            if (
+                not settings.skip_unchanged_target_repositories
+                or self.only_validate
+                or self.state.last_validated_commit is None
+            ):
+                return UpdateStatus.SUCCESS
+            for name, temp_repo in self.state.temp_target_repositories.items():
+                users_repo = self.state.users_target_repositories[name]
+                if self._is_target_repository_unchanged(users_repo):
+                    self.state.unchanged_target_repositories[name] = temp_repo
+                    self.state.temp_target_repositories[name] = users_repo
+            if self.state.unchanged_target_repositories:
+                taf_logger.debug(
+                    "Skipping unchanged target repositories: {}",
+                    ", ".join(self.state.unchanged_target_repositories),
+                )
+            return UpdateStatus.SUCCESS
+        except Exception as e:
+            self.state.errors.append(e)
+            self.state.event = Event.FAILED
+            return UpdateStatus.FAILED
+
+    def _is_target_repository_unchanged(self, repository):
+        """
+        Check if all new commits of the authentication repository point to the same
+        branch and commit of the target repository as the last validated one, and if
+        that commit is the top commit of the branch of the user's repository.
+        Repositories which can contain unauthenticated commits are never unchanged,
+        since new commits of their remotes are not authenticated by the targets data
+        """
+        if _is_unauthenticated_allowed(repository):
+            return False
+        commits_data = self.state.targets_data_by_auth_commits.get(repository.name)
+        if not commits_data:
+            return False
+        last_validated_data = commits_data.get(self.state.last_validated_commit)
+        if not last_validated_data:
+            return False
+        branch = last_validated_data.get("branch", repository.default_branch)
+        commit = last_validated_data["commit"]
+        for auth_commit in self.state.auth_commits_since_last_validated:
+            commit_data = commits_data.get(auth_commit)
+            if commit_data is None or commit_data["commit"] != commit:
+                return False
+            if commit_data.get("branch", repository.default_branch) != branch:
+                return False
+        if not repository.is_git_repository_root:
+            return False
+        if not repository.branch_exists(branch, include_remotes=False):
+            return False
+        return repository.top_commit_of_branch(branch) == commit
+
     @log_on_start(DEBUG, "Cloning target repositories to temp...", logger=taf_logger)
     @log_on_end(INFO, "Finished cloning target repositories", logger=taf_logger)
     def clone_target_repositories_to_temp(self):
         try:
             self.state.repos_on_disk = {}
             self.state.repos_not_on_disk = {}
+            self.state.target_mirror_cache = self._get_mirror_cache(
+                settings.target_repo_mirror_cache
+            )
+            self._clone_target_repositories_to_temp(
+                [
+                    temp_repo
+                    for temp_repo in self.state.temp_target_repositories.values()
+                    if temp_repo.name not in self.state.unchanged_target_repositories
+                ]
+            )
+            return UpdateStatus.SUCCESS
+        except Exception as e:
+            self.state.errors.append(e)
+            self.state.event = Event.FAILED
+            return UpdateStatus.FAILED
+
+    def _clone_target_repositories_to_temp(self, temp_repos):
+        """
+        Clone the given temp target repositories concurrently. Repositories which are
+        on disk are cloned from the user's repositories and then fetched
+        """
+        mirror_cache = self.state.target_mirror_cache
 
-            def clone_repo_to_temp(temp_repo, users_repo):
-                if users_repo.is_git_repository_root:
+        def clone_repo_to_temp(temp_repo, users_repo):
+            if users_repo.is_git_repository_root:
+                remote_url = users_repo.get_remote_url()
+                if mirror_cache is not None and remote_url is not None:
+                    mirror_cache.clone_from_disk(remote_url, temp_repo, users_repo.path)
+                else:
                     temp_repo.clone_from_disk(
                         users_repo.path,
-                        users_repo.get_remote_url(),
+                        remote_url,
                         is_bare=True,
+                        shared=settings.share_objects_with_temp_repositories,
                     )
-                    self.state.repos_on_disk[users_repo.name] = users_repo
-                else:
-                    temp_repo.clone(bare=True)
-                    self.state.repos_not_on_disk[users_repo.name] = users_repo
-
-            with ThreadPoolExecutor() as executor:
-                futures = []
-                for temp_repo in self.state.temp_target_repositories.values():
-                    users_repo = self.state.users_target_repositories[temp_repo.name]
-                    futures.append(
-                        executor.submit(clone_repo_to_temp, temp_repo, users_repo)
-                    )
-
-                for future in as_completed(futures):
-                    future.result()
+                self.state.repos_on_disk[users_repo.name] = users_repo
+            elif mirror_cache is not None and temp_repo.urls:
+                mirror_cache.clone_from_mirror(temp_repo.urls[0], temp_repo)
+                self.state.repos_not_on_disk[users_repo.name] = users_repo
+            elif settings.partial_clone:
+                # only commits are validated, file contents are fetched
+                # before the repository is copied to the user's directory
+                temp_repo.clone(bare=True, filter="blob:none")
+                self.state.repos_not_on_disk[users_repo.name] = users_repo
+            else:
+                temp_repo.clone(bare=True)
+                self.state.repos_not_on_disk[users_repo.name] = users_repo
+
+        futures = []
+        for temp_repo in temp_repos:
+            users_repo = self.state.users_target_repositories[temp_repo.name]
+            temp_repo.cancel_event = self.state.cancel_event
+            # repositories on disk are cloned from the user's repositories
+            pool = (
+                self.executors.disk
+                if users_repo.is_git_repository_root
+                else self.executors.network
+            )
+            futures.append(pool.submit(clone_repo_to_temp, temp_repo, users_repo))
 
-            return UpdateStatus.SUCCESS
-        except Exception as e:
-            self.state.errors.append(e)
-            self.state.event = Event.FAILED
-            return UpdateStatus.FAILED
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            # no need to finish cloning the other repositories
+            self.state.cancel_event.set()
+            wait(futures)
+            raise
 
     @log_on_start(
         INFO, "Validating initial state of target repositories...", logger=taf_logger
@@ -667,11 +843,6 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
     )
     def determine_start_commits(self):
         try:
-            self.state.targets_data_by_auth_commits = (
-                self.state.users_auth_repo.targets_data_by_auth_commits(
-                    self.state.auth_commits_since_last_validated
-                )
-            )
             self.state.old_heads_per_target_repos_branches = defaultdict(dict)
             is_initial_state_in_sync = True
             # if last validated commit was not manually modified (set to a newer commit)
@@ -745,6 +916,15 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
                         self.state.auth_commits_since_last_validated
                     )
                 )
+                # all commits of unchanged repositories need to be fetched as well
+                if self.state.unchanged_target_repositories:
+                    self.state.temp_target_repositories.update(
+                        self.state.unchanged_target_repositories
+                    )
+                    self._clone_target_repositories_to_temp(
+                        self.state.unchanged_target_repositories.values()
+                    )
+                    self.state.unchanged_target_repositories = {}
                 # start validation from the beginning, so also removed
                 # information about the top commits of user's repositories
                 for repository in self.state.temp_target_repositories.values():
@@ -777,7 +957,7 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
         self.state.fetched_commits_per_target_repos_branches = defaultdict(dict)
 
         def fetch_commits(repository, branch, old_head):
-            fetched_commits_on_target_repo_branch = []
+            fetched_commits_on_target_repo_branch = CommitSequence()
             local_branch_exists = repository.branch_exists(
                 branch, include_remotes=False
             )
@@ -794,73 +974,93 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
                     repository.fetch(branch=branch)
 
             if old_head is not None:
+                fetched_commits_on_target_repo_branch.append(old_head)
                 if not self.only_validate:
-                    fetched_commits = repository.all_commits_on_branch(
-                        branch=f"origin/{branch}"
+                    fetched_commits = CommitSequence(
+                        repository.all_commits_on_branch(branch=f"origin/{branch}")
                     )
                     if old_head in fetched_commits:
-                        fetched_commits_on_target_repo_branch = fetched_commits[
-                            fetched_commits.index(old_head) + 1 :
-                        ]
+                        fetched_commits_on_target_repo_branch.extend(
+                            fetched_commits.commits_after(old_head)
+                        )
                     else:
-                        fetched_commits_on_target_repo_branch = (
+                        fetched_commits_on_target_repo_branch.extend(
                             repository.all_commits_since_commit(old_head, branch)
                         )
-                        for commit in fetched_commits:
-                            if commit not in fetched_commits_on_target_repo_branch:
-                                fetched_commits_on_target_repo_branch.append(commit)
+                        fetched_commits_on_target_repo_branch.extend(fetched_commits)
                 else:
-                    fetched_commits_on_target_repo_branch = (
+                    fetched_commits_on_target_repo_branch.extend(
                         repository.all_commits_since_commit(old_head, branch)
                     )
-                fetched_commits_on_target_repo_branch.insert(0, old_head)
             else:
                 if local_branch_exists:
-                    fetched_commits_on_target_repo_branch = (
+                    fetched_commits_on_target_repo_branch.extend(
                         repository.all_commits_on_branch(branch=branch, reverse=True)
                     )
-                else:
-                    fetched_commits_on_target_repo_branch = []
                 try:
-                    fetched_commits = repository.all_commits_on_branch(
-                        branch=f"origin/{branch}"
+                    fetched_commits_on_target_repo_branch.extend(
+                        repository.all_commits_on_branch(branch=f"origin/{branch}")
                     )
-                    for commit in fetched_commits:
-                        if commit not in fetched_commits_on_target_repo_branch:
-                            fetched_commits_on_target_repo_branch.append(commit)
                 except GitError:
                     pass
 
             return branch, fetched_commits_on_target_repo_branch
 
-        with ThreadPoolExecutor() as executor:
-            future_to_branch = {
-                executor.submit(
-                    fetch_commits,
-                    repository,
-                    branch,
-                    self.state.old_heads_per_target_repos_branches[repository.name].get(
-                        branch
-                    ),
-                ): repository.name
-                for repository in self.state.temp_target_repositories.values()
-                if repository.name in self.state.target_branches_data_from_auth_repo
-                for branch in self.state.target_branches_data_from_auth_repo[
-                    repository.name
-                ]
-            }
+        def _get_pool(repository):
+            # only repositories on disk are fetched, the others were just cloned
+            # repositories cloned using mirrors are fetched from the mirrors
+            if (
+                repository.name in self.state.repos_on_disk
+                and not self.only_validate
+                and self.state.target_mirror_cache is None
+            ):
+                return self.executors.network
+            return self.executors.disk
+
+        future_to_branch = {
+            _get_pool(repository).submit(
+                fetch_commits,
+                repository,
+                branch,
+                self.state.old_heads_per_target_repos_branches[repository.name].get(
+                    branch
+                ),
+            ): repository.name
+            for repository in self.state.temp_target_repositories.values()
+            if repository.name in self.state.target_branches_data_from_auth_repo
+            and repository.name not in self.state.unchanged_target_repositories
+            for branch in self.state.target_branches_data_from_auth_repo[
+                repository.name
+            ]
+        }
+        # the last validated commit is the only commit of unchanged repositories
+        # which needs to be validated
+        for repository_name in self.state.unchanged_target_repositories:
+            for branch in self.state.target_branches_data_from_auth_repo[
+                repository_name
+            ]:
+                self.state.fetched_commits_per_target_repos_branches[repository_name][
+                    branch
+                ] = CommitSequence(
+                    [
+                        self.state.old_heads_per_target_repos_branches[repository_name][
+                            branch
+                        ]
+                    ]
+                )
 
-            for future in as_completed(future_to_branch):
-                try:
-                    branch, commits = future.result()
-                    repository_name = future_to_branch[future]
-                    self.state.fetched_commits_per_target_repos_branches[
-                        repository_name
-                    ][branch] = commits
-                except Exception as e:
-                    self.state.errors.append(e)
-                    self.state.event = Event.FAILED
-                    return UpdateStatus.FAILED
+        for future in as_completed(future_to_branch):
+            try:
+                branch, commits = future.result()
+                repository_name = future_to_branch[future]
+                self.state.fetched_commits_per_target_repos_branches[repository_name][
+                    branch
+                ] = commits
+            except Exception as e:
+                self.state.errors.append(e)
+                self.state.event = Event.FAILED
+                wait(future_to_branch)
+                return UpdateStatus.FAILED
 
         return UpdateStatus.SUCCESS
 
@@ -895,9 +1095,15 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
         try:
             # need to be set to old head since that is the last validated target
             self.state.validated_commits_per_target_repos_branches = defaultdict(dict)
+            self.state.validated_auth_commits = []
+            if (
+                settings.parallel_target_validation
+                and len(self.state.temp_target_repositories) > 1
+            ):
+                self._validate_target_repositories_in_parallel()
+                return UpdateStatus.SUCCESS
 
             last_validated_data_per_repositories = defaultdict(dict)
-            self.state.validated_auth_commits = []
             for auth_commit in self.state.auth_commits_since_last_validated:
                 for repository in self.state.temp_target_repositories.values():
                     if repository.name not in self.state.targets_data_by_auth_commits:
@@ -916,15 +1122,10 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
                     )
                     current_commit = current_targets_data["commit"]
                     if not len(last_validated_data_per_repositories[repository.name]):
-                        current_head_commit_and_branch = (
-                            self.state.targets_data_by_auth_commits[
-                                repository.name
-                            ].get(self.state.last_validated_commit, {})
-                        )
-                        previous_branch = current_head_commit_and_branch.get("branch")
-                        previous_commit = current_head_commit_and_branch.get("commit")
-                        if previous_commit is not None and previous_branch is None:
-                            previous_branch = repository.default_branch
+                        (
+                            previous_branch,
+                            previous_commit,
+                        ) = self._get_last_validated_target_commit(repository)
                     else:
                         previous_branch = last_validated_data_per_repositories[
                             repository.name
@@ -970,6 +1171,96 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
             self.state.event = Event.FAILED
             return UpdateStatus.FAILED
 
+    def _get_last_validated_target_commit(self, repository):
+        """
+        Return branch and commit of the target repository at the last validated
+        commit of the authentication repository
+        """
+        last_validated_targets_data = self.state.targets_data_by_auth_commits[
+            repository.name
+        ].get(self.state.last_validated_commit, {})
+        previous_branch = last_validated_targets_data.get("branch")
+        previous_commit = last_validated_targets_data.get("commit")
+        if previous_commit is not None and previous_branch is None:
+            previous_branch = repository.default_branch
+        return previous_branch, previous_commit
+
+    def _validate_target_repositories_in_parallel(self):
+        """
+        Validate commits of each target repository independently, using a pool
+        of processes, and then combine the results as if the target repositories
+        were validated commit by commit of the authentication repository. If
+        validation fails, only commits of the target repositories which precede
+        the first error are considered to be validated and the error is raised
+        """
+        auth_commits = self.state.auth_commits_since_last_validated
+        repositories = [
+            repository
+            for repository in self.state.temp_target_repositories.values()
+            if repository.name in self.state.targets_data_by_auth_commits
+        ]
+        work = []
+        for repository in repositories:
+            targets_data = self.state.targets_data_by_auth_commits[repository.name]
+            expected_commits = [
+                (
+                    auth_commit_index,
+                    targets_data[auth_commit].get("branch", repository.default_branch),
+                    targets_data[auth_commit]["commit"],
+                )
+                for auth_commit_index, auth_commit in enumerate(auth_commits)
+                if auth_commit in targets_data
+            ]
+            work.append(
+                (
+                    repository.name,
+                    _is_unauthenticated_allowed(repository),
+                    *self._get_last_validated_target_commit(repository),
+                    expected_commits,
+                    self.state.fetched_commits_per_target_repos_branches[
+                        repository.name
+                    ],
+                )
+            )
+
+        results = self.executors.cpu.map(_validate_target_repository_commits, work)
+
+        # (auth commit index, position of the target repository, error)
+        first_error = None
+        validated_per_auth_commits = defaultdict(list)
+        for position, (validated_commits, error) in enumerate(results):
+            for auth_commit_index, branch, commit in validated_commits:
+                validated_per_auth_commits[auth_commit_index].append(
+                    (position, branch, commit)
+                )
+            if error is not None and (first_error is None or error[0] < first_error[0]):
+                first_error = (error[0], position, error[1])
+
+        for auth_commit_index, auth_commit in enumerate(auth_commits):
+            for position, branch, commit in validated_per_auth_commits[
+                auth_commit_index
+            ]:
+                if first_error is not None and (auth_commit_index, position) >= (
+                    first_error[0],
+                    first_error[1],
+                ):
+                    break
+                self.state.validated_commits_per_target_repos_branches[
+                    repositories[position].name
+                ].setdefault(branch, []).append(commit)
+            if first_error is not None and auth_commit_index == first_error[0]:
+                _, position, error = first_error
+                if isinstance(error, _TargetCommitNotFound):
+                    error = _target_commit_validation_error(
+                        self.state.users_auth_repo,
+                        auth_commit,
+                        repositories[position].name,
+                        error,
+                    )
+                raise error
+            # commit processed without an error
+            self.state.validated_auth_commits.append(auth_commit)
+
     def _validate_current_repo_commit(
         self,
         repository,
@@ -981,57 +1272,20 @@ class AuthenticationRepositoryUpdatePipeline(Pipeline):
         target_commits_from_target_repo,
         current_auth_commit,
     ):
-        target_commits_from_target_repos_on_branch = target_commits_from_target_repo[
-            current_branch
-        ]
-        if previous_commit == current_commit:
-            # target not updated in this revision
-            return current_commit
-        if previous_branch == current_branch:
-            # same branch
-            current_target_commit = _find_next_value(
-                previous_commit, target_commits_from_target_repos_on_branch
-            )
-        else:
-            # next branch
-            current_target_commit = target_commits_from_target_repos_on_branch[0]
-
-        if current_target_commit is None:
-            # there are commits missing from the target repository
-            commit_date = users_auth_repo.get_commit_date(current_auth_commit)
-            raise UpdateFailedError(
-                f"Failure to validate {users_auth_repo.name} commit {current_auth_commit} committed on {commit_date}: \
-data repository {repository.name} was supposed to be at commit {current_commit} \
-but commit not on branch {current_branch}"
-            )
-
-        if current_commit == current_target_commit:
-            return current_target_commit
-        if not _is_unauthenticated_allowed(repository):
-            commit_date = users_auth_repo.get_commit_date(current_auth_commit)
-            raise UpdateFailedError(
-                f"Failure to validate {users_auth_repo.name} commit {current_auth_commit} committed on {commit_date}: \
-data repository {repository.name} was supposed to be at commit {current_commit} \
-but repo was at {current_target_commit}"
+        try:
+            return _find_target_commit(
+                repository.name,
+                previous_branch,
+                previous_commit,
+                current_branch,
+                current_commit,
+                target_commits_from_target_repo,
+                _is_unauthenticated_allowed(repository),
             )
-        # unauthenticated commits are allowed, try to skip them
-        # if commits of the target repositories were swapped, commit which is expected to be found
-        # after the current one will be skipped and it won't be found later, so validation will fail
-        remaining_commits = target_commits_from_target_repos_on_branch[
-            target_commits_from_target_repos_on_branch.index(current_target_commit) :
-        ]
-        for target_commit in remaining_commits:
-            if current_commit == target_commit:
-                return target_commit
-            taf_logger.debug(
-                f"{repository.name}: skipping target commit {target_commit}. Looking for commit {current_commit}"
+        except _TargetCommitNotFound as e:
+            raise _target_commit_validation_error(
+                users_auth_repo, current_auth_commit, repository.name, e
             )
-        commit_date = users_auth_repo.get_commit_date(current_auth_commit)
-        raise UpdateFailedError(
-            f"Failure to validate {users_auth_repo.name} commit {current_auth_commit} committed on {commit_date}: \
-data repository {repository.name} was supposed to be at commit {current_commit} \
-but commit not on branch {current_branch}"
-        )
 
     @log_on_start(
         DEBUG,
@@ -1065,9 +1319,9 @@ but commit not on branch {current_branch}"
                             repository.name
                         ][branch]
                     )
-                    additional_commits = branch_commits[
-                        branch_commits.index(last_validated_commit) + 1 :
-                    ]
+                    additional_commits = branch_commits.commits_after(
+                        last_validated_commit
+                    )
                     if len(additional_commits):
                         if not _is_unauthenticated_allowed(repository):
                             raise UpdateFailedError(
@@ -1110,6 +1364,7 @@ but commit not on branch {current_branch}"
                     repository_name
                 ]
                 temp_target_repo = self.state.temp_target_repositories[repository_name]
+                temp_target_repo.fetch_missing_blobs()
                 users_target_repo.clone_from_disk(
                     temp_target_repo.path, temp_target_repo.get_remote_url()
                 )
@@ -1132,6 +1387,7 @@ but commit not on branch {current_branch}"
     @log_on_start(DEBUG, "Removing temp repositories...", logger=taf_logger)
     def remove_temp_repositories(self):
         if not self.state.temp_root:
+            self._evict_mirrors()
             return self.state.update_status
         try:
             for repo in self.state.temp_target_repositories.values():
@@ -1141,8 +1397,25 @@ but commit not on branch {current_branch}"
             taf_logger.warning(
                 f"WARNING: Could not remove clean up temp folder: {self.state.temp_root}. Please remove it manually."
             )
+        self._evict_mirrors()
         return self.state.update_status
 
+    def _evict_mirrors(self):
+        """
+        Remove least recently used mirrors if they take up more space than allowed
+        """
+        if settings.mirror_cache_max_size is None:
+            return
+        mirror_cache = self._get_mirror_cache(
+            settings.validation_repo_mirror_cache or settings.target_repo_mirror_cache
+        )
+        if mirror_cache is None:
+            return
+        try:
+            mirror_cache.evict(settings.mirror_cache_max_size)
+        except OSError as e:
+            taf_logger.warning(f"WARNING: Could not remove mirrors due to error: {e}")
+
     @log_on_start(
         INFO, "Merging commits into target repositories...", logger=taf_logger
     )
@@ -1266,7 +1539,25 @@ but commit not on branch {current_branch}"
             commits_data=commits_data,
             error=error,
             targets_data=self.state.targets_data,
+            transfer_stats=self._collect_transfer_stats(),
+        )
+
+    def _collect_transfer_stats(self) -> List[TransferStats]:
+        repositories = [
+            self.state.users_auth_repo,
+            *self.state.temp_target_repositories.values(),
+            *self.state.users_target_repositories.values(),
+        ]
+        transfer_stats = list(self.state.transfer_stats)
+        transfer_stats.extend(
+            stats
+            for repository in repositories
+            if repository is not None
+            for stats in repository.transfer_stats
         )
+        for stats in transfer_stats:
+            taf_logger.debug(str(stats))
+        return transfer_stats
 
     def print_additional_commits(self):
         for (
@@ -1283,11 +1574,16 @@ but commit not on branch {current_branch}"
                     )
 
 
-def _clone_validation_repo(url):
+def _clone_validation_repo(
+    url, last_validated_commit=None, mirror_cache=None, users_auth_repo_path=None
+):
     """
     Clones the authentication repository based on the url specified using the
     mirrors parameter. The repository is cloned as a bare repository
     to a the temp directory and will be deleted one the update is done.
+    If mirror_cache is specified, only new commits are fetched into the repository's
+    mirror and the repository is cloned from it. If the mirror does not exist yet,
+    it is created from the user's authentication repository.
 
     If repository_name isn't provided (default value), extract it from info.json.
     """
@@ -1296,15 +1592,51 @@ def _clone_validation_repo(url):
     validation_auth_repo = AuthenticationRepository(
         path=path, urls=[url], alias="Validation repository"
     )
-    validation_auth_repo.clone(bare=True)
-    validation_auth_repo.fetch(fetch_all=True)
-
-    settings.validation_repo_path = validation_auth_repo.path
+    if mirror_cache is not None:
+        mirror_cache.clone_from_mirror(url, validation_auth_repo, users_auth_repo_path)
+    elif settings.partial_clone:
+        validation_auth_repo.clone(bare=True, filter="blob:none")
+    else:
+        validation_auth_repo.clone(bare=True)
+    if mirror_cache is None:
+        validation_auth_repo.fetch(fetch_all=True)
+    # speeds up checking which branches contain the last validated commit
+    validation_auth_repo.write_commit_graph()
+    if settings.partial_clone and mirror_cache is None:
+        _fetch_validated_metadata_and_targets(
+            validation_auth_repo, last_validated_commit
+        )
 
     validation_auth_repo.cleanup()
     return validation_auth_repo
 
 
+def _fetch_validated_metadata_and_targets(
+    validation_auth_repo, last_validated_commit=None
+):
+    """
+    Fetch metadata and target files of commits of a partially cloned validation
+    repository which will be validated, starting with the last validated commit.
+    Files which are read later on are fetched by git one by one.
+    """
+    branch = validation_auth_repo.default_branch
+    try:
+        commits = validation_auth_repo.all_commits_since_commit(
+            last_validated_commit, branch
+        )
+        if last_validated_commit is not None:
+            commits.insert(0, last_validated_commit)
+        validation_auth_repo.fetch_missing_blobs(
+            commits, [METADATA_DIRECTORY_NAME, TARGETS_DIRECTORY_NAME]
+        )
+    except GitError as e:
+        taf_logger.debug(
+            "Could not fetch metadata and target files of {}: {}",
+            validation_auth_repo.name,
+            e,
+        )
+
+
 def _get_repository_name_raise_error_if_not_defined(validation_repo, commit):
     try:
         return _get_repository_name_from_info_json(validation_repo, commit)
@@ -1331,31 +1663,77 @@ def _is_unauthenticated_allowed(repository):
     "Running TUF validation of the authentication repository...",
     logger=taf_logger,
 )
-def _run_tuf_updater(git_fetcher, auth_repo_name):
+def _run_tuf_updater(git_fetcher, auth_repo_name, cpu_pool=None):
     def _init_updater():
         try:
-            return Updater(
-                git_fetcher.metadata_dir,
-                "metadata/",
-                git_fetcher.targets_dir,
-                "targets/",
-                fetcher=git_fetcher,
+            return RevisionUpdater(
+                git_fetcher,
+                git_fetcher.initial_metadata,
+                signature_cache=signature_cache,
             )
         except Exception as e:
             taf_logger.error(f"Failed to instantiate TUF Updater due to error: {e}")
             raise e
 
-    last_validated_commit = None
+    signature_cache_dir = None
+    if settings.persist_signature_cache and git_fetcher.users_auth_repo is not None:
+        signature_cache_dir = git_fetcher.users_auth_repo.conf_dir
+        signature_cache.load(signature_cache_dir)
+    if settings.parallel_signature_verification:
+        preverify_signatures(
+            git_fetcher.validation_auth_repo, git_fetcher.commits, cpu_pool
+        )
+
+    # a single updater is used to validate all commits, so metadata which
+    # did not change between two commits is not verified again
+    updater = _init_updater()
+    # if validation was resumed from a checkpoint, the first commit was validated
+    resumed = git_fetcher.current_commit_index > 0
+    last_validated_commit = git_fetcher.current_commit if resumed else None
+    # outcome of validation of the previous commit, None if it was not validated
+    previous_valid = True if resumed else None
+    num_of_unchanged_commits = 0
     try:
         while not git_fetcher.update_done():
-            updater = _init_updater()
-            current_commit = _update_tuf_current_revision(
-                git_fetcher, updater, auth_repo_name
+            # expiration is only checked at the last commit, so it always
+            # needs to be validated
+            is_last_commit = (
+                git_fetcher.current_commit_index == len(git_fetcher.commits) - 1
             )
+            if (
+                previous_valid is not None
+                and not is_last_commit
+                and git_fetcher.is_current_commit_unchanged()
+            ):
+                current_commit = git_fetcher.current_commit if previous_valid else None
+                num_of_unchanged_commits += 1
+                taf_logger.debug(
+                    "Metadata and targets at revision {} are the same as at revision {}. Carrying forward its validation result",
+                    git_fetcher.current_commit,
+                    git_fetcher.previous_commit,
+                )
+            else:
+                current_commit = _update_tuf_current_revision(
+                    git_fetcher, updater, auth_repo_name
+                )
+            previous_valid = current_commit is not None
             if current_commit is not None:
                 last_validated_commit = current_commit
+                git_fetcher.commit_validated(
+                    current_commit, updater.get_local_metadata("root.json")
+                )
     except UpdateFailedError as e:
         return last_validated_commit, e
+    finally:
+        if num_of_unchanged_commits:
+            taf_logger.info(
+                "Skipped validation of {} commit(s) of {} which did not modify metadata or targets",
+                num_of_unchanged_commits,
+                auth_repo_name or "",
+            )
+        if signature_cache_dir is not None:
+            signature_cache.save(signature_cache_dir)
+        git_fetcher.save_checkpoint()
 
     return last_validated_commit, None
 
@@ -1363,7 +1741,7 @@ def _run_tuf_updater(git_fetcher, auth_repo_name):
 def _update_tuf_current_revision(git_fetcher, updater, auth_repo_name):
     current_commit = git_fetcher.current_commit
     try:
-        updater.refresh()
+        updater.refresh(git_fetcher.reference_time)
         taf_logger.debug("Validated metadata files at revision {}", current_commit)
         # using refresh, we have updated all main roles
         # we still need to update the delegated roles (if there are any)
@@ -1373,8 +1751,23 @@ def _update_tuf_current_revision(git_fetcher, updater, auth_repo_name):
             target_filepath = target_path.replace("\\", "/")
 
             targetinfo = updater.get_targetinfo(target_filepath)
+            # target files are identified by their content, so a file that was
+            # verified against the same length and hashes does not need to be
+            # loaded and hashed again
+            target_id = git_fetcher.get_current_target_id(target_filepath)
+            verified_target = (
+                target_id,
+                targetinfo.length,
+                tuple(sorted(targetinfo.hashes.items())),
+            )
+            if (
+                target_id is not None
+                and verified_target in git_fetcher.verified_targets
+            ):
+                continue
             target_data = git_fetcher.get_current_target_data(target_filepath, raw=True)
             targetinfo.verify_length_and_hashes(target_data)
+            git_fetcher.verified_targets.add(verified_target)
 
             taf_logger.debug(
                 "Successfully validated target file {} at {}",
@@ -1382,7 +1775,7 @@ def _update_tuf_current_revision(git_fetcher, updater, auth_repo_name):
                 current_commit,
             )
         if settings.strict:
-            _validate_metadata_on_disk(git_fetcher)
+            _validate_trusted_metadata(git_fetcher, updater)
         return current_commit
     except Exception as e:
         metadata_expired = EXPIRED_METADATA_ERROR in type(
@@ -1404,14 +1797,14 @@ def _update_tuf_current_revision(git_fetcher, updater, auth_repo_name):
         )
 
 
-def _validate_metadata_on_disk(git_fetcher):
+def _validate_trusted_metadata(git_fetcher, updater):
     """
     TUF updater does not always check the validity of all metadata files
     if timestamp is not updated, the updater will determine that a new version
     of the snapshot file does not need to be downloaded and it will not be validated
-    during the update process, the metadata files that TUF updater downloads is stored
-    in a separate folder within the temp directory
-    For each commit, check if the metadata files inside that directory are the same
+    during the update process, the metadata files that TUF updater trusts are kept
+    in memory by the updater
+    For each commit, check if those metadata files are the same
     as the ones in the auth repository's metadata folder at that revision
     """
     consistent_snaphost_pattern = r"\d+\.[^\.\s]+\.\w+"
@@ -1422,8 +1815,8 @@ def _validate_metadata_on_disk(git_fetcher):
         if re.search(consistent_snaphost_pattern, metadata_file_name):
             continue
 
-        current_tuf_metadata_file = Path(git_fetcher.metadata_dir, metadata_file_name)
-        if not current_tuf_metadata_file.is_file():
+        tuf_metadata_content = updater.get_local_metadata(metadata_file_name)
+        if tuf_metadata_content is None:
             # this validation causes an issue with one of the first
             # commits of our production repositories and it should
             # not be enabled until we specify a later commit of those
@@ -1434,30 +1827,136 @@ def _validate_metadata_on_disk(git_fetcher):
             #     f"Invalid metadata file {metadata_file_name}"
             # )
             continue
-        metadata_content = git_fetcher.get_current_metadata_data(metadata_file_name)
-        tuf_metadata_content = current_tuf_metadata_file.read_text()
+        metadata_content = git_fetcher.get_current_metadata_data(
+            metadata_file_name, raw=True
+        )
         if metadata_content != tuf_metadata_content:
             raise UpdateFailedError(f"Invalid metadata file {metadata_file_name}")
 
 
-def _find_next_value(value, values_list):
+class _TargetCommitNotFound(Exception):
+    """
+    Raised if a target repository does not contain the commit the authentication
+    repository expects it to be at. found_commit is the commit which was found
+    instead, unless the expected commit is not on the branch
+    """
+
+    def __init__(self, expected_commit, branch, found_commit=None):
+        super().__init__(expected_commit, branch, found_commit)
+        self.expected_commit = expected_commit
+        self.branch = branch
+        self.found_commit = found_commit
+
+
+def _target_commit_validation_error(
+    users_auth_repo, auth_commit, repository_name, error
+):
+    commit_date = users_auth_repo.get_commit_date(auth_commit)
+    if error.found_commit is None:
+        reason = f"commit not on branch {error.branch}"
+    else:
+        reason = f"repo was at {error.found_commit}"
+    return UpdateFailedError(
+        f"Failure to validate {users_auth_repo.name} commit {auth_commit} committed on {commit_date}: \
+data repository {repository_name} was supposed to be at commit {error.expected_commit} \
+but {reason}"
+    )
+
+
+def _find_target_commit(
+    repository_name,
+    previous_branch,
+    previous_commit,
+    current_branch,
+    current_commit,
+    target_commits_from_target_repo,
+    unauthenticated_allowed,
+):
+    """
+    Return the commit of the target repository which follows the previously validated
+    commit and matches the commit the authentication repository expects, skipping
+    unauthenticated commits if they are allowed.
+    Raise _TargetCommitNotFound if there is no such commit
     """
-    Find the next value in the list after the given value.
+    target_commits_from_target_repos_on_branch = target_commits_from_target_repo[
+        current_branch
+    ]
+    if previous_commit == current_commit:
+        # target not updated in this revision
+        return current_commit
+    if previous_branch == current_branch:
+        # same branch
+        current_target_commit = target_commits_from_target_repos_on_branch.next_commit(
+            previous_commit
+        )
+    else:
+        # next branch
+        current_target_commit = target_commits_from_target_repos_on_branch[0]
+
+    if current_target_commit is None:
+        # there are commits missing from the target repository
+        raise _TargetCommitNotFound(current_commit, current_branch)
+
+    if current_commit == current_target_commit:
+        return current_target_commit
+    if not unauthenticated_allowed:
+        raise _TargetCommitNotFound(
+            current_commit, current_branch, current_target_commit
+        )
+    # unauthenticated commits are allowed, try to skip them
+    # if commits of the target repositories were swapped, commit which is expected to be found
+    # after the current one will be skipped and it won't be found later, so validation will fail
+    # positions of the commits are known, so only the skipped commits are iterated over
+    branch_commits = target_commits_from_target_repos_on_branch
+    current_target_position = branch_commits.index(current_target_commit)
+    current_position = (
+        branch_commits.index(current_commit) if current_commit in branch_commits else -1
+    )
+    found = current_position >= current_target_position
+    skipped_commits = branch_commits[
+        current_target_position : current_position if found else None
+    ]
+    for target_commit in skipped_commits:
+        taf_logger.debug(
+            f"{repository_name}: skipping target commit {target_commit}. Looking for commit {current_commit}"
+        )
+    if found:
+        return current_commit
+    raise _TargetCommitNotFound(current_commit, current_branch)
 
-    Parameters:
-    - value: The value to look for.
-    - values_list: The list of values.
 
-    Returns:
-    - The next value in the list after the given value, or None if there isn't one.
+def _validate_target_repository_commits(work):
     """
-    try:
-        index = values_list.index(value)
-        if index < len(values_list) - 1:  # check if there are remaining values
-            return values_list[index + 1]
-    except ValueError:
-        pass  # value not in list
-    return None
+    Executed by the worker processes. Validate commits of a single target repository
+    which the authentication repository's commits expect it to be at.
+    Return (auth commit index, branch, commit) of validated commits and, if validation
+    failed, index of the authentication repository's commit and the error
+    """
+    (
+        repository_name,
+        unauthenticated_allowed,
+        previous_branch,
+        previous_commit,
+        expected_commits,
+        target_commits_from_target_repo,
+    ) = work
+    validated_commits = []
+    for auth_commit_index, current_branch, current_commit in expected_commits:
+        try:
+            validated_commit = _find_target_commit(
+                repository_name,
+                previous_branch,
+                previous_commit,
+                current_branch,
+                current_commit,
+                target_commits_from_target_repo,
+                unauthenticated_allowed,
+            )
+        except Exception as e:
+            return validated_commits, (auth_commit_index, e)
+        validated_commits.append((auth_commit_index, current_branch, validated_commit))
+        previous_branch, previous_commit = current_branch, validated_commit
+    return validated_commits, None
 
 
 def _merge_commit(repository, branch, commit_to_merge, force_revert=True):
@@ -419,6 +419,79 @@ class timed_run:
         return wrapper_func
 
 
+class FileLock:
+    """
+    Exclusive lock of a file, held by at most one process (and one thread, if each
+    thread creates its own FileLock) at a time. The file is created if it does not exist
+    and is kept after the lock is released
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+
+    def acquire(self, blocking=True):
+        """
+        Wait until the lock is acquired. If blocking is False, return False instead
+        of waiting if the lock is held by someone else
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.path, "a+")
+        try:
+            if platform.system() == "Windows":
+                import msvcrt
+
+                lock_file.seek(0)
+                while True:
+                    try:
+                        # LK_LOCK retries for 10 seconds before raising an error
+                        mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+                        msvcrt.locking(lock_file.fileno(), mode, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            lock_file.close()
+                            return False
+            else:
+                import fcntl
+
+                flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+                try:
+                    fcntl.flock(lock_file.fileno(), flags)
+                except BlockingIOError:
+                    lock_file.close()
+                    return False
+        except BaseException:
+            lock_file.close()
+            raise
+        self._file = lock_file
+        return True
+
+    def release(self):
+        lock_file, self._file = self._file, None
+        if lock_file is None:
+            return
+        try:
+            if platform.system() == "Windows":
+                import msvcrt
+
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            lock_file.close()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
 class TempPartition:
     def __init__(self, ref_path):
         self.ref_partition = self.get_partition_root(ref_path)